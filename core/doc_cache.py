@@ -0,0 +1,313 @@
+"""
+정규화 문서 디스크 캐시 (내용 주소 기반)
+
+같은 신청 파일을 다시 열 때(알림 RN 클릭, RN으로 열기, 저장 후 다시 열기 등) A4 정규화와
+썸네일 생성을 반복하지 않도록 원본 파일별 결과를 로컬 디스크에 보관한다.
+- 키: 원본 파일 내용의 SHA-256 + 정규화 설정(방식/DPI/여백) 태그
+- 파일 크기/수정 시각이 색인과 같으면 해시를 다시 계산하지 않는다. (빠른 경로)
+- 항목마다 정규화된 PDF 바이트와 썸네일 시트(thumbnail_sheet)를 저장한다.
+- 저장은 백그라운드 스레드 하나가 큐로 받아 처리하고(PDF 직렬화 포함), 용량 예산을 넘으면 가장 오래 쓰지 않은 항목부터 지운다.
+- 색인(index.json)은 조회 때마다 쓰지 않고 모아 두었다가 저장 스레드나 flush()에서 한 번에 쓴다.
+
+디렉터리 구조:
+  <root>/index.json               원본 경로별 (크기, 수정 시각, 해시) 색인과 적중/실패 횟수
+  <root>/entries/<키>.pdf         정규화된 PDF
+  <root>/entries/<키>.sheet.jpg   썸네일 시트
+  <root>/entries/<키>.json        시트 셀 위치, 페이지 수 등
+
+사용 예시:
+  python -m core.doc_cache stats
+  python -m core.doc_cache clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import traceback
+from pathlib import Path
+from queue import Queue
+
+import pymupdf
+
+from core.thumbnail_sheet import build_thumbnail_sheet, DEFAULT_SHEET_OVERSAMPLING
+
+DEFAULT_DOC_CACHE_MB = 1024
+# 저장 형식이 바뀌면 올려서 이전 항목을 자연스럽게 무시한다
+CACHE_FORMAT_VERSION = 1
+# 색인에 기억할 원본 경로 최대 개수 (오래된 것부터 제거)
+INDEX_MAX_FILES = 5000
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """기본 캐시 위치 (Windows: %LOCALAPPDATA%, 그 외: ~/.cache)"""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "NewViewer" / "doc_cache"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """임시 파일에 쓴 뒤 교체하여, 쓰다 만 파일이 캐시로 읽히지 않게 한다."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class CachedDocument:
+    """캐시에서 꺼낸 정규화 문서"""
+
+    def __init__(self, pdf_bytes: bytes, sheet_bytes: bytes = b"", sheet_layout: list | None = None):
+        self.pdf_bytes = pdf_bytes
+        self.sheet_bytes = sheet_bytes
+        self.sheet_layout = sheet_layout or []  # 페이지별 [x, y, w, h]
+
+
+class DocumentCache:
+    """원본 파일 내용으로 주소를 매기는 정규화 문서 디스크 캐시"""
+
+    def __init__(self, root: str | Path | None = None, max_bytes: int = DEFAULT_DOC_CACHE_MB * 1024 * 1024,
+                 thumbnail_oversampling: float = DEFAULT_SHEET_OVERSAMPLING):
+        self.root = Path(root) if root else default_cache_dir()
+        self.entries_dir = self.root / "entries"
+        self.index_path = self.root / "index.json"
+        self.max_bytes = max_bytes
+        self.thumbnail_oversampling = thumbnail_oversampling  # 썸네일 시트 렌더링 배수 (렌더링 프로필 값)
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._index_dirty = False  # 아직 index.json에 쓰지 않은 변경(해시, 적중/실패 횟수)이 있는지
+        self._store_queue: Queue = Queue()
+        self._store_thread: threading.Thread | None = None
+
+    @staticmethod
+    def settings_tag(normalize_mode: str, target_dpi: int, margin: float) -> str:
+        """정규화 설정을 캐시 키에 섞을 문자열로 만든다."""
+        return f"{normalize_mode}-{target_dpi}-{margin}-v{CACHE_FORMAT_VERSION}"
+
+    # --- 색인 ---
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if isinstance(index.get("files"), dict):
+                return index
+        except (OSError, ValueError):
+            pass
+        return {"files": {}, "hits": 0, "misses": 0}
+
+    def _save_index(self) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                files = self._index["files"]
+                while len(files) > INDEX_MAX_FILES:
+                    files.pop(next(iter(files)))
+                data = json.dumps(self._index, ensure_ascii=False).encode("utf-8")
+                self._index_dirty = False
+            _write_atomic(self.index_path, data)
+        except OSError as e:
+            print(f"⚠️ 문서 캐시 색인 저장 실패: {e}")
+
+    def flush(self) -> None:
+        """모아 둔 색인 변경을 index.json에 쓴다. (저장 스레드가 항목을 저장할 때와 프로그램 종료 시)"""
+        with self._lock:
+            dirty = self._index_dirty
+        if dirty:
+            self._save_index()
+
+    def file_digest(self, path: str) -> str:
+        """원본 파일의 SHA-256. 크기/수정 시각이 색인과 같으면 저장된 값을 쓴다."""
+        abs_path = str(Path(path).resolve())
+        stat = os.stat(abs_path)
+        with self._lock:
+            known = self._index["files"].get(abs_path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+
+        sha = hashlib.sha256()
+        with open(abs_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with self._lock:
+            self._index["files"][abs_path] = [stat.st_size, stat.st_mtime_ns, digest]
+            self._index_dirty = True
+        return digest
+
+    def entry_key(self, path: str, settings_tag: str) -> str:
+        """원본 파일 + 정규화 설정에 해당하는 항목 키"""
+        tag_hash = hashlib.sha256(settings_tag.encode("utf-8")).hexdigest()[:12]
+        return f"{self.file_digest(path)}-{tag_hash}"
+
+    # --- 조회/저장 ---
+    def lookup(self, path: str, settings_tag: str) -> CachedDocument | None:
+        """원본 파일의 정규화 결과를 찾는다. 없으면 None."""
+        try:
+            key = self.entry_key(path, settings_tag)
+            pdf_path = self.entries_dir / f"{key}.pdf"
+            if not pdf_path.exists():
+                self._count("misses")
+                return None
+
+            pdf_bytes = pdf_path.read_bytes()
+            os.utime(pdf_path)  # 최근 사용 시각 갱신 (제거 순서 기준)
+
+            sheet_bytes, layout = b"", []
+            meta_path = self.entries_dir / f"{key}.json"
+            sheet_path = self.entries_dir / f"{key}.sheet.jpg"
+            if meta_path.exists() and sheet_path.exists():
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    layout = json.load(f).get("sheet_layout", [])
+                sheet_bytes = sheet_path.read_bytes()
+
+            self._count("hits")
+            return CachedDocument(pdf_bytes, sheet_bytes, layout)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 문서 캐시 조회 실패 ({Path(path).name}): {e}")
+            return None
+
+    def _count(self, field: str) -> None:
+        # 조회마다 색인 파일을 다시 쓰지 않는다 (flush 참고)
+        with self._lock:
+            self._index[field] = self._index.get(field, 0) + 1
+            self._index_dirty = True
+
+    def store_async(self, path: str, settings_tag: str, pdf_data: "bytes | pymupdf.Document") -> None:
+        """정규화 결과를 백그라운드에서 저장한다. (직렬화, 썸네일 시트 생성, 용량 정리 포함)
+
+        pdf_data로 문서 객체를 넘기면 저장 스레드가 직렬화한 뒤 닫는다. (호출한 쪽은 더 이상 쓰지 않는다)
+        """
+        try:
+            key = self.entry_key(path, settings_tag)
+        except OSError as e:
+            print(f"⚠️ 문서 캐시 저장 건너뜀 ({Path(path).name}): {e}")
+            if isinstance(pdf_data, pymupdf.Document):
+                pdf_data.close()
+            return
+        self._store_queue.put((key, pdf_data))
+        with self._lock:
+            if self._store_thread is None or not self._store_thread.is_alive():
+                self._store_thread = threading.Thread(target=self._store_worker, daemon=True)
+                self._store_thread.start()
+
+    def _store_worker(self) -> None:
+        while True:
+            key, pdf_data = self._store_queue.get()
+            try:
+                if isinstance(pdf_data, pymupdf.Document):
+                    with pdf_data:
+                        pdf_bytes = pdf_data.tobytes(garbage=1, deflate=True)
+                else:
+                    pdf_bytes = pdf_data
+                self.store(key, pdf_bytes)
+                self.flush()
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._store_queue.task_done()
+
+    def wait_idle(self) -> None:
+        """대기 중인 백그라운드 저장이 모두 끝날 때까지 기다린다."""
+        self._store_queue.join()
+
+    def store(self, key: str, pdf_bytes: bytes) -> None:
+        """항목 하나를 저장하고 예산을 넘으면 오래된 항목을 제거한다."""
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        sheet_bytes, layout = build_thumbnail_sheet(pdf_bytes, self.thumbnail_oversampling)
+        if sheet_bytes:
+            _write_atomic(self.entries_dir / f"{key}.sheet.jpg", sheet_bytes)
+        meta = {"pages": len(layout), "sheet_layout": layout, "created": time.time()}
+        _write_atomic(self.entries_dir / f"{key}.json", json.dumps(meta).encode("utf-8"))
+        # PDF를 마지막에 써서, PDF가 보이면 시트/메타도 준비된 상태가 되게 한다
+        _write_atomic(self.entries_dir / f"{key}.pdf", pdf_bytes)
+        self.evict()
+
+    # --- 용량 관리 ---
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """[(최근 사용 시각, 크기 합, 키)] 목록"""
+        if not self.entries_dir.exists():
+            return []
+        sizes: dict[str, int] = {}
+        used: dict[str, float] = {}
+        for file in self.entries_dir.iterdir():
+            key = file.name.split(".", 1)[0]
+            stat = file.stat()
+            sizes[key] = sizes.get(key, 0) + stat.st_size
+            if file.suffix == ".pdf":
+                used[key] = stat.st_mtime
+        # PDF가 없는 항목(저장 도중 등)은 가장 먼저 지워지도록 0으로 둔다
+        return [(used.get(key, 0.0), size, key) for key, size in sizes.items()]
+
+    def _remove_entry(self, key: str) -> None:
+        for file in self.entries_dir.glob(f"{key}.*"):
+            try:
+                file.unlink()
+            except OSError:
+                pass
+
+    def evict(self) -> int:
+        """예산을 넘는 만큼 오래 쓰지 않은 항목부터 제거하고 제거한 항목 수를 반환한다."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove_entry(key)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """모든 항목과 색인을 지운다."""
+        for _, _, key in self._entries():
+            self._remove_entry(key)
+        with self._lock:
+            self._index = {"files": {}, "hits": 0, "misses": 0}
+        self._save_index()
+
+    def stats(self) -> dict:
+        """항목 수, 사용 용량, 예산, 적중/실패 횟수를 반환한다."""
+        entries = self._entries()
+        with self._lock:
+            hits = self._index.get("hits", 0)
+            misses = self._index.get("misses", 0)
+            known_files = len(self._index["files"])
+        return {
+            "root": str(self.root),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "indexed_files": known_files,
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="정규화 문서 디스크 캐시 관리")
+    parser.add_argument("command", choices=("stats", "clear", "evict"))
+    parser.add_argument("--root", help="캐시 디렉터리 (기본: 사용자 캐시 폴더)")
+    parser.add_argument("--max-mb", type=int, default=DEFAULT_DOC_CACHE_MB, help="용량 예산 (MB)")
+    args = parser.parse_args(argv)
+
+    cache = DocumentCache(args.root, max_bytes=args.max_mb * 1024 * 1024)
+    if args.command == "clear":
+        cache.clear()
+        print(f"🧹 캐시를 비웠습니다: {cache.root}")
+    elif args.command == "evict":
+        print(f"🧹 제거한 항목: {cache.evict()}개")
+    else:
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+        print(f"위치      : {stats['root']}")
+        print(f"항목      : {stats['entries']}개 (색인된 원본 {stats['indexed_files']}개)")
+        print(f"사용 용량 : {stats['bytes'] / (1024 * 1024):.1f} / {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+        print(f"적중/실패 : {stats['hits']} / {stats['misses']} (적중률 {hit_rate:.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -59,7 +59,9 @@ class ViewModeMixin:
 
         # 스크롤바 정책: 페이지가 효과적 뷰포트보다 크면 스크롤바 표시
         # 약간의 여유(95%)를 두어 불필요한 스크롤바 방지
-        if (page_rect.width() > effective_width * 0.95 or 
+        # 연속 스크롤 보기는 다른 페이지로 스크롤해야 하므로 항상 표시
+        if (getattr(self, '_continuous_scroll', False) or
+            page_rect.width() > effective_width * 0.95 or 
             page_rect.height() > effective_height * 0.95):
             view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
             view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
@@ -105,8 +107,8 @@ class EditMixin():
     def _delete_pages_and_update_data(self, page_indexes_to_delete: list[int]):
         """
         페이지를 삭제하고 관련된 모든 내부 데이터(오버레이, 회전 등)를 업데이트하는 Mixin.
-        이 메서드는 self.renderer, self._overlay_items, self.page_rotations, self.page_cache를
-        가진 클래스에서 사용되어야 합니다.
+        이 메서드는 self.renderer, self._overlay_items, self.page_rotations,
+        self.invalidate_page_cache()를 가진 클래스에서 사용되어야 합니다.
         """
         if not hasattr(self, 'renderer') or not self.renderer:
             print("EditMixin: 렌더러가 없어 페이지를 삭제할 수 없습니다.")
@@ -152,8 +154,12 @@ class EditMixin():
         self.page_rotations.clear()
         self.page_rotations.update(new_page_rotations)
 
+        # 되돌리기 기록의 페이지 번호도 당긴다 (삭제된 페이지를 건드린 기록은 버림)
+        if hasattr(self, '_history'):
+            self._history.remap_deleted_pages(page_indexes_to_delete)
+
         # --- 3. 캐시 초기화 ---
-        # 페이지 인덱스가 모두 변경되었으므로 캐시는 완전히 무효화됨
-        self.page_cache.clear()
+        # 페이지 인덱스가 모두 변경되었으므로 캐시 세대를 올려 완전히 무효화함
+        self.invalidate_page_cache()
 
         print("Mixin: 페이지 데이터 및 관련 정보(오버레이, 회전) 업데이트 완료.")
@@ -0,0 +1,172 @@
+"""
+거대 이미지 가드
+
+메일 첨부의 휴대폰 사진이나 600 DPI 스캔은 A4 정규화/렌더링 때마다 원본 크기로 디코딩되어
+로딩을 몇 초씩 멈추게 한다. 정규화 전에 한 번만 다음을 수행한다.
+- get_images 메타데이터(가로/세로 픽셀)와 페이지 크기만으로 판단한다. (디코딩 없음)
+  get_image_rects는 배치 영역을 구하려고 페이지를 실행하며 이미지를 디코딩하므로 쓰지 않고,
+  페이지 안에 (비율을 유지하며) 놓인 이미지는 페이지에 꽉 맞췄을 때의 목표 DPI 픽셀 수 이상이 필요 없다는 상한을 쓴다.
+- 픽셀 수가 임계값을 넘거나, 그 상한의 몇 배를 넘는 이미지만 상한에 맞게 줄여 문서 안의 이미지를 교체한다.
+  JPEG은 PIL draft 모드로 처음부터 축소 디코딩하고, 그 외 형식은 한 번 디코딩한 뒤 PIL로 목표 크기에 맞춰 줄인다.
+
+크기 기준은 호출하는 쪽(PdfRender)이 넘긴다.
+"""
+import io
+import math
+import time
+
+import pymupdf
+from PIL import Image
+
+# 축소한 JPEG 이미지의 저장 품질
+DOWNSAMPLED_JPEG_QUALITY = 85
+
+
+class PageImageReport:
+    """페이지 하나의 이미지 검사/축소 결과 (로드 리포트의 한 줄)"""
+
+    def __init__(self, page_index: int):
+        self.page_index = page_index
+        self.image_count = 0
+        self.largest_pixels = 0
+        self.downsampled = 0
+        self.guard_seconds = 0.0  # 이미지 검사 + 축소 디코딩 시간
+        self.normalize_seconds = 0.0  # A4 정규화(렌더링/배치) 시간 (PdfRender가 채움)
+        # 래스터로 변환한 페이지인지 (PdfRender가 채움). 이때 이미지 디코딩은 normalize_seconds에 들어 있다.
+        self.rasterized = False
+        # MuPDF가 축소 디코딩하지 못해(JPEG 외 형식) 원본 크기로 디코딩하는 이미지 중 최대 픽셀 수
+        self.full_decode_pixels = 0
+
+
+def _is_oversized(width: int, height: int, scale: float, pixel_threshold: int, max_dpi_ratio: float) -> bool:
+    """scale: 목표 해상도에 필요한 크기 / 현재 크기"""
+    if width * height > pixel_threshold:
+        return True
+    return scale * max_dpi_ratio < 1.0
+
+
+def _downsample_jpeg(raw: bytes, size: tuple[int, int]) -> bytes | None:
+    """JPEG을 축소 디코딩(draft)한 뒤 size로 맞춰 다시 JPEG으로 만든다. 다룰 수 없는 색공간이면 None."""
+    with Image.open(io.BytesIO(raw)) as img:
+        if img.mode not in ("RGB", "L"):
+            return None
+        img.draft(img.mode, size)  # DCT 단계에서 1/2, 1/4, 1/8로 줄여 디코딩
+        resized = img.resize(size, Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    resized.save(buffer, format="JPEG", quality=DOWNSAMPLED_JPEG_QUALITY)
+    return buffer.getvalue()
+
+
+def _downsample_pixmap(doc: "pymupdf.Document", xref: int, size: tuple[int, int]) -> "pymupdf.Pixmap | None":
+    """이미지를 한 번 디코딩한 뒤 size로 줄인 알파 없는 RGB/회색조 Pixmap을 만든다. 마스크 이미지 등은 None."""
+    pix = pymupdf.Pixmap(doc, xref)
+    if pix.colorspace is None:
+        return None  # 색공간 없는 마스크(stencil) 이미지
+    if pix.colorspace.n not in (1, 3):
+        pix = pymupdf.Pixmap(pymupdf.csRGB, pix)  # CMYK 등 → RGB
+    if pix.alpha:
+        pix = pymupdf.Pixmap(pix, 0)  # 알파 채널 제거
+    mode = "L" if pix.n == 1 else "RGB"
+    img = Image.frombytes(mode, (pix.width, pix.height), pix.samples, "raw", mode, pix.stride)
+    resized = img.resize(size, Image.Resampling.LANCZOS)
+    colorspace = pymupdf.csGRAY if mode == "L" else pymupdf.csRGB
+    return pymupdf.Pixmap(colorspace, resized.width, resized.height, resized.tobytes(), 0)
+
+
+def inspect_page_images(page: "pymupdf.Page") -> PageImageReport:
+    """이미지를 줄이지 않고 페이지의 이미지 개수/최대 픽셀 수만 기록한다. (래스터로 변환할 페이지용)
+
+    래스터 변환 때 MuPDF는 JPEG만 렌더링 배율에 맞춰 축소 디코딩하고 Flate/PNG 등은 원본 크기로 디코딩하므로,
+    그런 이미지의 최대 픽셀 수를 따로 기록해 로드 리포트에서 느린 페이지의 원인을 알 수 있게 한다.
+    """
+    report = PageImageReport(page.number)
+    start = time.perf_counter()
+    for info in page.get_images(full=True):
+        pixels = info[2] * info[3]
+        report.image_count += 1
+        report.largest_pixels = max(report.largest_pixels, pixels)
+        if info[8] != "DCTDecode":
+            report.full_decode_pixels = max(report.full_decode_pixels, pixels)
+    report.guard_seconds = time.perf_counter() - start
+    return report
+
+
+def downsample_page_images(page: "pymupdf.Page", zoom: float, pixel_threshold: int, max_dpi_ratio: float,
+                           done_xrefs: set[int]) -> PageImageReport:
+    """페이지의 과대 이미지를 목표 해상도로 줄여 문서 안에서 교체한다.
+
+    Args:
+        page: 원본 문서의 페이지 (이미지가 교체되므로 원본 파일이 아닌 메모리 문서여야 함)
+        zoom: 페이지 좌표(pt) → 목표 DPI 픽셀 배율 (정규화 래스터 배율과 같음)
+        pixel_threshold: 이 픽셀 수를 넘는 이미지는 항상 줄인다
+        max_dpi_ratio: 배치 크기에 필요한 픽셀 폭의 이 배수를 넘는 이미지도 줄인다
+        done_xrefs: 이미 처리한 이미지 xref (여러 페이지가 공유하는 이미지는 한 번만 처리)
+    """
+    report = PageImageReport(page.number)
+    start = time.perf_counter()
+    doc = page.parent
+    # 페이지 전체를 목표 해상도로 채우는 픽셀 크기 (페이지 안 이미지에 필요한 해상도의 상한)
+    page_px_width = page.rect.width * zoom
+    page_px_height = page.rect.height * zoom
+
+    for info in page.get_images(full=True):
+        xref, smask, width, height = info[0], info[1], info[2], info[3]
+        image_filter = info[8]
+        report.image_count += 1
+        report.largest_pixels = max(report.largest_pixels, width * height)
+        if xref in done_xrefs or width <= 0 or height <= 0:
+            continue
+        done_xrefs.add(xref)
+        if smask:
+            continue  # 투명 마스크가 있는 이미지는 교체 시 마스크가 어긋날 수 있어 건드리지 않는다
+
+        # 비율을 유지한 채 페이지에 꽉 맞췄을 때도 목표 해상도를 유지하는 배율
+        scale = min(page_px_width / width, page_px_height / height)
+        if not _is_oversized(width, height, scale, pixel_threshold, max_dpi_ratio):
+            continue
+        scale = min(scale, math.sqrt(pixel_threshold / (width * height)))
+        if scale >= 1.0:
+            continue
+        new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        if new_size[0] >= width and new_size[1] >= height:
+            continue  # 반올림으로 줄어들지 않는 이미지는 다시 인코딩하지 않는다
+
+        try:
+            if image_filter == "DCTDecode":
+                stream = _downsample_jpeg(doc.extract_image(xref)["image"], new_size)
+                if stream is not None:
+                    page.replace_image(xref, stream=stream)
+                    report.downsampled += 1
+                    continue
+            pixmap = _downsample_pixmap(doc, xref, new_size)
+            if pixmap is None:
+                continue
+            page.replace_image(xref, pixmap=pixmap)
+            report.downsampled += 1
+        except Exception as e:
+            print(f"⚠️ 이미지 축소 실패 (페이지 {page.number + 1}, xref {xref}): {e}")
+
+    report.guard_seconds = time.perf_counter() - start
+    return report
+
+
+def open_image_guarded(path: str, page_pixels: tuple[int, int], pixel_threshold: int,
+                       max_dpi_ratio: float) -> Image.Image:
+    """이미지 파일을 RGB로 연다. 과대 이미지는 목표 해상도의 페이지 안으로 줄인다. (JPEG은 축소 디코딩)
+
+    Args:
+        page_pixels: 목표 DPI 기준 세로 페이지의 (가로, 세로) 픽셀. 가로로 긴 이미지는 뒤집어 적용한다.
+    """
+    with Image.open(path) as src_img:
+        width, height = src_img.size
+        short_side, long_side = sorted(page_pixels)
+        max_size = (long_side, short_side) if width > height else (short_side, long_side)
+        fit = min(max_size[0] / width, max_size[1] / height) if width and height else 1.0
+        if fit < 1.0 and _is_oversized(width, height, fit, pixel_threshold, max_dpi_ratio):
+            target = (max(1, round(width * fit)), max(1, round(height * fit)))
+            src_img.draft("RGB", target)
+            img = src_img.convert("RGB")
+            img.thumbnail(target, Image.Resampling.LANCZOS)
+            print(f"🗜️ 과대 이미지 축소: {width}x{height} → {img.width}x{img.height}")
+            return img
+        return src_img.convert("RGB")
@@ -0,0 +1,127 @@
+"""
+페이지 렌더링 결과(QPixmap) 캐시
+
+PdfViewWidget이 렌더링한 페이지를 메모리 예산(byte) 안에서 LRU 방식으로 보관한다.
+- 키: (문서 세대, 페이지 번호, 사용자 회전, 배율)
+- 예산을 넘으면 가장 오래 쓰지 않은 페이지부터 제거하고, 제거된 페이지는
+  Qt 전역 QPixmapCache로 내려보내 여유가 있으면 다시 꺼내 쓸 수 있게 한다.
+- 적중/실패/제거 횟수를 stats()로 제공한다.
+"""
+from collections import OrderedDict
+
+from PyQt6.QtGui import QPixmap, QPixmapCache
+
+# 기본 메모리 예산 (MB). A4 2배 렌더링 한 장이 약 7MB이므로 30장 남짓 보관
+DEFAULT_PAGE_CACHE_MB = 256
+
+
+class PageCache:
+    """메모리 예산이 있는 LRU 페이지 캐시"""
+
+    def __init__(self, max_bytes: int = DEFAULT_PAGE_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, QPixmap] = OrderedDict()
+        self._current_bytes = 0
+        # QPixmapCache로 내려보낸 키 (무효화 시 함께 지우기 위해 추적)
+        self._demoted_keys: set[tuple] = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(generation: int, page_num: int, rotation: int, zoom: float) -> tuple:
+        """캐시 키를 만든다."""
+        return (generation, page_num, rotation, round(zoom, 3))
+
+    @staticmethod
+    def _pixmap_bytes(pixmap: QPixmap) -> int:
+        """QPixmap이 차지하는 대략적인 메모리 크기(byte)"""
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    @staticmethod
+    def _demoted_key(key: tuple) -> str:
+        """QPixmapCache에 내려보낼 때 사용할 문자열 키"""
+        return "page_cache:" + ":".join(str(part) for part in key)
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """메모리 예산을 변경하고 초과분을 즉시 제거한다."""
+        self.max_bytes = max_bytes
+        self._evict_to_budget()
+
+    def get(self, key: tuple) -> QPixmap | None:
+        """캐시에서 페이지를 꺼낸다. 없으면 None."""
+        pixmap = self._entries.get(key)
+        if pixmap is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+        # LRU에서 밀려난 페이지가 QPixmapCache에 남아 있으면 다시 올린다
+        if key in self._demoted_keys:
+            self._demoted_keys.discard(key)
+            demoted = QPixmapCache.find(self._demoted_key(key))
+            QPixmapCache.remove(self._demoted_key(key))
+            if demoted is not None and not demoted.isNull():
+                self.hits += 1
+                self.put(key, demoted)
+                return demoted
+
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple, pixmap: QPixmap) -> None:
+        """페이지를 캐시에 넣고 예산을 넘으면 오래된 페이지를 제거한다."""
+        if key in self._entries:
+            self._current_bytes -= self._pixmap_bytes(self._entries.pop(key))
+        self._entries[key] = pixmap
+        self._current_bytes += self._pixmap_bytes(pixmap)
+        self._evict_to_budget(keep=key)
+
+    def _evict_to_budget(self, keep: tuple | None = None) -> None:
+        while self._current_bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            if oldest_key == keep:
+                break  # 방금 넣은 한 장은 예산보다 커도 유지
+            pixmap = self._entries.pop(oldest_key)
+            self._current_bytes -= self._pixmap_bytes(pixmap)
+            self.evictions += 1
+            if QPixmapCache.insert(self._demoted_key(oldest_key), pixmap):
+                self._demoted_keys.add(oldest_key)
+
+    def contains_page(self, page_num: int) -> bool:
+        """(세대/회전/배율과 무관하게) 해당 페이지가 캐시에 있는지 확인한다."""
+        return any(key[1] == page_num for key in self._entries)
+
+    def invalidate_pages(self, page_nums) -> None:
+        """지정한 페이지들의 캐시만 제거한다. (자르기, 되돌리기 등 부분 변경용)"""
+        targets = set(page_nums)
+        for key in [k for k in self._entries if k[1] in targets]:
+            self._current_bytes -= self._pixmap_bytes(self._entries.pop(key))
+        for key in [k for k in self._demoted_keys if k[1] in targets]:
+            self._demoted_keys.discard(key)
+            QPixmapCache.remove(self._demoted_key(key))
+
+    def clear(self) -> None:
+        """모든 페이지 캐시를 제거한다."""
+        for key in self._demoted_keys:
+            QPixmapCache.remove(self._demoted_key(key))
+        self._demoted_keys.clear()
+        self._entries.clear()
+        self._current_bytes = 0
+
+    def stats(self) -> dict:
+        """캐시 적중/실패/제거 횟수와 현재 사용량을 반환한다."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._current_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
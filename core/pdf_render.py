@@ -2,17 +2,75 @@ import pymupdf
 import traceback
 import io
 import os
+import itertools
+import threading
+import time
+from collections import OrderedDict
 from PIL import Image
-from PyQt6.QtGui import QPixmap, QImage, QIcon, QTransform
+from PyQt6.QtGui import QPixmap, QImage, QIcon
 from PyQt6.QtCore import Qt, QBuffer, QIODevice
 from pathlib import Path
 
+from get_mail_logics.pdf_annotation_guard import page_will_lose_objects
+from core.doc_cache import DocumentCache
+from core.thumbnail_sheet import split_thumbnail_sheet
+from core.pixmap_bridge import to_qpixmap, to_scaled_qimage
+from core.image_guard import PageImageReport, downsample_page_images, inspect_page_images, open_image_guarded
+from core.render_server import get_render_server
+
 A4_WIDTH_PT = 595.276
 A4_HEIGHT_PT = 841.890
 
 # 거대 이미지 판별을 위한 픽셀 수 임계값 (5천만 픽셀)
 # 8k UHD (3840x2160)가 약 830만 픽셀인 것을 감안한 넉넉한 값
 LARGE_IMAGE_PIXELS_THRESHOLD = 50_000_000
+# 배치 크기에 필요한 해상도(NORMALIZE_TARGET_DPI)의 이 배수를 넘는 이미지도 로딩 전에 줄인다
+# (600 DPI 스캔, 페이지 전체에 깔린 휴대폰 사진 등)
+OVERSIZED_IMAGE_DPI_RATIO = 2.0
+# 로드 리포트에서 느린 페이지로 표시할 기준(초)
+SLOW_PAGE_SECONDS = 0.5
+
+# 점진적 렌더링 1차(미리보기) 배율
+PREVIEW_ZOOM_FACTOR = 0.5
+
+# A4 정규화 방식
+# - raster: 모든 페이지를 200 DPI 이미지로 변환하여 삽입 (기존 방식)
+# - hybrid: 텍스트/벡터 페이지는 show_pdf_page로 벡터 그대로 배치하고,
+#           스캔 이미지 페이지나 벡터 배치 시 소실되는 주석이 있는 페이지만 래스터 변환
+NORMALIZE_MODE_RASTER = "raster"
+NORMALIZE_MODE_HYBRID = "hybrid"
+NORMALIZE_MODES = (NORMALIZE_MODE_RASTER, NORMALIZE_MODE_HYBRID)
+# 설정 화면에 보일 순서 (이름, 표시 이름). 선택값은 설정(render/normalize_mode)에 저장한다.
+NORMALIZE_MODE_CHOICES = [
+    (NORMALIZE_MODE_RASTER, "전체 이미지 변환"),
+    (NORMALIZE_MODE_HYBRID, "글자/벡터 유지 (스캔 페이지만 이미지 변환)"),
+]
+
+# 래스터 변환 시 사용하는 기본 해상도 (렌더링 품질 프로필이 PdfRender.target_dpi로 바꿀 수 있음)
+NORMALIZE_TARGET_DPI = 200
+# 썸네일을 목표 폭의 몇 배로 렌더링한 뒤 줄일지 (기본값, 프로필이 바꿀 수 있음)
+THUMBNAIL_OVERSAMPLING = 2.0
+# A4 페이지 안에 원본을 배치할 때의 여백 비율 (2% 여백)
+NORMALIZE_MARGIN = 0.98
+# 이미지가 페이지 면적의 이 비율 이상을 덮고 텍스트가 없으면 스캔 페이지로 간주
+SCANNED_IMAGE_COVERAGE = 0.5
+
+# 문서 세대(generation) id 발급기. PdfRender 인스턴스 간에도 중복되지 않는다.
+_generation_counter = itertools.count(1)
+
+# 문서 핸들마다 보관할 페이지 DisplayList 최대 개수
+# (회전/배율 변경 시 콘텐츠 스트림을 다시 해석하지 않도록 재사용)
+DISPLAY_LIST_CACHE_SIZE = 8
+
+# 렌더링 스레드별로 열어둔 문서 핸들: {스레드 id: (세대 id, pymupdf.Document, {페이지: DisplayList})}
+# QThreadPool 스레드는 파이썬 스레드 상태가 매 작업마다 새로 만들어질 수 있어
+# threading.local 대신 OS 스레드 id를 키로 사용한다.
+# (스레드가 끝나도 항목이 남지 않도록 RenderScheduler 스레드는 만료되지 않게 두고,
+#  세대가 끝나면 release_thread_docs / _acquire_thread_doc이 항목을 지운다)
+_thread_docs: dict[int, tuple[int, "pymupdf.Document", OrderedDict]] = {}
+# 열려 있는 PdfRender 문서의 세대 id. 여기에 없는 세대의 핸들은 캐시에 넣지 않는다.
+_live_generations: set[int] = set()
+_thread_docs_lock = threading.Lock()
 
 
 class PdfRender:
@@ -20,33 +78,410 @@ class PdfRender:
     - load_pdf: PDF를 로드하며 A4 규격으로 사전 변환
     - render_page: 변환된 페이지를 QPixmap으로 렌더링
     - create_thumbnail: 선명한 썸네일(QIcon) 생성
+    - render_thumbnail_thread_safe: 작업 스레드용 썸네일(QImage) 생성
     """
 
-    def __init__(self):
+    # 생성자에서 doc_cache를 넘기지 않은 인스턴스가 사용할 디스크 캐시 (MainWindow가 설정)
+    default_doc_cache: "DocumentCache | None" = None
+    # 렌더링 품질 프로필 값 (MainWindow가 설정, 모든 인스턴스와 작업 스레드 렌더링에 적용)
+    target_dpi: int = NORMALIZE_TARGET_DPI
+    thumbnail_oversampling: float = THUMBNAIL_OVERSAMPLING
+    # 생성자에서 normalize_mode를 넘기지 않은 인스턴스의 A4 정규화 방식 (MainWindow가 설정)
+    default_normalize_mode: str = NORMALIZE_MODE_RASTER
+
+    def __init__(self, normalize_mode: str | None = None, doc_cache: "DocumentCache | None" = None):
         self.doc = None
         self.page_count = 0
         self.pdf_path: str | None = None
         self.pdf_bytes: bytes | None = None
+        # 수정되지 않은 파일 기반 문서의 경로 (이때 pdf_bytes는 비어 있고, 첫 편집 전에 메모리 사본으로 전환)
+        self._backing_path: str | None = None
+        self.generation = 0  # pdf_bytes가 바뀔 때마다 새로 발급되는 문서 세대 id
+        # self.doc이 제자리(in-place) 편집되어 pdf_bytes가 아직 갱신되지 않았는지 여부
+        self._dirty = False
+        # self.doc 페이지별 DisplayList 캐시 (UI 스레드 전용, 세대가 바뀌면 비움)
+        self._display_lists: OrderedDict[int, "pymupdf.DisplayList"] = OrderedDict()
+        self.normalize_mode = NORMALIZE_MODE_RASTER
+        self.set_normalize_mode(normalize_mode if normalize_mode is not None else PdfRender.default_normalize_mode)
+        # 원본 파일별 정규화 결과 디스크 캐시 (None이면 사용 안 함)
+        self.doc_cache = doc_cache if doc_cache is not None else PdfRender.default_doc_cache
+        # 디스크 캐시의 썸네일 시트에서 꺼낸 회전 없는 기본 썸네일 {페이지: QImage}
+        self._preloaded_thumbnails: dict[int, QImage] = {}
+        # 마지막 로딩의 페이지별 이미지 검사/정규화 시간 [(파일 이름, PageImageReport)]
+        self._load_report: list[tuple[str, PageImageReport]] = []
+
+    def set_normalize_mode(self, mode: str) -> None:
+        """A4 정규화 방식을 설정한다. ('raster' 또는 'hybrid')"""
+        if mode not in NORMALIZE_MODES:
+            raise ValueError(f"지원하지 않는 정규화 방식입니다: {mode}")
+        self.normalize_mode = mode
+
+    def get_load_report(self) -> list[tuple[str, PageImageReport]]:
+        """마지막 로딩에서 변환한 페이지별 (파일 이름, 이미지 검사/정규화 시간)을 반환한다. (캐시 사용 파일은 빠짐)"""
+        return list(self._load_report)
+
+    def get_preloaded_thumbnails(self) -> dict[int, QImage]:
+        """디스크 캐시에서 함께 읽어 온 페이지별 기본 썸네일을 반환한다. (없는 페이지는 빠짐)"""
+        return dict(self._preloaded_thumbnails)
+
+    def _drop_preloaded_thumbnails(self, page_nums) -> None:
+        for page_num in page_nums:
+            self._preloaded_thumbnails.pop(page_num, None)
+
+    def _shift_preloaded_thumbnails(self, deleted_pages) -> None:
+        """페이지 삭제 후 남은 썸네일을 새 페이지 번호로 옮긴다."""
+        deleted = sorted(set(deleted_pages))
+        shifted = {}
+        for page_num, image in self._preloaded_thumbnails.items():
+            if page_num in deleted:
+                continue
+            shifted[page_num - sum(1 for d in deleted if d < page_num)] = image
+        self._preloaded_thumbnails = shifted
+
+    def get_generation(self) -> int:
+        """현재 pdf_bytes의 문서 세대 id를 반환한다. (렌더링 스레드 핸들 캐시 키)"""
+        return self.generation
+
+    def _bump_generation(self) -> None:
+        """pdf_bytes가 바뀌었음을 알리고, 이전 세대의 스레드별 문서 핸들을 무효화한다."""
+        old_generation = self.generation
+        self.generation = next(_generation_counter)
+        with _thread_docs_lock:
+            _live_generations.add(self.generation)
+        self._display_lists.clear()
+        if old_generation:
+            PdfRender.release_thread_docs(old_generation)
+
+    def _detach_from_file(self) -> None:
+        """파일 기반 문서를 파일에서 한 번 읽은 바이트로 다시 열어 메모리 문서로 전환한다.
+
+        편집 메서드는 self.doc을 건드리기 전에 호출한다. (편집 후에 원본 파일이 바뀌어도 영향을 받지 않게)
+        읽은 바이트는 pdf_bytes로 보관하므로 이후 get_pdf_bytes가 파일을 다시 읽지 않는다.
+        세대도 올려, 경로로 열어 둔 스레드별 핸들이 더는 파일을 읽지 않게 한다.
+        """
+        if self._backing_path is None:
+            return
+        with open(self._backing_path, 'rb') as f:
+            self.pdf_bytes = f.read()
+        old_doc = self.doc
+        self.doc = pymupdf.open(stream=self.pdf_bytes, filetype="pdf")
+        self._backing_path = None
+        self._bump_generation()
+        if old_doc is not None:
+            old_doc.close()
+
+    def _mark_dirty(self) -> None:
+        """self.doc이 제자리 편집되었음을 표시한다. 바이트는 get_pdf_bytes() 호출 시 생성된다.
+
+        편집 전에 _detach_from_file()로 파일에서 분리되어 있어야 한다.
+        """
+        self._dirty = True
+        self.page_count = self.doc.page_count
+        self._bump_generation()
+
+    @staticmethod
+    def release_thread_docs(generation: int) -> None:
+        """지정한 세대의 스레드별 문서 핸들을 캐시에서 제거한다.
+
+        다른 스레드가 사용 중일 수 있으므로 직접 close()하지 않고 참조만 끊는다.
+        (사용이 끝나면 GC가 문서를 정리한다)
+        """
+        with _thread_docs_lock:
+            _live_generations.discard(generation)
+            stale = [tid for tid, entry in _thread_docs.items() if entry[0] == generation]
+            for tid in stale:
+                del _thread_docs[tid]
+
+    @staticmethod
+    def _cached_display_list(cache: OrderedDict, doc: "pymupdf.Document", page_num: int) -> "pymupdf.DisplayList":
+        """cache에서 페이지 DisplayList를 꺼내거나 새로 만들어 넣는다. (최대 DISPLAY_LIST_CACHE_SIZE개)"""
+        display_list = cache.get(page_num)
+        if display_list is not None:
+            cache.move_to_end(page_num)
+            return display_list
+
+        display_list = doc.load_page(page_num).get_displaylist(annots=True)
+        cache[page_num] = display_list
+        while len(cache) > DISPLAY_LIST_CACHE_SIZE:
+            cache.popitem(last=False)
+        return display_list
+
+    @staticmethod
+    def _render_matrix(zoom_factor: float, user_rotation: int) -> "pymupdf.Matrix":
+        """배율과 사용자 회전을 한 번에 적용하는 렌더링 행렬.
+        (QTransform().rotate(user_rotation)과 같은 방향으로 회전된 이미지를 만든다)"""
+        return pymupdf.Matrix(zoom_factor, zoom_factor).prerotate(user_rotation)
+
+    @staticmethod
+    def _pixmap_to_qpixmap(pix: "pymupdf.Pixmap") -> QPixmap:
+        # 렌더링 버퍼를 복사 없이 감싸고 QPixmap 변환 시 한 번만 복사한다 (pixmap_bridge 참고)
+        return to_qpixmap(pix)
+
+    def get_display_list(self, page_num: int) -> "pymupdf.DisplayList":
+        """self.doc 페이지의 DisplayList를 반환한다. (UI 스레드 전용, 최근 페이지 몇 개를 캐시)"""
+        self._ensure_loaded()
+        return PdfRender._cached_display_list(self._display_lists, self.doc, page_num)
+
+    @staticmethod
+    def _open_pdf_source(pdf_source: "bytes | str") -> "pymupdf.Document":
+        """렌더링 소스를 연다. 문자열이면 파일 경로로 열어 필요한 부분만 읽는다."""
+        if isinstance(pdf_source, str):
+            return pymupdf.open(pdf_source)
+        return pymupdf.open(stream=pdf_source, filetype="pdf")
 
-    def load_preprocessed_pdf(self, path: str) -> None:
-        """전처리된 PDF 파일을 빠르게 로드한다."""
+    @staticmethod
+    def _acquire_thread_display_list(pdf_source: "bytes | str", doc_key: int, page_num: int) -> "pymupdf.DisplayList":
+        """현재 스레드 전용 문서 핸들에서 페이지 DisplayList를 꺼낸다."""
+        doc, display_lists = PdfRender._acquire_thread_doc(pdf_source, doc_key)
+        if not (0 <= page_num < len(doc)):
+            raise IndexError(f"잘못된 페이지 번호: {page_num}")
+        # display_lists는 이 스레드만 사용하므로 잠금 없이 다뤄도 된다.
+        return PdfRender._cached_display_list(display_lists, doc, page_num)
+
+    @staticmethod
+    def _acquire_thread_doc(pdf_source: "bytes | str", doc_key: int) -> tuple["pymupdf.Document", OrderedDict]:
+        """현재 스레드 전용 (문서 핸들, DisplayList 캐시)를 반환한다. 세대가 다르면 새로 열어 교체한다.
+
+        이미 끝난 세대의 작업(문서 교체 직전에 시작된 작업 등)은 이번 호출에만 쓸 핸들을 열고 캐시에 넣지 않는다.
+        캐시를 만질 때마다 끝난 세대의 다른 스레드 항목도 함께 지운다.
+        """
+        tid = threading.get_ident()
+        with _thread_docs_lock:
+            cached = _thread_docs.get(tid)
+            for stale_tid in [t for t, entry in _thread_docs.items() if entry[0] not in _live_generations]:
+                del _thread_docs[stale_tid]
+            is_live = doc_key in _live_generations
+        if cached is not None and cached[0] == doc_key and is_live:
+            return cached[1], cached[2]
+
+        doc = PdfRender._open_pdf_source(pdf_source)
+        display_lists = OrderedDict()
+        if is_live:
+            with _thread_docs_lock:
+                _thread_docs[tid] = (doc_key, doc, display_lists)
+        if cached is not None and cached[0] != doc_key:
+            # 이 스레드만 쓰던 이전 세대 핸들이므로 바로 닫아도 안전하다.
+            cached[1].close()
+        return doc, display_lists
+
+    def load_preprocessed_pdf(self, path: str, thumbnails: list[QImage] | None = None) -> None:
+        """전처리된 PDF 파일을 빠르게 로드한다.
+
+        파일 기반 문서로 열어 두고, 첫 편집(또는 get_pdf_bytes) 전에 메모리 사본으로 전환한다. (copy-on-write)
+        thumbnails: 미리 만들어 둔 페이지별 기본 썸네일 (렌더링 번들 등). 있으면 썸네일 생성을 건너뛴다.
+        """
         if not Path(path).exists():
             raise FileNotFoundError(f"전처리된 파일을 찾을 수 없습니다: {path}")
         
         try:
             print(f"🚀 전처리된 파일 고속 로딩 시작: {Path(path).name}")
-            with open(path, 'rb') as f:
-                self.pdf_bytes = f.read()
-            
-            self.doc = pymupdf.open(stream=self.pdf_bytes, filetype="pdf")
+            # 파일 전체를 메모리로 복사하지 않고 경로로 연다 (필요한 객체만 그때그때 읽음)
+            self.doc = pymupdf.open(path)
+            self.pdf_bytes = None
+            self._backing_path = str(path)
+            self._dirty = False
             self.pdf_path = path
             self.page_count = len(self.doc)
+            self._preloaded_thumbnails = dict(enumerate((thumbnails or [])[:self.page_count]))
+            self._bump_generation()
             print(f"✅ 고속 로딩 완료. 총 {self.page_count} 페이지.")
         
         except Exception as exc:
             traceback.print_exc()
             raise ValueError(f"전처리된 문서 로딩 중 오류 발생: {exc}")
 
+    @staticmethod
+    def _is_scanned_page(page: "pymupdf.Page") -> bool:
+        """텍스트 레이어 없이 이미지가 페이지 대부분을 덮는 스캔 페이지인지 판단한다."""
+        if page.get_text("text").strip():
+            return False
+
+        page_area = abs(page.rect)
+        if page_area <= 0:
+            return False
+
+        covered = 0.0
+        for img in page.get_images(full=True):
+            for rect in page.get_image_rects(img[0]):
+                covered += abs(rect & page.rect)
+        return covered >= page_area * SCANNED_IMAGE_COVERAGE
+
+    def _needs_raster(self, page: "pymupdf.Page") -> bool:
+        """현재 정규화 방식에서 이 페이지를 래스터로 변환해야 하는지 판단한다."""
+        if self.normalize_mode == NORMALIZE_MODE_RASTER:
+            return True
+        # show_pdf_page는 주석을 옮기지 못하므로 손실될 주석이 있으면 래스터로 굽는다
+        if page_will_lose_objects(page):
+            return True
+        return self._is_scanned_page(page)
+
+    @staticmethod
+    def _raster_zoom(bounds: "pymupdf.Rect") -> float:
+        """원본 페이지를 A4(방향 맞춤)에 target_dpi로 래스터 변환할 때의 배율"""
+        a4_rect = pymupdf.paper_rect("a4-l" if bounds.width > bounds.height else "a4")
+        target_pixel_width = a4_rect.width / 72 * PdfRender.target_dpi
+        target_pixel_height = a4_rect.height / 72 * PdfRender.target_dpi
+
+        zoom_x = target_pixel_width / bounds.width if bounds.width > 0 else 0
+        zoom_y = target_pixel_height / bounds.height if bounds.height > 0 else 0
+        return min(zoom_x, zoom_y)
+
+    def _append_a4_page(self, target_doc: "pymupdf.Document", source_doc: "pymupdf.Document",
+                        page_index: int, insert_at: int = -1, raster: bool | None = None) -> bool:
+        """원본 페이지 하나를 A4 규격 페이지로 변환하여 target_doc에 삽입한다.
+
+        raster를 넘기면 래스터 변환 여부 판단(_needs_raster)을 다시 하지 않는다.
+
+        Returns:
+            래스터로 변환했으면 True, 벡터로 배치했으면 False
+        """
+        page = source_doc.load_page(page_index)
+        bounds = page.bound()
+        is_landscape = bounds.width > bounds.height
+
+        if is_landscape:
+            a4_rect = pymupdf.paper_rect("a4-l")
+        else:
+            a4_rect = pymupdf.paper_rect("a4")
+
+        new_page = target_doc.new_page(insert_at, width=a4_rect.width, height=a4_rect.height)
+
+        page_rect = new_page.rect
+        margin_x = page_rect.width * (1 - NORMALIZE_MARGIN) / 2
+        margin_y = page_rect.height * (1 - NORMALIZE_MARGIN) / 2
+        target_rect = page_rect + (margin_x, margin_y, -margin_x, -margin_y)
+
+        if raster is None:
+            raster = self._needs_raster(page)
+        if not raster:
+            # 벡터/텍스트를 그대로 유지 (비율 유지하며 target_rect 안에 배치)
+            new_page.show_pdf_page(target_rect, source_doc, page_index)
+            return False
+
+        zoom = PdfRender._raster_zoom(bounds)
+        matrix = pymupdf.Matrix(zoom, zoom)
+        pix = page.get_pixmap(matrix=matrix, alpha=False, annots=True)
+        new_page.insert_image(target_rect, pixmap=pix)
+        return True
+
+    def _append_source_file(self, target_doc: "pymupdf.Document", path: str) -> None:
+        """원본 파일 하나를 A4 규격으로 변환하여 target_doc 끝에 붙인다.
+
+        디스크 캐시에 같은 파일/설정의 결과가 있으면 변환 없이 그대로 붙이고 썸네일 시트도 함께 읽는다.
+        없으면 파일 단위 문서에 변환한 뒤 붙이고, 그 결과를 백그라운드에서 캐시에 저장한다.
+        """
+        start_page = target_doc.page_count
+        settings_tag = DocumentCache.settings_tag(self.normalize_mode, PdfRender.target_dpi, NORMALIZE_MARGIN)
+
+        if self.doc_cache is not None:
+            cached = self.doc_cache.lookup(path, settings_tag)
+            if cached is not None:
+                with pymupdf.open(stream=cached.pdf_bytes, filetype="pdf") as cached_doc:
+                    target_doc.insert_pdf(cached_doc)
+                if cached.sheet_bytes:
+                    for offset, image in enumerate(split_thumbnail_sheet(cached.sheet_bytes, cached.sheet_layout)):
+                        self._preloaded_thumbnails[start_page + offset] = image
+                print(f"📦 디스크 캐시 사용: {Path(path).name} ({target_doc.page_count - start_page} 페이지)")
+                return
+
+        server = get_render_server()
+        if server is not None:
+            # 신뢰할 수 없는 원본 파일은 작업 프로세스에서 해석/변환하고 정규화된 바이트만 받는다
+            pdf_bytes, reports, raster_count = server.normalize(path, self.normalize_mode, PdfRender.target_dpi)
+            self._report_normalized_file(path, reports, raster_count)
+            if pdf_bytes:
+                with pymupdf.open(stream=pdf_bytes, filetype="pdf") as file_doc:
+                    target_doc.insert_pdf(file_doc)
+                if self.doc_cache is not None:
+                    self.doc_cache.store_async(path, settings_tag, pdf_bytes)
+            return
+
+        source_doc = self._open_source_document(path)
+        # 캐시에 파일 단위로 저장할 수 있도록 별도 문서에 먼저 변환한다
+        file_doc = pymupdf.open() if self.doc_cache is not None else target_doc
+        try:
+            raster_count, reports = self._normalize_pages(source_doc, file_doc)
+            self._report_normalized_file(path, reports, raster_count)
+
+            if file_doc is not target_doc and file_doc.page_count > 0:
+                target_doc.insert_pdf(file_doc)
+                # 직렬화(tobytes)는 저장 스레드에서 한다
+                self.doc_cache.store_async(path, settings_tag, file_doc)
+                file_doc = target_doc  # 넘긴 문서는 저장 스레드가 닫으므로 아래에서 닫지 않는다
+        finally:
+            source_doc.close()
+            if file_doc is not target_doc:
+                file_doc.close()
+
+    def _normalize_pages(self, source_doc: "pymupdf.Document",
+                         file_doc: "pymupdf.Document") -> tuple[int, list[PageImageReport]]:
+        """source_doc의 모든 페이지를 A4로 변환해 file_doc 끝에 붙인다. (래스터 변환 페이지 수, 페이지별 보고)"""
+        raster_count = 0
+        done_xrefs: set[int] = set()
+        reports = []
+        for page_index in range(source_doc.page_count):
+            page = source_doc.load_page(page_index)
+            raster = self._needs_raster(page)
+            if raster:
+                # 래스터 변환은 MuPDF가 목표 배율로 축소 디코딩하고 원본 이미지는 결과에 남지 않는다
+                report = inspect_page_images(page)
+            else:
+                # 벡터로 배치할 페이지는 원본 이미지가 그대로 남아 렌더링마다 디코딩되므로 한 번만 줄여 둔다
+                report = downsample_page_images(
+                    page, PdfRender._raster_zoom(page.bound()),
+                    LARGE_IMAGE_PIXELS_THRESHOLD, OVERSIZED_IMAGE_DPI_RATIO, done_xrefs
+                )
+            start = time.perf_counter()
+            if self._append_a4_page(file_doc, source_doc, page_index, raster=raster):
+                raster_count += 1
+            report.normalize_seconds = time.perf_counter() - start
+            report.rasterized = raster
+            reports.append(report)
+        return raster_count, reports
+
+    @staticmethod
+    def normalize_file(path: str, normalize_mode: str) -> tuple[bytes, list[PageImageReport], int]:
+        """원본 파일 하나를 A4로 변환한 PDF 바이트를 만든다. (렌더 서버 작업 프로세스에서 실행)
+
+        Returns:
+            (PDF 바이트, 페이지별 보고, 래스터 변환 페이지 수). 변환된 페이지가 없으면 바이트는 비어 있다.
+        """
+        renderer = PdfRender(normalize_mode=normalize_mode)
+        with PdfRender._open_source_document(path) as source_doc, pymupdf.open() as file_doc:
+            raster_count, reports = renderer._normalize_pages(source_doc, file_doc)
+            pdf_bytes = file_doc.tobytes(garbage=1, deflate=True) if file_doc.page_count > 0 else b""
+        return pdf_bytes, reports, raster_count
+
+    def _report_normalized_file(self, path: str, reports: list[PageImageReport], raster_count: int) -> None:
+        """파일 하나의 정규화 결과를 출력하고 로드 보고에 기록한다."""
+        print(f"정규화 방식: {self.normalize_mode} "
+              f"(래스터 {raster_count} / 벡터 {len(reports) - raster_count} 페이지)")
+        self._record_load_report(Path(path).name, reports)
+
+    def _record_load_report(self, file_name: str, reports: list[PageImageReport]) -> None:
+        """파일 하나의 페이지별 이미지 검사/정규화 시간을 기록하고 출력한다.
+
+        이미지를 줄였거나 느렸던 페이지, 거대 이미지를 원본 크기로 디코딩한 래스터 페이지만 한 줄씩 출력한다.
+        (전체는 get_load_report)
+        """
+        self._load_report.extend((file_name, report) for report in reports)
+        total = sum(r.guard_seconds + r.normalize_seconds for r in reports)
+        downsampled = sum(r.downsampled for r in reports)
+        raster_seconds = sum(r.normalize_seconds for r in reports if r.rasterized)
+        print(f"📋 로드 리포트: {file_name} ({len(reports)} 페이지, {total:.2f}초, 이미지 축소 {downsampled}개, "
+              f"래스터 변환 {raster_seconds:.2f}초)")
+        for r in reports:
+            if (r.downsampled or r.guard_seconds + r.normalize_seconds >= SLOW_PAGE_SECONDS
+                    or r.full_decode_pixels > LARGE_IMAGE_PIXELS_THRESHOLD):
+                if r.rasterized:
+                    # 래스터 변환은 렌더링 중에 이미지를 디코딩하므로 디코딩 시간이 정규화 시간에 들어 있다
+                    timing = (f"검사 {r.guard_seconds * 1000:.0f} ms, 래스터(디코딩 포함) {r.normalize_seconds * 1000:.0f} ms, "
+                              f"원본 크기 디코딩 최대 {r.full_decode_pixels / 1e6:.1f} MP")
+                else:
+                    timing = f"검사/디코딩 {r.guard_seconds * 1000:.0f} ms, 정규화 {r.normalize_seconds * 1000:.0f} ms"
+                print(f"   p{r.page_index + 1}: 이미지 {r.image_count}개 (최대 {r.largest_pixels / 1e6:.1f} MP, "
+                      f"축소 {r.downsampled}) {timing}")
+
     def load_pdf(self, path: str) -> None:
         """단일 PDF 파일을 A4 규격으로 변환하여 메모리에 저장한다."""
         if not path:
@@ -55,52 +490,18 @@ class PdfRender:
         if not Path(path).exists():
             raise FileNotFoundError(f"파일을 찾을 수 없습니다: {path}")
         
-        source_doc = None
         new_doc = None
         
         try:
             print(f"🔄 A4 변환 시작: {Path(path).name}")
             
-            # 원본 PDF 열기
-            source_doc = pymupdf.open(path)
-            if source_doc.page_count == 0:
-                raise ValueError("처리할 수 있는 유효한 페이지가 없습니다.")
-            
-            print(f"원본 문서 로드 완료. 총 {source_doc.page_count} 페이지.")
-
-            # A4 규격으로 변환
-            print("A4 규격으로 변환 중...")
+            # A4 규격으로 변환 (디스크 캐시에 있으면 재사용)
             new_doc = pymupdf.open()
-            TARGET_DPI = 200
-
-            for page in source_doc:
-                bounds = page.bound()
-                is_landscape = bounds.width > bounds.height
-                
-                if is_landscape: 
-                    a4_rect = pymupdf.paper_rect("a4-l")
-                else: 
-                    a4_rect = pymupdf.paper_rect("a4")
-                
-                target_pixel_width = a4_rect.width / 72 * TARGET_DPI
-                target_pixel_height = a4_rect.height / 72 * TARGET_DPI
-
-                zoom_x = target_pixel_width / bounds.width if bounds.width > 0 else 0
-                zoom_y = target_pixel_height / bounds.height if bounds.height > 0 else 0
-                zoom = min(zoom_x, zoom_y)
-
-                matrix = pymupdf.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=matrix, alpha=False, annots=True)
-                
-                new_page = new_doc.new_page(width=a4_rect.width, height=a4_rect.height)
-                
-                margin = 0.98
-                page_rect = new_page.rect
-                margin_x = page_rect.width * (1 - margin) / 2
-                margin_y = page_rect.height * (1 - margin) / 2
-                target_rect = page_rect + (margin_x, margin_y, -margin_x, -margin_y)
-
-                new_page.insert_image(target_rect, pixmap=pix)
+            self._preloaded_thumbnails.clear()
+            self._load_report.clear()
+            self._append_source_file(new_doc, path)
+            if new_doc.page_count == 0:
+                raise ValueError("처리할 수 있는 유효한 페이지가 없습니다.")
 
             print("A4 규격 변환 완료. 최종 바이트 스트림 생성 중...")
             self.pdf_bytes = new_doc.tobytes(garbage=4, deflate=True)
@@ -111,20 +512,51 @@ class PdfRender:
             print(f"✅ A4 변환 완료 (크기: {len(self.pdf_bytes)} bytes).")
             
             self.doc = pymupdf.open(stream=self.pdf_bytes, filetype="pdf")
+            self._dirty = False
+            self._backing_path = None
             self.pdf_path = path
             self.page_count = len(self.doc)
+            self._bump_generation()
 
         except Exception as exc:
             traceback.print_exc()
             raise ValueError(f"문서 처리 중 오류 발생: {exc}")
         finally:
-            if source_doc: source_doc.close()
             if new_doc: new_doc.close()
 
 
     def get_pdf_bytes(self) -> bytes | None:
-        """변환된 PDF의 바이트 데이터를 반환한다."""
+        """변환된 PDF의 바이트 데이터를 반환한다.
+
+        편집 이후 아직 직렬화되지 않았다면 이때 한 번만 바이트를 생성한다.
+        (저장 Worker, 백그라운드 렌더링, 되돌리기 스냅샷 등 실제 소비자가 필요할 때)
+        """
+        # 파일 기반 문서는 이때 파일을 한 번 읽어 메모리 문서로 전환하고 바이트를 보관한다
+        # (저장, 되돌리기 스냅샷 등 바이트가 필요해졌다면 곧 편집이 뒤따르는 경우가 대부분)
+        self._detach_from_file()
+        if self._dirty and self.doc is not None:
+            # 편집으로 떨어져 나간 객체만 정리하는 가벼운 직렬화 (최종 압축은 저장 단계에서 수행)
+            self.pdf_bytes = self.doc.tobytes(garbage=1, deflate=True)
+            self._dirty = False
         return self.pdf_bytes
+
+    def get_render_source(self) -> "bytes | str | None":
+        """렌더링 Worker에 넘길 문서 소스를 반환한다.
+
+        수정되지 않은 파일 기반 문서면 파일 경로(각 스레드가 경로로 직접 연다),
+        그 외에는 get_pdf_bytes()의 바이트를 반환한다.
+        """
+        if self._backing_path is not None:
+            return self._backing_path
+        return self.get_pdf_bytes()
+
+    def is_file_backed(self) -> bool:
+        """수정되지 않은 파일 기반 문서인지 확인한다."""
+        return self._backing_path is not None
+
+    def has_document(self) -> bool:
+        """바이트 직렬화 없이 문서가 로드되어 있는지 확인한다."""
+        return self.doc is not None and self.page_count > 0
         
     def _ensure_loaded(self) -> None:
         if self.doc is None:
@@ -147,17 +579,13 @@ class PdfRender:
         if page_num < 0 or page_num >= self.page_count:
             raise IndexError(f"잘못된 페이지 번호: {page_num}")
 
-        page = self.doc.load_page(page_num)
-        # alpha=False로 불필요한 알파 채널 방지(성능/메모리), 주석 해제 시 투명 포함 가능
+        # alpha=False로 불필요한 알파 채널 방지(성능/메모리)
+        # 캐시된 DisplayList를 재사용하여 배율이 바뀌어도 콘텐츠를 다시 해석하지 않는다
         mat = pymupdf.Matrix(zoom_factor, zoom_factor)
-        pix = page.get_pixmap(matrix=mat, alpha=False, annots=True)
+        pix = self.get_display_list(page_num).get_pixmap(matrix=mat, alpha=False)
 
         # PyMuPDF pixmap -> QImage -> QPixmap
-        image_format = QImage.Format.Format_RGB888 if not pix.alpha else QImage.Format.Format_RGBA8888
-        qimage = QImage(pix.samples, pix.width, pix.height, pix.stride, image_format)
-        # QImage가 원본 버퍼에 의존하지 않도록 강제 복사
-        qimage = qimage.copy()
-        return QPixmap.fromImage(qimage)
+        return PdfRender._pixmap_to_qpixmap(pix)
 
     def set_pdf_bytes(self, pdf_bytes: bytes):
         """
@@ -166,6 +594,11 @@ class PdfRender:
         self.pdf_bytes = pdf_bytes
         # 새 데이터로 교체되었으므로, doc 객체도 다시 로드해야 함
         self.doc = pymupdf.open(stream=self.pdf_bytes, filetype="pdf")
+        self._dirty = False
+        self._backing_path = None
+        # 페이지 구성이 어떻게 바뀌었는지 알 수 없으므로 미리 읽은 썸네일은 버린다
+        self._preloaded_thumbnails.clear()
+        self._bump_generation()
 
     def create_thumbnail(self, page_num: int, max_width: int = 90, user_rotation: int = 0) -> QIcon:
         """선명한 썸네일(QIcon)을 생성한다.
@@ -185,46 +618,57 @@ class PdfRender:
         if page_num < 0 or page_num >= self.page_count:
             raise IndexError(f"잘못된 페이지 번호: {page_num}")
 
-        page = self.doc.load_page(page_num)
+        display_list = self.get_display_list(page_num)
+        return QIcon(QPixmap.fromImage(PdfRender._thumbnail_image(display_list, max_width, user_rotation)))
+
+    @staticmethod
+    def _thumbnail_image(display_list: "pymupdf.DisplayList", max_width: int, user_rotation: int = 0) -> QImage:
+        """DisplayList로부터 폭 max_width 이하의 썸네일 QImage를 만든다. (QImage라 작업 스레드에서도 안전)"""
+        pix = PdfRender._thumbnail_pixmap(display_list, max_width, PdfRender.thumbnail_oversampling, user_rotation)
+        # 렌더링 버퍼를 복사 없이 감싼 뒤 축소 결과만 새로 할당한다
+        return to_scaled_qimage(pix, max_width)
 
-        # 페이지 원본 크기(포인트 단위)를 이용해 목표 폭의 2배 정도로 렌더링 비율 계산
-        rect = page.rect
+    @staticmethod
+    def _thumbnail_pixmap(display_list: "pymupdf.DisplayList | pymupdf.Page", max_width: int, oversampling: float,
+                          user_rotation: int = 0) -> "pymupdf.Pixmap":
+        """썸네일용으로 목표 폭의 oversampling배로 렌더링한 Pixmap (축소 전, 렌더 서버 작업 프로세스도 사용)"""
+        # 페이지 원본 크기(포인트 단위)를 이용해 목표 폭의 oversampling배로 렌더링 비율 계산
+        rect = display_list.rect
         if rect.width == 0:
-            zoom = 2.0
+            zoom = oversampling
         else:
-            target_render_width = max(max_width * 2, max_width)  # 최소 2배 oversampling
+            target_render_width = max(max_width * oversampling, max_width)
             zoom = max(1.0, target_render_width / rect.width)
 
-        mat = pymupdf.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, alpha=False, annots=True)
-
-        image_format = QImage.Format.Format_RGB888 if not pix.alpha else QImage.Format.Format_RGBA8888
-        qimage = QImage(pix.samples, pix.width, pix.height, pix.stride, image_format).copy()
-        qpix = QPixmap.fromImage(qimage)
-
-        # 사용자 회전 적용
-        if user_rotation != 0:
-            transform = QTransform().rotate(user_rotation)
-            qpix = qpix.transformed(transform, Qt.TransformationMode.SmoothTransformation)
+        # 사용자 회전은 렌더링 행렬로 바로 적용 (Qt 쪽 이미지 회전 없음)
+        return display_list.get_pixmap(matrix=PdfRender._render_matrix(zoom, user_rotation), alpha=False)
 
-        if qpix.width() > max_width:
-            qpix = qpix.scaled(
-                max_width,
-                int(qpix.height() * (max_width / qpix.width())),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-
-        return QIcon(qpix)
+    @staticmethod
+    def render_thumbnail_thread_safe(pdf_source: "bytes | str", page_num: int, max_width: int, doc_key: int) -> QImage:
+        """작업 스레드에서 회전 없는 기본 썸네일(QImage)을 만든다.
+        - 스레드별 문서 핸들/DisplayList를 재사용하므로 페이지마다 문서를 다시 열지 않는다.
+        - 회전은 호출 측에서 이 이미지를 돌려 적용한다.
+        - 프로세스 분리 백엔드가 켜져 있으면 렌더 서버의 작업 프로세스에서 렌더링한다.
+        """
+        server = get_render_server()
+        if server is not None:
+            return server.render_thumbnail(pdf_source, page_num, max_width, PdfRender.thumbnail_oversampling, doc_key)
+        display_list = PdfRender._acquire_thread_display_list(pdf_source, doc_key, page_num)
+        return PdfRender._thumbnail_image(display_list, max_width)
 
     def close(self) -> None:
         """문서를 닫고 자원 해제."""
+        if self.generation:
+            PdfRender.release_thread_docs(self.generation)
         if self.doc is not None:
             try:
                 self.doc.close()
             finally:
                 self.doc = None
                 self.page_count = 0
+                self._dirty = False
+                self._backing_path = None
+                self._preloaded_thumbnails.clear()
 
     def get_page_count(self) -> int:
         """페이지 수 반환."""
@@ -248,7 +692,7 @@ class PdfRender:
             page_nums: 0-based 페이지 인덱스 리스트
             crop_rect_normalized: (x, y, width, height) 정규화된 자르기 영역 (0.0~1.0)
         """
-        if not self.pdf_bytes:
+        if self.doc is None:
             raise RuntimeError("PDF가 로드되지 않았습니다.")
         
         if not page_nums:
@@ -265,151 +709,134 @@ class PdfRender:
         if not (0.0 <= x <= 1.0 and 0.0 <= y <= 1.0 and 
                 0.0 < width <= 1.0 and 0.0 < height <= 1.0):
             raise ValueError("자르기 영역이 유효하지 않습니다.")
-        
-        page_nums_set = set(page_nums)  # 빠른 조회를 위해 set 사용
-        
+
+        self._detach_from_file()
         try:
-            # 현재 PDF 바이트에서 새 문서 생성
-            with pymupdf.open(stream=self.pdf_bytes, filetype="pdf") as source_doc:
-                new_doc = pymupdf.open()
+            # 자르기 대상 페이지만 현재 문서에서 제자리 교체 (나머지 페이지는 건드리지 않음)
+            for page_num in sorted(set(page_nums)):
+                page = self.doc.load_page(page_num)
+                page_rect = page.rect
                 
-                # 모든 페이지를 복사하되, 지정된 페이지들만 자르기 적용
-                for i, page in enumerate(source_doc):
-                    if i in page_nums_set:
-                        # 자르기 적용할 페이지
-                        page_rect = page.rect
-                        
-                        # 정규화된 좌표를 실제 페이지 좌표로 변환
-                        crop_x = page_rect.x0 + x * page_rect.width
-                        crop_y = page_rect.y0 + y * page_rect.height  
-                        crop_width = width * page_rect.width
-                        crop_height = height * page_rect.height
-                        
-                        crop_rect = pymupdf.Rect(
-                            crop_x, crop_y, 
-                            crop_x + crop_width, crop_y + crop_height
-                        )
-                        
-                        # 자르기 영역을 고해상도로 렌더링 (TARGET_DPI 사용)
-                        TARGET_DPI = 200
-                        zoom_factor = TARGET_DPI / 72.0
-                        matrix = pymupdf.Matrix(zoom_factor, zoom_factor)
-                        
-                        # 자르기 영역만 렌더링
-                        pix = page.get_pixmap(matrix=matrix, clip=crop_rect, alpha=False, annots=True)
-                        
-                        # A4 세로 페이지 생성
-                        a4_rect = pymupdf.paper_rect("a4")
-                        new_page = new_doc.new_page(width=a4_rect.width, height=a4_rect.height)
-                        
-                        # A4 페이지에 자른 이미지를 확대하여 삽입 (2% 여백)
-                        margin = 0.98
-                        target_rect = new_page.rect
-                        margin_x = target_rect.width * (1 - margin) / 2
-                        margin_y = target_rect.height * (1 - margin) / 2
-                        insert_rect = target_rect + (margin_x, margin_y, -margin_x, -margin_y)
-                        
-                        new_page.insert_image(insert_rect, pixmap=pix)
-                        
-                    else:
-                        # 다른 페이지들은 A4 규격으로 변환하여 복사
-                        page = source_doc.load_page(i)
-                        
-                        # 페이지 방향에 맞춰 A4 크기 결정
-                        bounds = page.bound()
-                        is_landscape = bounds.width > bounds.height
-                        if is_landscape: a4_rect = pymupdf.paper_rect("a4-l")
-                        else: a4_rect = pymupdf.paper_rect("a4")
-                        
-                        new_page = new_doc.new_page(width=a4_rect.width, height=a4_rect.height)
-                        new_page.show_pdf_page(new_page.rect, source_doc, i)
+                # 정규화된 좌표를 실제 페이지 좌표로 변환
+                crop_x = page_rect.x0 + x * page_rect.width
+                crop_y = page_rect.y0 + y * page_rect.height  
+                crop_width = width * page_rect.width
+                crop_height = height * page_rect.height
                 
-                # 새로운 PDF 바이트 생성
-                self.pdf_bytes = new_doc.tobytes(garbage=4, deflate=True)
+                crop_rect = pymupdf.Rect(
+                    crop_x, crop_y, 
+                    crop_x + crop_width, crop_y + crop_height
+                )
                 
-                # 문서 객체 갱신
-                if self.doc:
-                    self.doc.close()
-                self.doc = pymupdf.open(stream=self.pdf_bytes, filetype="pdf")
+                # 자르기 영역만 고해상도로 렌더링
+                zoom_factor = PdfRender.target_dpi / 72.0
+                matrix = pymupdf.Matrix(zoom_factor, zoom_factor)
+                pix = page.get_pixmap(matrix=matrix, clip=crop_rect, alpha=False, annots=True)
                 
-                if len(page_nums) == 1:
-                    print(f"페이지 {page_nums[0] + 1}에 자르기 적용 완료")
-                else:
-                    print(f"{len(page_nums)}개 페이지에 자르기 적용 완료: {[p+1 for p in sorted(page_nums)]}")
+                # 기존 페이지를 A4 세로 페이지로 교체
+                self.doc.delete_page(page_num)
+                a4_rect = pymupdf.paper_rect("a4")
+                new_page = self.doc.new_page(page_num, width=a4_rect.width, height=a4_rect.height)
+                
+                # A4 페이지에 자른 이미지를 확대하여 삽입 (2% 여백)
+                target_rect = new_page.rect
+                margin_x = target_rect.width * (1 - NORMALIZE_MARGIN) / 2
+                margin_y = target_rect.height * (1 - NORMALIZE_MARGIN) / 2
+                insert_rect = target_rect + (margin_x, margin_y, -margin_x, -margin_y)
+                
+                new_page.insert_image(insert_rect, pixmap=pix)
+            
+            self._drop_preloaded_thumbnails(page_nums)
+            self._mark_dirty()
+            
+            if len(page_nums) == 1:
+                print(f"페이지 {page_nums[0] + 1}에 자르기 적용 완료")
+            else:
+                print(f"{len(page_nums)}개 페이지에 자르기 적용 완료: {[p+1 for p in sorted(page_nums)]}")
                 
         except Exception as e:
             traceback.print_exc()
             raise ValueError(f"자르기 적용 중 오류 발생: {e}")
 
     @staticmethod
-    def render_page_thread_safe(pdf_bytes: bytes, page_num: int, zoom_factor: float = 2.0, user_rotation: int = 0) -> QPixmap:
+    def render_page_thread_safe(pdf_source: "bytes | str", page_num: int, zoom_factor: float = 2.0, user_rotation: int = 0,
+                                doc_key: int | None = None) -> QPixmap:
         """
-        A4로 사전 변환된 PDF 바이트 스트림으로부터 페이지를 렌더링한다.
+        A4로 사전 변환된 PDF(바이트 스트림 또는 파일 경로, get_render_source 참고)로부터 페이지를 렌더링한다.
         - 이제 이 메서드는 항상 A4 비율의 페이지를 다루게 된다.
+        - doc_key(문서 세대 id)를 넘기면 스레드별로 열어둔 문서 핸들을 재사용하여
+          페이지마다 전체 바이트 스트림을 다시 파싱하지 않는다.
+        - 프로세스 분리 백엔드가 켜져 있으면 렌더 서버의 작업 프로세스에서 렌더링한다.
         """
-        doc = None
-        try:
-            doc = pymupdf.open(stream=pdf_bytes, filetype="pdf")
-            if page_num < 0 or page_num >= len(doc):
-                raise IndexError(f"잘못된 페이지 번호: {page_num}")
-
-            page = doc.load_page(page_num)
+        server = get_render_server()
+        if server is not None:
+            return server.render(pdf_source, page_num, zoom_factor, user_rotation, doc_key=doc_key)
 
-            # 고화질 렌더링 매트릭스 생성
-            zoom_matrix = pymupdf.Matrix(zoom_factor, zoom_factor)
-            pix = page.get_pixmap(matrix=zoom_matrix, alpha=False, annots=True)
-
-            image_format = QImage.Format.Format_RGB888 if not pix.alpha else QImage.Format.Format_RGBA8888
-            qimage = QImage(pix.samples, pix.width, pix.height, pix.stride, image_format).copy()
-            
-            pixmap = QPixmap.fromImage(qimage)
+        # 배율과 사용자 회전을 렌더링 행렬 하나로 적용 (완성된 이미지를 Qt에서 다시 회전하지 않음)
+        render_matrix = PdfRender._render_matrix(zoom_factor, user_rotation)
+        doc = None  # 이 호출에서 직접 연 문서만 finally에서 닫는다.
+        try:
+            if doc_key is None:
+                doc = PdfRender._open_pdf_source(pdf_source)
+                if page_num < 0 or page_num >= len(doc):
+                    raise IndexError(f"잘못된 페이지 번호: {page_num}")
+                pix = doc.load_page(page_num).get_pixmap(matrix=render_matrix, alpha=False, annots=True)
+            else:
+                # 스레드별로 캐시된 DisplayList 재사용: 회전/배율만 바뀐 재렌더링은 콘텐츠 해석을 건너뛴다
+                display_list = PdfRender._acquire_thread_display_list(pdf_source, doc_key, page_num)
+                pix = display_list.get_pixmap(matrix=render_matrix, alpha=False)
 
-            # 사용자 인터페이스에서 요청한 추가 회전을 적용한다.
-            if user_rotation != 0:
-                transform = QTransform().rotate(user_rotation)
-                pixmap = pixmap.transformed(transform, Qt.TransformationMode.SmoothTransformation)
-            
-            return pixmap
+            return PdfRender._pixmap_to_qpixmap(pix)
             
         finally:
             if doc:
                 doc.close()
 
+    @staticmethod
+    def render_page_progressive(pdf_source: "bytes | str", page_num: int, zoom_factor: float = 2.0, user_rotation: int = 0,
+                                doc_key: int | None = None, on_preview=None) -> QPixmap:
+        """
+        저해상도 미리보기를 먼저 만들어 on_preview(QPixmap)로 전달한 뒤 최종 해상도로 렌더링한다.
+        - 대용량 스캔 페이지도 미리보기는 거의 즉시 표시할 수 있다.
+        - on_preview가 없거나 요청 배율이 미리보기 배율 이하이면 한 번만 렌더링한다.
+        """
+        if on_preview is not None and zoom_factor > PREVIEW_ZOOM_FACTOR:
+            preview = PdfRender.render_page_thread_safe(
+                pdf_source, page_num, PREVIEW_ZOOM_FACTOR, user_rotation, doc_key=doc_key
+            )
+            on_preview(preview)
+        return PdfRender.render_page_thread_safe(pdf_source, page_num, zoom_factor, user_rotation, doc_key=doc_key)
+
     def delete_pages(self, page_nums_to_delete: list[int]):
         """지정된 페이지들을 PDF에서 삭제하고 내부 데이터를 갱신한다."""
-        if not self.pdf_bytes:
+        if self.doc is None:
             raise RuntimeError("PDF가 로드되지 않았습니다.")
         
+        self._detach_from_file()
         # 중복 제거 및 정렬
         pages_to_delete = sorted(list(set(page_nums_to_delete)), reverse=True)
         
         try:
-            with pymupdf.open(stream=self.pdf_bytes, filetype="pdf") as source_doc:
-                # 유효한 페이지 번호인지 확인
-                for page_num in pages_to_delete:
-                    if not (0 <= page_num < source_doc.page_count):
-                         raise IndexError(f"잘못된 페이지 번호: {page_num}")
-                
-                # 지정된 페이지들을 삭제
-                source_doc.delete_pages(pages_to_delete)
-                
-                # 페이지가 하나도 남지 않았는지 확인
-                if source_doc.page_count == 0:
-                    self.pdf_bytes = b"" # 빈 바이트로 설정
-                else:
-                    # 변경된 내용으로 새로운 바이트 데이터 생성
-                    self.pdf_bytes = source_doc.tobytes(garbage=4, deflate=True)
-
-            # 새 데이터로 내부 문서 객체와 페이지 수 갱신
-            if self.doc:
-                self.doc.close()
+            # 유효한 페이지 번호인지 확인
+            for page_num in pages_to_delete:
+                if not (0 <= page_num < self.doc.page_count):
+                     raise IndexError(f"잘못된 페이지 번호: {page_num}")
             
-            if self.pdf_bytes:
-                self.doc = pymupdf.open(stream=self.pdf_bytes, filetype="pdf")
-                self.page_count = self.doc.page_count
-            else:
+            # 페이지가 하나도 남지 않으면 문서를 비운다
+            if len(pages_to_delete) >= self.doc.page_count:
+                self.doc.close()
                 self.doc = None
+                self.pdf_bytes = b"" # 빈 바이트로 설정
                 self.page_count = 0
+                self._dirty = False
+                self._backing_path = None
+                self._preloaded_thumbnails.clear()
+                self._bump_generation()
+            else:
+                # 현재 문서에서 제자리 삭제 (바이트는 필요할 때 생성)
+                self.doc.delete_pages(pages_to_delete)
+                self._shift_preloaded_thumbnails(pages_to_delete)
+                self._mark_dirty()
             
             print(f"페이지 삭제 완료: {[p + 1 for p in sorted(page_nums_to_delete)]}. 현재 페이지 수: {self.page_count}")
 
@@ -417,79 +844,86 @@ class PdfRender:
             traceback.print_exc()
             raise ValueError(f"페이지 삭제 중 오류 발생: {e}")
 
-    def append_file(self, file_path: str) -> None:
-        """파일(PDF/이미지)을 현재 문서의 끝에 추가한다 (A4 변환 적용)."""
-        if not self.pdf_bytes:
-            # 현재 문서가 없으면 그냥 로드
-            self.load_pdf(file_path)
-            return
-
-        try:
-            # 1. 추가할 파일을 임시 문서로 오픈
-            append_doc = pymupdf.open()
-            ext = os.path.splitext(file_path)[1].lower()
-            
-            if ext == '.pdf':
-                with pymupdf.open(file_path) as f:
-                    append_doc.insert_pdf(f)
-            elif ext in ['.png', '.jpg', '.jpeg']:
-                with Image.open(file_path).convert("RGB") as img:
-                    img_bytes = io.BytesIO()
-                    img.save(img_bytes, format="PDF")
-                    img_bytes.seek(0)
-                    with pymupdf.open("pdf", img_bytes.read()) as img_doc:
-                        append_doc.insert_pdf(img_doc)
-            else:
-                 raise ValueError(f"지원하지 않는 파일 형식입니다: {ext}")
-            
-            # 2. 현재 문서를 수정 가능한 상태로 오픈
-            current_doc = pymupdf.open(stream=self.pdf_bytes, filetype="pdf")
-            
-            # 3. 추가할 문서의 페이지를 A4로 변환하여 현재 문서 끝에 추가
-            TARGET_DPI = 200
-            for page in append_doc:
-                bounds = page.bound()
-                is_landscape = bounds.width > bounds.height
-                
-                if is_landscape: a4_rect = pymupdf.paper_rect("a4-l")
-                else: a4_rect = pymupdf.paper_rect("a4")
-                
-                target_pixel_width = a4_rect.width / 72 * TARGET_DPI
-                target_pixel_height = a4_rect.height / 72 * TARGET_DPI
+    @staticmethod
+    def _open_source_document(file_path: str) -> "pymupdf.Document":
+        """추가할 파일(PDF/이미지)을 PDF 문서로 연다. 이미지는 PDF로 변환한다."""
+        ext = os.path.splitext(file_path)[1].lower()
+
+        if ext == '.pdf':
+            return pymupdf.open(file_path)
+        if ext in ['.png', '.jpg', '.jpeg']:
+            # 과대 사진은 A4 목표 해상도 안으로 줄여서 연다 (JPEG은 처음부터 축소 디코딩)
+            a4_rect = pymupdf.paper_rect("a4")
+            a4_pixels = (round(a4_rect.width / 72 * PdfRender.target_dpi), round(a4_rect.height / 72 * PdfRender.target_dpi))
+            img = open_image_guarded(file_path, a4_pixels, LARGE_IMAGE_PIXELS_THRESHOLD, OVERSIZED_IMAGE_DPI_RATIO)
+            img_bytes = io.BytesIO()
+            img.save(img_bytes, format="PDF")
+            return pymupdf.open("pdf", img_bytes.getvalue())
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {ext}")
+
+    def load_many(self, paths: list[str], progress_callback=None) -> None:
+        """여러 파일(PDF/이미지)을 A4 규격으로 변환하여 하나의 문서로 합친다.
+
+        모든 페이지를 하나의 메모리 문서에 모은 뒤 마지막에 한 번만 직렬화한다.
+        현재 문서가 있으면 그 끝에 이어 붙인다.
 
-                zoom_x = target_pixel_width / bounds.width if bounds.width > 0 else 0
-                zoom_y = target_pixel_height / bounds.height if bounds.height > 0 else 0
-                zoom = min(zoom_x, zoom_y)
+        Args:
+            paths: 추가할 파일 경로 목록 (순서대로 병합)
+            progress_callback: 파일 하나를 처리할 때마다 (완료 수, 전체 수, 파일 경로)로 호출
+        """
+        if not paths:
+            raise ValueError("입력 파일 경로가 없습니다.")
 
-                matrix = pymupdf.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=matrix, alpha=False, annots=True)
-                
-                new_page = current_doc.new_page(width=a4_rect.width, height=a4_rect.height)
-                
-                margin = 0.98
-                page_rect = new_page.rect
-                margin_x = page_rect.width * (1 - margin) / 2
-                margin_y = page_rect.height * (1 - margin) / 2
-                target_rect = page_rect + (margin_x, margin_y, -margin_x, -margin_y)
+        for path in paths:
+            if not Path(path).exists():
+                raise FileNotFoundError(f"파일을 찾을 수 없습니다: {path}")
+
+        # 현재 문서가 있으면 제자리로 이어 붙이고, 없으면 새 문서를 만든다
+        self._detach_from_file()
+        target_doc = self.doc if self.doc is not None else pymupdf.open()
+        start_page_count = target_doc.page_count
+        if target_doc is not self.doc:
+            self._preloaded_thumbnails.clear()
+        self._load_report.clear()
+        try:
+            total = len(paths)
+            for index, path in enumerate(paths):
+                print(f"🔄 A4 변환 시작 ({index + 1}/{total}): {Path(path).name}")
+                self._append_source_file(target_doc, path)
 
-                new_page.insert_image(target_rect, pixmap=pix)
+                if progress_callback:
+                    progress_callback(index + 1, total, path)
 
-            # 4. 변경사항 저장 및 상태 업데이트
-            self.pdf_bytes = current_doc.tobytes(garbage=4, deflate=True)
-            
-            if self.doc:
-                self.doc.close()
-            self.doc = pymupdf.open(stream=self.pdf_bytes, filetype="pdf")
-            self.page_count = len(self.doc)
-            
-            append_doc.close()
-            current_doc.close()
-            
-            print(f"파일 추가 완료: {file_path}. 총 페이지 수: {self.page_count}")
+            if target_doc.page_count == start_page_count:
+                raise ValueError("처리할 수 있는 유효한 페이지가 없습니다.")
 
         except Exception as e:
             traceback.print_exc()
-            raise ValueError(f"파일 추가 중 오류 발생: {e}")
+            # 실패 시 이번 호출에서 추가한 페이지를 되돌린다
+            self._drop_preloaded_thumbnails(range(start_page_count, target_doc.page_count))
+            if target_doc is self.doc:
+                if target_doc.page_count > start_page_count:
+                    target_doc.delete_pages(from_page=start_page_count, to_page=target_doc.page_count - 1)
+            else:
+                target_doc.close()
+            raise ValueError(f"문서 병합 중 오류 발생: {e}")
+
+        # 바이트 직렬화는 실제로 필요할 때(get_pdf_bytes) 한 번만 수행된다
+        self.doc = target_doc
+        if self.pdf_path is None:
+            self.pdf_path = paths[0]
+        self._mark_dirty()
+
+        print(f"✅ 파일 {total}개 병합 완료. 총 페이지 수: {self.page_count}")
+
+    def append_file(self, file_path: str) -> None:
+        """파일(PDF/이미지)을 현재 문서의 끝에 추가한다 (A4 변환 적용)."""
+        if self.doc is None:
+            # 현재 문서가 없으면 그냥 로드
+            self.load_pdf(file_path)
+            return
+
+        self.load_many([file_path])
 
     def replace_page(self, page_num: int, source_pdf_bytes: bytes, source_page_num: int) -> None:
         """지정된 페이지를 원본 PDF 파일의 같은 페이지 번호로 교체한다.
@@ -499,9 +933,10 @@ class PdfRender:
             source_pdf_bytes: 원본 PDF 파일의 바이트 데이터
             source_page_num: 원본 PDF에서 가져올 페이지 번호 (0부터 시작)
         """
-        if not self.pdf_bytes:
+        if self.doc is None:
             raise RuntimeError("PDF가 로드되지 않았습니다.")
-        
+
+        self._detach_from_file()
         try:
             # 원본 PDF 문서 열기
             with pymupdf.open(stream=source_pdf_bytes, filetype="pdf") as source_doc:
@@ -509,59 +944,56 @@ class PdfRender:
                 if not (0 <= source_page_num < source_doc.page_count):
                     raise IndexError(f"원본 PDF에 페이지 번호 {source_page_num}가 없습니다. (총 {source_doc.page_count} 페이지)")
                 
-                # 현재 문서 열기
-                with pymupdf.open(stream=self.pdf_bytes, filetype="pdf") as current_doc:
-                    # 현재 페이지 번호 유효성 확인
-                    if not (0 <= page_num < current_doc.page_count):
-                        raise IndexError(f"현재 PDF에 페이지 번호 {page_num}가 없습니다. (총 {current_doc.page_count} 페이지)")
-                    
-                    # 원본 페이지를 A4로 변환하여 가져오기
-                    source_page = source_doc.load_page(source_page_num)
-                    bounds = source_page.bound()
-                    is_landscape = bounds.width > bounds.height
-                    
-                    TARGET_DPI = 200
-                    if is_landscape:
-                        a4_rect = pymupdf.paper_rect("a4-l")
-                    else:
-                        a4_rect = pymupdf.paper_rect("a4")
-                    
-                    target_pixel_width = a4_rect.width / 72 * TARGET_DPI
-                    target_pixel_height = a4_rect.height / 72 * TARGET_DPI
-                    
-                    zoom_x = target_pixel_width / bounds.width if bounds.width > 0 else 0
-                    zoom_y = target_pixel_height / bounds.height if bounds.height > 0 else 0
-                    zoom = min(zoom_x, zoom_y)
-                    
-                    matrix = pymupdf.Matrix(zoom, zoom)
-                    pix = source_page.get_pixmap(matrix=matrix, alpha=False, annots=True)
-                    
-                    # 기존 페이지 삭제
-                    current_doc.delete_pages([page_num])
-                    
-                    # 새 페이지 생성 및 이미지 삽입
-                    new_page = current_doc.new_page(page_num, width=a4_rect.width, height=a4_rect.height)
-                    
-                    margin = 0.98
-                    page_rect = new_page.rect
-                    margin_x = page_rect.width * (1 - margin) / 2
-                    margin_y = page_rect.height * (1 - margin) / 2
-                    target_rect = page_rect + (margin_x, margin_y, -margin_x, -margin_y)
-                    
-                    new_page.insert_image(target_rect, pixmap=pix)
-                    
-                    # 변경사항 저장
-                    self.pdf_bytes = current_doc.tobytes(garbage=4, deflate=True)
+                # 현재 페이지 번호 유효성 확인
+                if not (0 <= page_num < self.doc.page_count):
+                    raise IndexError(f"현재 PDF에 페이지 번호 {page_num}가 없습니다. (총 {self.doc.page_count} 페이지)")
+                
+                # 같은 위치에 원본 페이지를 A4로 변환하여 삽입한 뒤 밀려난 기존 페이지 삭제 (제자리 편집)
+                self._append_a4_page(self.doc, source_doc, source_page_num, insert_at=page_num)
+                self.doc.delete_page(page_num + 1)
             
-            # 내부 문서 객체 갱신
-            if self.doc:
-                self.doc.close()
-            
-            self.doc = pymupdf.open(stream=self.pdf_bytes, filetype="pdf")
-            self.page_count = self.doc.page_count
+            self._drop_preloaded_thumbnails([page_num])
+            self._mark_dirty()
             
             print(f"페이지 교체 완료: 페이지 {page_num + 1}을 원본 페이지 {source_page_num + 1}로 교체했습니다.")
-        
+
         except Exception as e:
             traceback.print_exc()
-            raise ValueError(f"페이지 교체 중 오류 발생: {e}")
\ No newline at end of file
+            raise ValueError(f"페이지 교체 중 오류 발생: {e}")
+
+    def extract_pages(self, page_nums: list[int]) -> bytes:
+        """지정한 페이지들만 담은 작은 PDF 바이트를 만든다. (되돌리기 기록용 페이지 델타)
+
+        페이지 순서는 page_nums 순서를 따르며, 해당 페이지가 참조하는 리소스만 복사된다.
+        """
+        if self.doc is None:
+            raise RuntimeError("PDF가 로드되지 않았습니다.")
+
+        with pymupdf.open() as part:
+            for page_num in page_nums:
+                part.insert_pdf(self.doc, from_page=page_num, to_page=page_num)
+            return part.tobytes(garbage=1, deflate=True)
+
+    def restore_pages(self, page_nums: list[int], pages_pdf_bytes: bytes) -> None:
+        """extract_pages로 떼어 둔 페이지들을 같은 위치에 되돌려 놓는다. (나머지 페이지는 건드리지 않음)
+
+        Args:
+            page_nums: 되돌릴 페이지 번호 (extract_pages에 넘긴 순서와 같아야 함)
+            pages_pdf_bytes: extract_pages가 만든 바이트
+        """
+        if self.doc is None:
+            raise RuntimeError("PDF가 로드되지 않았습니다.")
+
+        self._detach_from_file()
+        with pymupdf.open(stream=pages_pdf_bytes, filetype="pdf") as part:
+            if part.page_count != len(page_nums):
+                raise ValueError(f"페이지 델타 개수가 맞지 않습니다: {part.page_count} != {len(page_nums)}")
+            for index, page_num in enumerate(page_nums):
+                if not (0 <= page_num < self.doc.page_count):
+                    raise IndexError(f"잘못된 페이지 번호: {page_num}")
+                # 같은 위치에 기록된 페이지를 넣고 밀려난 현재 페이지를 삭제 (replace_page와 같은 방식)
+                self.doc.insert_pdf(part, from_page=index, to_page=index, start_at=page_num)
+                self.doc.delete_page(page_num + 1)
+
+        self._drop_preloaded_thumbnails(page_nums)
+        self._mark_dirty()
\ No newline at end of file
@@ -2,264 +2,900 @@
 import pymupdf
 from PIL import Image
 import io
-import gc
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
 import logging
 from pathlib import Path
 from datetime import datetime
 
+# 압축 방식
+# - images: 페이지는 그대로 두고 단계 DPI를 넘거나 큰 이미지만 줄여 다시 압축한다 (글자 벡터 유지).
+#           회전은 set_rotation으로, 스탬프는 원래 페이지 위에 이미지로 올린다.
+#           그래도 예산을 넘는 페이지만 페이지 전체를 JPEG으로 바꾼다 (대체 수단).
+# - raster: 무거운/회전/스탬프 페이지를 페이지 전체 JPEG으로 바꾼다 (기존 방식)
+COMPRESSION_MODE_IMAGES = "images"
+COMPRESSION_MODE_RASTER = "raster"
+COMPRESSION_MODES = (COMPRESSION_MODE_IMAGES, COMPRESSION_MODE_RASTER)
+DEFAULT_COMPRESSION_MODE = COMPRESSION_MODE_IMAGES
 
-def compress_pdf_file(
-        input_bytes: bytes,
-        output_path: str,
-        jpeg_quality: int = 65,
-        dpi: int = 120,
-        size_threshold_kb: int = 300,
-        user_rotations: dict = None,
-        stamp_data: dict[int, list[dict]] = None,
-        page_order: list[int] = None,
-):
+# 압축 단계 (jpeg_quality, dpi, size_threshold_kb). 앞쪽일수록 화질이 높다.
+COMPRESSION_STAGES = [
+    (83, 146, 300),
+    (75, 125, 0),
+    (68, 100, 0),
+]
+# 예측 크기가 목표의 이 비율 이하인 단계부터 조립해 본다 (예측 오차 여유)
+SIZE_ESTIMATE_MARGIN = 0.97
+# 래스터 페이지 하나의 PDF 구조(페이지/이미지 객체 사전 등) 추정 크기
+RASTER_PAGE_OVERHEAD_BYTES = 600
+
+# images 방식: 배치 크기 기준 해상도가 단계 DPI의 이 배수를 넘는 이미지는 단계 DPI로 줄인다
+IMAGE_DOWNSAMPLE_DPI_RATIO = 1.2
+# images 방식: 이 크기 이상인 이미지는 해상도가 낮아도 단계 품질의 JPEG으로 다시 압축해 본다
+IMAGE_RECOMPRESS_MIN_KB = 64
+# 다시 압축한 이미지가 원래 크기의 이 비율 이하일 때만 교체한다
+IMAGE_REPLACE_MAX_RATIO = 0.9
+
+# 페이지별 용량 배분: 단계별 가독성 손실 점수 (COMPRESSION_STAGES 순서, 그대로 복사는 0)
+STAGE_LEGIBILITY_LOSS = [0.0, 1.0, 2.5]
+# images 방식의 단계별 가독성 손실 (이미지만 줄어들므로 페이지 래스터보다 작다)
+IMAGE_STAGE_LEGIBILITY_LOSS = [0.0, 0.5, 1.0]
+# images 방식에서 페이지 래스터로 넘어갈 때 더하는 가독성 손실 (글자 벡터가 사라짐)
+RASTER_FALLBACK_LOSS = 2.0
+# 페이지 종류별 가독성 가중치. 문서(초본, 계약서 등 글자 페이지)는 선명하게 두고 사진을 먼저 줄인다.
+PAGE_KIND_DOCUMENT = "문서"
+PAGE_KIND_PHOTO = "사진"
+LEGIBILITY_WEIGHTS = {PAGE_KIND_DOCUMENT: 1.0, PAGE_KIND_PHOTO: 0.25}
+# 텍스트 레이어 글자 수가 이 이상이면 문서 페이지
+DOCUMENT_MIN_TEXT_CHARS = 50
+# 스캔 이미지에서 밝은(종이) 픽셀 비율이 이 이상이면 문서 페이지
+DOCUMENT_PAPER_RATIO = 0.6
+# 조립한 실제 크기가 목표를 넘을 때 예산을 줄여 다시 배분하는 횟수
+MAX_BUDGET_RETRIES = 3
+
+# 렌더링할 페이지가 이 수 이상일 때만 작업 프로세스를 띄운다 (spawn 시작 비용 때문)
+PARALLEL_MIN_PAGES = 4
+# 압축 작업 프로세스/인코딩 스레드 최대 수 (프로세스마다 원본 문서를 하나씩 연다)
+MAX_COMPRESS_WORKERS = 6
+
+# 작업 프로세스가 열어 둔 원본 문서 (_init_raster_process에서 한 번만 연다)
+_process_doc = None
+
+# 페이지별 압축 레벨 배분 기록 (INFO)
+logger = logging.getLogger(__name__)
+
+
+def _to_output_positions(data: dict, page_order: list[int]) -> dict:
+    """{실제 페이지 번호: 값}을 {저장 순서 위치: 값}으로 바꾼다. 순서에 없는 페이지는 무시한다."""
+    positions = {}
+    for new_idx, actual_page_num in enumerate(page_order):
+        positions.setdefault(actual_page_num, new_idx)
+    return {positions[page_num]: value for page_num, value in data.items() if page_num in positions}
+
+
+def _measure_page(src: "pymupdf.Document", page: "pymupdf.Page") -> tuple[list, int, int]:
+    """페이지의 (이미지 목록, 이미지 스트림 크기, content stream 크기)를 반환한다. (폰트는 제외)"""
+    image_list = []
+    image_size = 0
+    content_size = 0
+    try:
+        for xref in page.get_contents():
+            try:
+                content_size += len(src.xref_stream(xref))
+            except Exception:
+                pass
+
+        image_list = page.get_images()
+        for img in image_list:
+            try:
+                image_size += len(src.xref_stream(img[0]))
+            except Exception:
+                pass
+    except Exception:
+        pass
+    return image_list, image_size, content_size
+
+
+def _needs_raster(image_list: list, image_size: int, size_threshold_kb: int,
+                  user_rotation: int, has_stamps: bool) -> bool:
+    """재렌더링할 페이지인지 판단한다.
+
+    이미지가 없거나 이미지 크기가 임계값 미만이면 복사하지만,
+    회전이 적용되었거나 스탬프가 있는 페이지는 항상 재렌더링한다.
     """
-    이미지·스캔으로 추정되거나 강제 조정이 요청된 페이지만 재렌더링-압축하고,
-    나머지 페이지는 그대로 복사한다.
-    return: 새 PDF 용량(MB) ― 실패 시 None
+    if has_stamps or user_rotation != 0:
+        return True
+    return bool(image_list) and image_size / 1024 >= size_threshold_kb
+
+
+def _render_a4_image(page: "pymupdf.Page", user_rotation: int, dpi: int) -> tuple[Image.Image, "pymupdf.Rect", bool]:
+    """뷰어 표시 형태(A4 정규화) 그대로 페이지를 렌더링한다.
+
+    회전이 적용된 후 사용자가 실제로 보게 되는 크기를 기준으로 A4 방향을 정하고,
+    비율을 유지하며 잘림 없이 맞춘 뒤 페이지 중앙에 놓는다.
+
+    Returns:
+        (RGB 이미지, A4 페이지 안의 배치 영역(pt), 가로 방향 여부)
     """
-    if not input_bytes:
-        return None
+    # A4 세로 기준 크기 (595.2 x 841.8 포인트)
+    a4_rect = pymupdf.paper_rect("a4")
+    a4_width, a4_height = a4_rect.width, a4_rect.height
 
-    src = pymupdf.open(stream=input_bytes, filetype="pdf")
-    dst = pymupdf.open()
-    user_rotations = user_rotations or {}
-    stamp_data = stamp_data or {}
-
-    if page_order is None:
-        page_order = list(range(src.page_count))
-    
-    # --- 여기서 데이터 키 변환 ---
-    final_stamp_data = {}
-    for actual_page_num, stamp_list in stamp_data.items():
+    # 회전이 적용된 실제 표시 크기 (page.rect에는 문서 자체 회전이 이미 반영되어 있음)
+    display_rect = page.rect * pymupdf.Matrix(user_rotation)
+    display_width, display_height = display_rect.width, display_rect.height
+
+    # 최종적으로 표시되는 이미지의 가로/세로 비율로 목표 페이지 방향을 결정
+    is_visual_landscape = display_width > display_height
+    if is_visual_landscape:
+        target_width, target_height = a4_height, a4_width
+    else:
+        target_width, target_height = a4_width, a4_height
+
+    # 잘림 없이 전체가 들어가도록 더 작은 스케일 사용, 그 위에 DPI 품질 줌 적용
+    fit_scale = min(target_width / display_width, target_height / display_height)
+    quality_zoom = dpi / 72
+    final_scale = fit_scale * quality_zoom
+
+    final_matrix = pymupdf.Matrix(final_scale, final_scale)
+    if user_rotation != 0:
+        # 회전 후 스케일 적용 (뷰어와 동일한 순서)
+        final_matrix = pymupdf.Matrix(user_rotation) * final_matrix
+
+    pix = page.get_pixmap(matrix=final_matrix, alpha=False, annots=True)
+    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+    # 렌더링된 이미지를 페이지 중앙에 배치할 영역
+    img_width = pix.width / quality_zoom
+    img_height = pix.height / quality_zoom
+    x_offset = (target_width - img_width) / 2
+    y_offset = (target_height - img_height) / 2
+    insert_rect = pymupdf.Rect(x_offset, y_offset, x_offset + img_width, y_offset + img_height)
+    return img, insert_rect, is_visual_landscape
+
+
+def _encode_jpeg(img: Image.Image, jpeg_quality: int) -> bytes:
+    img_buf = io.BytesIO()
+    img.save(img_buf, format="JPEG", quality=jpeg_quality, optimize=True, progressive=True)
+    return img_buf.getvalue()
+
+
+def _classify_page(page: "pymupdf.Page", img: Image.Image | None) -> str:
+    """페이지가 글자 위주의 문서인지 사진인지 판단한다.
+
+    텍스트 레이어가 있으면 문서로 보고, 없으면(스캔) 이미지에서 밝은 종이 픽셀의 비율로 판단한다.
+    판단할 이미지가 없으면 보수적으로 문서로 본다.
+    """
+    try:
+        if len(page.get_text("text").strip()) >= DOCUMENT_MIN_TEXT_CHARS:
+            return PAGE_KIND_DOCUMENT
+    except Exception:
+        pass
+    if img is None:
+        return PAGE_KIND_DOCUMENT
+    histogram = img.convert("L").reduce(8).histogram()
+    total = sum(histogram)
+    paper_ratio = sum(histogram[200:]) / total if total else 0.0
+    return PAGE_KIND_DOCUMENT if paper_ratio >= DOCUMENT_PAPER_RATIO else PAGE_KIND_PHOTO
+
+
+def _stamp_png_bytes(stamp: dict) -> bytes:
+    """스탬프 QPixmap을 PNG 바이트로 변환한다. (io.BytesIO -> QBuffer)"""
+    stamp_pix: QPixmap = stamp['pixmap']
+    byte_array = QByteArray()
+    buffer = QBuffer(byte_array)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    stamp_pix.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+def _sorted_stamps(stamp_list: list[dict]) -> list[dict]:
+    """가리개(mask)를 먼저 그리고, 나머지(stamp/text)를 그 위에 그리도록 정렬한다."""
+    return sorted(stamp_list, key=lambda s: 0 if s.get('type') == 'mask' else 1)
+
+
+def _insert_raster_page(dst: "pymupdf.Document", jpeg_bytes: bytes, insert_rect: "pymupdf.Rect",
+                        is_visual_landscape: bool, stamps: list[tuple[dict, bytes]], page_label: int):
+    """렌더링된 JPEG으로 A4 페이지를 만들고 스탬프를 올린다.
+
+    Args:
+        stamps: 그릴 순서대로 (스탬프 데이터, PNG 바이트) 목록
+        page_label: 오류 메시지에 표시할 페이지 번호
+    """
+    a4_rect = pymupdf.paper_rect("a4")
+    if is_visual_landscape:
+        # A4 가로 방향으로 페이지 생성 (너비와 높이 교체)
+        new_p = dst.new_page(width=a4_rect.height, height=a4_rect.width)
+    else:
+        new_p = dst.new_page(width=a4_rect.width, height=a4_rect.height)
+    # 회전값은 0으로 설정 (뷰어에서 보이는 형태가 이미 올바른 방향)
+    new_p.set_rotation(0)
+    new_p.insert_image(insert_rect, stream=jpeg_bytes)
+
+    _insert_stamps(new_p, insert_rect, stamps, page_label)
+
+
+def _insert_stamps(page: "pymupdf.Page", base_rect: "pymupdf.Rect", stamps: list[tuple[dict, bytes]], page_label: int):
+    """스탬프를 base_rect(화면에 보이는 방향의 좌표) 기준 비율 위치에 올린다.
+
+    회전된 페이지에서는 위치를 회전 전 좌표로 바꾸고 이미지도 같은 각도로 돌려 화면에서 똑바로 보이게 한다.
+    """
+    for stamp, stamp_bytes in stamps:
         try:
-            new_position = page_order.index(actual_page_num)
-            final_stamp_data[new_position] = stamp_list
-        except ValueError:
-            pass # 순서에 없는 페이지는 무시
-            
-    final_rotations = {}
-    for actual_page_num, rotation in user_rotations.items():
+            stamp_w = base_rect.width * stamp['w_ratio']
+            stamp_h = base_rect.height * stamp['h_ratio']
+            stamp_x = base_rect.x0 + base_rect.width * stamp['x_ratio']
+            stamp_y = base_rect.y0 + base_rect.height * stamp['y_ratio']
+            stamp_rect = pymupdf.Rect(stamp_x, stamp_y, stamp_x + stamp_w, stamp_y + stamp_h)
+            page.insert_image(stamp_rect * page.derotation_matrix, stream=stamp_bytes,
+                              overlay=True, rotate=page.rotation)
+        except Exception as e_stamp:
+            print(f"[compress] page {page_label} stamp insertion error: {e_stamp}")
+
+
+def _encode_stamps(stamp_list: list[dict], page_label: int) -> list[tuple[dict, bytes]]:
+    """스탬프를 그릴 순서대로 PNG로 변환한다. 변환에 실패한 스탬프는 건너뛴다."""
+    stamps = []
+    for stamp in _sorted_stamps(stamp_list):
         try:
-            new_position = page_order.index(actual_page_num)
-            final_rotations[new_position] = rotation
-        except ValueError:
-            pass
+            stamps.append((stamp, _stamp_png_bytes(stamp)))
+        except Exception as e_stamp:
+            print(f"[compress] page {page_label} stamp insertion error: {e_stamp}")
+    return stamps
+
+
+def _compression_levels(compression_mode: str) -> list[tuple[str, int]]:
+    """압축 방식의 레벨 표 [(처리 방식, 단계 번호)]. 앞쪽일수록 화질이 높다.
+
+    images 방식은 이미지 축소 단계를 모두 거친 뒤에야 페이지 래스터 단계로 넘어간다.
+    """
+    raster_levels = [(COMPRESSION_MODE_RASTER, stage) for stage in range(len(COMPRESSION_STAGES))]
+    if compression_mode == COMPRESSION_MODE_RASTER:
+        return raster_levels
+    return [(COMPRESSION_MODE_IMAGES, stage) for stage in range(len(COMPRESSION_STAGES))] + raster_levels
+
+
+def _render_stage(page: "pymupdf.Page", user_rotation: int, stage: int) -> tuple[bytes, tuple, bool, str]:
+    """페이지를 단계의 DPI로 렌더링해 JPEG으로 인코딩한다.
+
+    작업 프로세스에서도 호출하므로 피클 가능한 값만 반환한다.
+
+    Returns:
+        (JPEG 바이트, 배치 영역 (x0, y0, x1, y1), 가로 방향 여부, 페이지 종류)
+    """
+    jpeg_quality, dpi, _ = COMPRESSION_STAGES[stage]
+    img, insert_rect, is_visual_landscape = _render_a4_image(page, user_rotation, dpi)
+    return _encode_jpeg(img, jpeg_quality), tuple(insert_rect), is_visual_landscape, _classify_page(page, img)
+
+
+def _decode_image(doc: "pymupdf.Document", xref: int, image_filter: str, target_size: tuple[int, int]) -> Image.Image:
+    """이미지 XObject를 RGB/L 이미지로 디코딩한다.
+
+    JPEG(RGB/회색조)은 PIL draft로 목표 크기에 가까운 축소 디코딩을 하고,
+    나머지(Flate, CMYK, 색인 색상 등)는 MuPDF로 디코딩해 RGB로 바꾼다.
+    """
+    if image_filter == "DCTDecode":
+        img = Image.open(io.BytesIO(doc.xref_stream_raw(xref)))
+        if img.mode in ("RGB", "L"):
+            img.draft(img.mode, target_size)
+            img.load()
+            return img
+    pix = pymupdf.Pixmap(doc, xref)
+    if pix.alpha:
+        pix = pymupdf.Pixmap(pix, 0)
+    if pix.colorspace is None or pix.colorspace.n not in (1, 3):
+        pix = pymupdf.Pixmap(pymupdf.csRGB, pix)
+    return Image.frombytes("L" if pix.n == 1 else "RGB", [pix.width, pix.height], pix.samples)
+
+
+def _image_placements(page: "pymupdf.Page") -> dict[tuple[int, int], "pymupdf.Rect"]:
+    """{(이미지 가로 픽셀, 세로 픽셀): 페이지에서 가장 크게 배치된 영역}. 폼 XObject 안의 이미지도 포함한다.
 
+    xref로 짝짓는 get_image_info(xrefs=True)는 이미지마다 디코딩해 해시를 내므로 픽셀 크기로 짝짓는다.
+    크기가 같은 이미지가 여럿이면 가장 큰 영역을 쓰므로 해상도를 낮게 보게 된다 (덜 줄이는 쪽).
+    """
+    placements = {}
+    for info in page.get_image_info():
+        size = (info.get("width", 0), info.get("height", 0))
+        rect = pymupdf.Rect(info["bbox"])
+        if size not in placements or rect.get_area() > placements[size].get_area():
+            placements[size] = rect
+    return placements
+
+
+def _recompress_images(page: "pymupdf.Page", user_rotation: int, stage: int,
+                       recompress: bool) -> tuple[bytes, list[tuple[int, int, int]], str]:
+    """페이지를 한 페이지짜리 PDF로 옮겨 큰 이미지만 줄이고 회전을 적용한다. (글자/도형은 벡터 그대로)
+
+    배치 크기 기준 해상도가 단계 DPI보다 충분히 높은 이미지는 단계 DPI로 줄이고,
+    해상도는 낮아도 큰 이미지는 단계 품질의 JPEG으로 다시 압축해 본다. 원래보다 작아질 때만 교체한다.
+    투명도(SMask)가 있거나 1비트(팩스/흑백 스캔) 이미지는 그대로 둔다.
+    작업 프로세스에서도 호출하므로 피클 가능한 값만 반환한다.
+
+    Args:
+        recompress: False면 이미지는 건드리지 않고 회전만 적용한다 (회전/스탬프 때문에 처리하는 가벼운 페이지)
+
+    Returns:
+        (한 페이지 PDF 바이트, 교체한 이미지 [(원본 xref, 원래 크기, 새 크기)], 페이지 종류)
+    """
+    jpeg_quality, dpi, _ = COMPRESSION_STAGES[stage]
+    src = page.parent
+    doc = pymupdf.open()
     try:
-        # for i, page in enumerate(src): # <--- 기존 루프를 아래 코드로 변경
-        for new_idx, actual_page_idx in enumerate(page_order):
-            page = src.load_page(actual_page_idx)
-            # 루프 내에서 'i' 대신 'actual_page_idx' 사용
-            user_rotation = final_rotations.get(new_idx, 0) # <--- 변환된 데이터 사용
-            # 스탬프가 있는 페이지인지 확인
-            has_stamps = new_idx in final_stamp_data # <--- 변환된 데이터 사용
-
-            image_list = []
-            image_size = 0
-            # --- 개선된 용량 추정 --------------------------
+        doc.insert_pdf(src, from_page=page.number, to_page=page.number)
+        new_page = doc[0]
+        replaced = []
+        largest_img = None
+        if recompress:
+            # 옮긴 페이지의 이미지 목록은 원본과 같은 순서이므로 원본 xref와 짝지을 수 있다
+            src_images = page.get_images(full=True)
+            new_images = new_page.get_images(full=True)
+            paired = len(src_images) == len(new_images)
+            placements = _image_placements(new_page)
+            done = set()
+            for pos, item in enumerate(new_images):
+                xref, smask, width, height, bpc, _, _, _, image_filter = item[:9]
+                if xref in done or smask or bpc == 1 or width <= 0 or height <= 0:
+                    continue
+                done.add(xref)
+                rect = placements.get((width, height), new_page.rect)
+                px_sizes = sorted((width, height))
+                pt_sizes = sorted((rect.width, rect.height))
+                if pt_sizes[0] <= 0:
+                    continue
+                image_dpi = min(px_sizes[0] / pt_sizes[0], px_sizes[1] / pt_sizes[1]) * 72
+                raw_size = len(doc.xref_stream_raw(xref))
+                downsample = image_dpi > dpi * IMAGE_DOWNSAMPLE_DPI_RATIO
+                if not downsample and raw_size < IMAGE_RECOMPRESS_MIN_KB * 1024:
+                    continue
+
+                scale = dpi / image_dpi if downsample else 1.0
+                target_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                img = _decode_image(doc, xref, image_filter, target_size)
+                if img.size != target_size:
+                    img = img.resize(target_size, Image.Resampling.LANCZOS)
+                jpeg_bytes = _encode_jpeg(img, jpeg_quality)
+                if largest_img is None or img.width * img.height > largest_img.width * largest_img.height:
+                    largest_img = img
+                if len(jpeg_bytes) > raw_size * IMAGE_REPLACE_MAX_RATIO:
+                    continue
+                new_page.replace_image(xref, stream=jpeg_bytes)
+                src_xref = src_images[pos][0] if paired and src_images[pos][2:4] == item[2:4] else 0
+                replaced.append((src_xref, raw_size, len(jpeg_bytes)))
+
+        if user_rotation:
+            new_page.set_rotation((new_page.rotation + user_rotation) % 360)
+        kind = _classify_page(new_page, largest_img)
+        return doc.tobytes(garbage=3, deflate=True), replaced, kind
+    finally:
+        doc.close()
+
+
+def _init_raster_process(input_bytes: bytes):
+    """작업 프로세스 초기화: 원본 문서를 한 번만 연다."""
+    global _process_doc
+    _process_doc = pymupdf.open(stream=input_bytes, filetype="pdf")
+
+
+def _render_stage_in_process(actual_page_idx: int, user_rotation: int, stage: int) -> tuple[bytes, tuple, bool, str]:
+    return _render_stage(_process_doc.load_page(actual_page_idx), user_rotation, stage)
+
+
+def _recompress_images_in_process(actual_page_idx: int, user_rotation: int, stage: int,
+                                  recompress: bool) -> tuple[bytes, list[tuple[int, int, int]], str]:
+    return _recompress_images(_process_doc.load_page(actual_page_idx), user_rotation, stage, recompress)
+
+
+def _derive_stage(source_jpeg: bytes, source_stage: int, stage: int) -> bytes:
+    """렌더링한 단계의 JPEG을 줄여 더 낮은 단계의 JPEG을 만든다. (재렌더링 없음)"""
+    jpeg_quality, dpi, _ = COMPRESSION_STAGES[stage]
+    source_dpi = COMPRESSION_STAGES[source_stage][1]
+    with Image.open(io.BytesIO(source_jpeg)) as source_img:
+        size = (max(1, round(source_img.width * dpi / source_dpi)),
+                max(1, round(source_img.height * dpi / source_dpi)))
+        img = source_img.resize(size, Image.Resampling.LANCZOS)
+    return _encode_jpeg(img, jpeg_quality)
+
+
+class _PageCandidate:
+    """저장할 페이지 하나의 레벨별 후보
+
+    레벨은 _compression_levels 표의 위치이고, 각 레벨은 (처리 방식, 단계)이다.
+    - 이미지 축소(images): 단계마다 페이지의 큰 이미지만 줄인 한 페이지 PDF를 만든다
+    - 페이지 래스터(raster): 처음 필요한 단계의 DPI로 한 번만 렌더링하고,
+      더 낮은 단계의 JPEG은 다시 렌더링하지 않고 메모리에 있는 JPEG을 줄여 만든다
+    이미지 축소에 실패한 페이지는 같은 단계의 페이지 래스터로 대신한다.
+    렌더링/인코딩은 _CompressPool이 맡는다.
+    """
+
+    def __init__(self, new_idx: int, actual_page_idx: int, image_list: list, image_size: int,
+                 content_size: int, user_rotation: int, stamp_list: list[dict], compression_mode: str):
+        self.new_idx = new_idx
+        self.actual_page_idx = actual_page_idx
+        self.image_list = image_list
+        self.image_size = image_size
+        self.content_size = content_size
+        self.user_rotation = user_rotation
+        self.stamp_list = stamp_list
+        self.compression_mode = compression_mode
+        self.levels = _compression_levels(compression_mode)
+        self.insert_rect = None
+        self.is_visual_landscape = False
+        self.stamps: list[tuple[dict, bytes]] = []
+        self._stamps_encoded = False
+        self.image_pages: dict[int, bytes] = {}  # {단계 번호: 이미지를 줄인 한 페이지 PDF}
+        self.image_saved: dict[int, float] = {}  # {단계 번호: 이미지 교체로 줄어든 바이트}
+        self.image_failed = False  # 이미지 축소 실패 → 페이지 래스터로 대신
+        self.encoded: dict[int, bytes] = {}  # {단계 번호: JPEG 바이트}
+        self.source_stage = None  # 렌더링한 단계 (낮은 단계 JPEG의 원본)
+        self.kind = PAGE_KIND_DOCUMENT  # 처리할 때 판단 (판단 전에는 보수적으로 문서)
+        self.copy_bytes = content_size + image_size  # 그대로 복사할 때의 크기 추정치 (_estimate_copy_bytes가 고침)
+        self.image_users: dict[int, int] = {}  # {이미지 xref: 쓰는 페이지 수} (_estimate_copy_bytes가 채움)
+        self.failed = False  # 렌더링 실패 → 래스터 단계에서 그대로 복사
+
+    def processed_stages(self) -> list[int]:
+        """이 페이지를 다시 만드는(이미지 축소 또는 재렌더링) 단계 번호 목록"""
+        return [stage for stage, (_, _, threshold_kb) in enumerate(COMPRESSION_STAGES)
+                if _needs_raster(self.image_list, self.image_size, threshold_kb,
+                                 self.user_rotation, bool(self.stamp_list))]
+
+    def resolve(self, level: int) -> tuple[str, int] | None:
+        """이 레벨에서 실제로 저장할 (처리 방식, 단계). 그대로 복사하면 None."""
+        mode, stage = self.levels[level]
+        if mode == COMPRESSION_MODE_IMAGES and stage in self.image_pages:
+            return mode, stage
+        if not self.failed and stage in self.encoded:
+            return COMPRESSION_MODE_RASTER, stage
+        return None
+
+    def needs_images(self, stage: int) -> bool:
+        """이 단계의 이미지 축소 페이지를 만들어야 하는지"""
+        return not self.image_failed and stage not in self.image_pages and stage in self.processed_stages()
+
+    def needs_render(self, stage: int) -> bool:
+        """이 단계를 위해 페이지를 처음 렌더링해야 하는지"""
+        return not self.failed and self.source_stage is None and stage in self.processed_stages()
+
+    def needs_derive(self, stage: int) -> bool:
+        """이미 렌더링한 JPEG을 줄여 이 단계의 JPEG을 만들어야 하는지"""
+        return (not self.failed and self.source_stage is not None and stage not in self.encoded
+                and stage in self.processed_stages())
+
+    def apply_images(self, stage: int, result: tuple[bytes, list[tuple[int, int, int]], str]):
+        """_recompress_images 결과를 받는다. 공유 이미지는 _estimate_copy_bytes와 같이 쓰는 페이지 수로 나눠 센다."""
+        page_pdf, replaced, self.kind = result
+        self.image_pages[stage] = page_pdf
+        self.image_saved[stage] = sum((raw_size - new_size) / self.image_users.get(xref, 1)
+                                      for xref, raw_size, new_size in replaced)
+        self._encode_stamps()
+
+    def fail_images(self, error: Exception):
+        print(f"[compress] page {self.actual_page_idx + 1} image downsampling failed, page raster fallback: {error}")
+        self.image_failed = True
+        self.image_pages.clear()
+        self.image_saved.clear()
+
+    def apply_render(self, stage: int, result: tuple[bytes, tuple, bool, str]):
+        """_render_stage 결과를 받는다."""
+        jpeg_bytes, rect, self.is_visual_landscape, self.kind = result
+        self.insert_rect = pymupdf.Rect(rect)
+        self.encoded[stage] = jpeg_bytes
+        self.source_stage = stage
+        self._encode_stamps()
+
+    def fail(self, error: Exception):
+        # 실패하면 그대로 복사(품질 보존 우선)
+        print(f"[compress] page {self.actual_page_idx + 1} fallback copy: {error}")
+        self.failed = True
+        self.encoded.clear()
+
+    def _encode_stamps(self):
+        """스탬프 PNG 변환(QPixmap)은 한 번만, 호출한 스레드에서 한다."""
+        if not self._stamps_encoded:
+            self.stamps = _encode_stamps(self.stamp_list, self.actual_page_idx + 1)
+            self._stamps_encoded = True
+
+    def estimated_bytes(self, level: int) -> int:
+        """이 레벨에서 저장될 페이지 크기 추정치. 복사되는 페이지는 content + 이미지 스트림 크기."""
+        resolved = self.resolve(level)
+        if resolved is None:
+            return self.copy_bytes
+        mode, stage = resolved
+        stamp_bytes = sum(len(png) for _, png in self.stamps)
+        if mode == COMPRESSION_MODE_IMAGES:
+            return max(0, int(self.copy_bytes - self.image_saved[stage])) + stamp_bytes
+        return len(self.encoded[stage]) + stamp_bytes + RASTER_PAGE_OVERHEAD_BYTES
+
+    def legibility_loss(self, level: int) -> float:
+        """이 레벨로 저장할 때의 가독성 손실 (페이지 종류 가중치 반영)"""
+        resolved = self.resolve(level)
+        if resolved is None:
+            return 0.0
+        mode, stage = resolved
+        if mode == COMPRESSION_MODE_IMAGES:
+            loss = IMAGE_STAGE_LEGIBILITY_LOSS[stage]
+        else:
+            loss = STAGE_LEGIBILITY_LOSS[stage]
+            if self.compression_mode == COMPRESSION_MODE_IMAGES:
+                loss += RASTER_FALLBACK_LOSS
+        return loss * LEGIBILITY_WEIGHTS.get(self.kind, 1.0)
+
+    def describe(self, level: int) -> str:
+        resolved = self.resolve(level)
+        if resolved is None:
+            return "그대로"
+        mode, stage = resolved
+        return f"{'이미지 축소' if mode == COMPRESSION_MODE_IMAGES else '페이지 래스터'} {stage + 1}단계"
+
+
+class _CompressPool:
+    """압축할 페이지의 이미지 축소, 렌더링, 인코딩을 병렬로 처리한다.
+
+    - 이미지 축소와 렌더링(MuPDF, GIL을 놓지 않음)은 원본 문서를 한 번씩 열어 둔 작업 프로세스 풀에서
+    - 낮은 단계 JPEG 만들기(PIL 디코딩/리사이즈/인코딩, GIL을 놓음)는 스레드 풀에서
+    결과는 페이지 후보에 담기고, 조립은 언제나 page_order 순서로 한다.
+    페이지가 적거나 코어가 하나면 순차 처리하고, 작업 프로세스가 죽으면 순차 처리로 바꾼다.
+    """
+
+    def __init__(self, src: "pymupdf.Document", input_bytes: bytes, compression_mode: str):
+        self._src = src
+        self._input_bytes = input_bytes
+        self._levels = _compression_levels(compression_mode)
+        self._workers = max(1, min(os.cpu_count() or 1, MAX_COMPRESS_WORKERS))
+        self._processes: ProcessPoolExecutor | None = None
+        self._threads: ThreadPoolExecutor | None = None
+        self._process_broken = False
+
+    def prepare(self, candidates: list["_PageCandidate"], level: int):
+        """후보들의 이 레벨 결과를 준비한다. 이미지 축소에 실패한 페이지는 같은 단계로 렌더링한다."""
+        mode, stage = self._levels[level]
+        if mode == COMPRESSION_MODE_IMAGES:
+            self._run_pages(
+                [c for c in candidates if c.needs_images(stage)],
+                _recompress_images_in_process, _recompress_images,
+                lambda c: (c.user_rotation, stage,
+                           _needs_raster(c.image_list, c.image_size, COMPRESSION_STAGES[stage][2], 0, False)),
+                lambda c, result: c.apply_images(stage, result), _PageCandidate.fail_images,
+                lambda c: c.needs_images(stage)
+            )
+            candidates = [c for c in candidates if c.image_failed]
+        self._run_pages(
+            [c for c in candidates if c.needs_render(stage)],
+            _render_stage_in_process, _render_stage,
+            lambda c: (c.user_rotation, stage),
+            lambda c, result: c.apply_render(stage, result), _PageCandidate.fail,
+            lambda c: c.needs_render(stage)
+        )
+        self._derive([c for c in candidates if c.needs_derive(stage)], stage)
+
+    def close(self):
+        if self._processes is not None:
+            self._processes.shutdown(wait=True, cancel_futures=True)
+            self._processes = None
+        if self._threads is not None:
+            self._threads.shutdown(wait=True)
+            self._threads = None
+
+    def _run_pages(self, todo: list["_PageCandidate"], process_job, local_job, job_args, apply, fail, still_needed):
+        """페이지 작업(local_job(page, *job_args(c)))을 실행해 apply(c, 결과)로 넘긴다. 실패하면 fail(c, 오류)."""
+        if len(todo) >= PARALLEL_MIN_PAGES and self._workers > 1 and not self._process_broken:
             try:
-                # 1. content stream 크기
-                content_size = 0
-                for xref in page.get_contents():
-                    try:
-                        content_size += len(src.xref_stream(xref))
-                    except:
-                        pass
-                
-                # 2. 페이지의 이미지 크기 추정
-                image_list = page.get_images()
-                for img_index, img in enumerate(image_list):
+                if self._processes is None:
+                    # Windows와 동작을 맞추기 위해 spawn 방식 사용 (main.py의 freeze_support 참고)
+                    self._processes = ProcessPoolExecutor(
+                        max_workers=min(self._workers, len(todo)),
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_raster_process, initargs=(self._input_bytes,)
+                    )
+                    print(f"🧵 압축 작업 프로세스 {min(self._workers, len(todo))}개로 페이지 처리")
+                futures = [(c, self._processes.submit(process_job, c.actual_page_idx, *job_args(c))) for c in todo]
+                for candidate, future in futures:
                     try:
-                        xref = img[0]
-                        img_data = src.xref_stream(xref)
-                        image_size += len(img_data)
-                    except:
-                        pass
-                
-                # 3. 총 크기 계산 (content + 이미지만 측정, 폰트는 제외)
-                total_size = content_size + image_size
-                
-            except Exception:
-                total_size = 0
-
-            # 조건: (이미지가 없거나 이미지 크기가 임계값 미만) -> 복사
-            # 회전이 적용된 페이지는 이 조건을 건너뛰고 재렌더링되도록 user_rotation == 0 조건을 제거
-            # 스탬프가 있는 페이지는 항상 재렌더링
-            if (not image_list or image_size / 1024 < size_threshold_kb) and not has_stamps:
-                # 하지만, 회전이 없는 페이지만 복사하도록 내부에서 한 번 더 체크
-                if user_rotation == 0:
-                    dst.insert_pdf(src, from_page=actual_page_idx, to_page=actual_page_idx)
-                    continue
+                        apply(candidate, future.result())
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        fail(candidate, e)
+                return
+            except BrokenProcessPool as e:
+                print(f"⚠️ 압축 작업 프로세스가 중단되어 순차 처리로 전환합니다: {e}")
+                self._process_broken = True
+                self._processes.shutdown(wait=False, cancel_futures=True)
+                self._processes = None
+                todo = [c for c in todo if still_needed(c)]
 
-            # ── 여기부터 '무거운' 페이지 또는 '강제 조정' 또는 '회전된' 페이지만 이미지-재렌더링 ──
+        for candidate in todo:
             try:
-                # === 뷰어 표시 형태 그대로 저장하는 로직 ===
-                # 뷰어에서 보이는 A4 세로 기준 통일된 형태로 정규화하여 저장한다.
-
-                # 1. A4 세로 기준 크기 정의 (포인트 단위)
-                a4_rect = pymupdf.paper_rect("a4")  # 595.2 x 841.8 포인트
-                a4_width, a4_height = a4_rect.width, a4_rect.height
-                
-                # 2. 페이지의 실제 시각적 표시 크기 계산
-                # 회전이 적용된 후 사용자가 실제로 보게 되는 크기를 기준으로 해야 함
-                total_rotation = (page.rotation + user_rotation) % 360
-                
-                # 페이지를 실제로 렌더링해서 시각적 크기를 얻어야 함
-                # get_pixmap()을 통해 회전이 적용된 실제 표시 크기를 확인
-                temp_matrix = pymupdf.Matrix(1.0, 1.0)  # 1:1 스케일로 임시 렌더링
-                if user_rotation != 0:
-                    rotation_matrix = pymupdf.Matrix(user_rotation)
-                    temp_matrix = rotation_matrix * temp_matrix
-                
-                temp_pix = page.get_pixmap(matrix=temp_matrix, alpha=False, annots=False)
-                
-                # 실제 시각적 표시 크기 (픽셀 단위를 포인트로 변환)
-                display_width = temp_pix.width * 72 / 72  # 72 DPI 기준
-                display_height = temp_pix.height * 72 / 72
-                
-                # 3. A4 크기에 맞추되 비율을 유지하며 여백 최소화 스케일 계산
-                # 최종적으로 표시되는 이미지의 가로/세로 비율을 기준으로 목표 페이지 방향을 결정
-                is_visual_landscape = display_width > display_height
-                
-                if is_visual_landscape:
-                    # A4 가로 방향 사용
-                    target_width, target_height = a4_height, a4_width
-                else:
-                    # A4 세로 방향 사용
-                    target_width, target_height = a4_width, a4_height
-
-                scale_x = target_width / display_width
-                scale_y = target_height / display_height
-
-                # 잘림 없이 전체가 들어가도록 더 작은 스케일 사용
-                fit_scale = min(scale_x, scale_y)
-                
-                # 4. 최종 변환 매트릭스 생성
-                # 먼저 DPI 품질 향상을 위한 줌 적용
-                quality_zoom = dpi / 72
-                # 그 다음 A4 정규화를 위한 스케일 적용
-                final_scale = fit_scale * quality_zoom
-                
-                # 5. 최종 렌더링 (실제 시각적 크기를 기준으로 계산된 스케일 적용)
-                # 최종 스케일 매트릭스 생성
-                final_matrix = pymupdf.Matrix(final_scale, final_scale)
-                
-                # 사용자 회전이 있다면 추가 회전 매트릭스 생성
-                if user_rotation != 0:
-                    rotation_matrix = pymupdf.Matrix(user_rotation)
-                    # 회전 후 스케일 적용 (뷰어와 동일한 순서)
-                    final_matrix = rotation_matrix * final_matrix
-                
-                pix = page.get_pixmap(matrix=final_matrix, alpha=False, annots=True)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-                # 6. JPEG 이미지 버퍼 생성
-                img_buf = io.BytesIO()
-                img.save(img_buf, format="JPEG", quality=jpeg_quality, optimize=True, progressive=True)
-                img_buf.seek(0)
-
-                # 7. 최종 표시 방향에 따라 A4 페이지 방향 결정
-                if is_visual_landscape:
-                    # A4 가로 방향으로 페이지 생성 (너비와 높이 교체)
-                    new_p = dst.new_page(width=a4_height, height=a4_width)
-                else:
-                    # A4 세로 방향으로 페이지 생성
-                    new_p = dst.new_page(width=a4_width, height=a4_height)
-                # 회전값은 0으로 설정 (뷰어에서 보이는 형태가 이미 올바른 방향)
-                new_p.set_rotation(0)
-                
-                # 8. 렌더링된 이미지를 페이지 중앙에 배치
-                # 이미지 크기 계산
-                img_width = pix.width / quality_zoom
-                img_height = pix.height / quality_zoom
-
-                # 중앙 배치를 위한 오프셋 계산 (가로/세로 방향에 따라 다름)
-                if is_visual_landscape:
-                    # A4 가로 방향일 때
-                    x_offset = (a4_height - img_width) / 2
-                    y_offset = (a4_width - img_height) / 2
+                page = self._src.load_page(candidate.actual_page_idx)
+                apply(candidate, local_job(page, *job_args(candidate)))
+            except Exception as e:
+                fail(candidate, e)
+
+    def _derive(self, todo: list["_PageCandidate"], stage: int):
+        if not todo:
+            return
+        if self._workers > 1 and len(todo) > 1:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self._workers)
+            futures = [(c, self._threads.submit(_derive_stage, c.encoded[c.source_stage], c.source_stage, stage))
+                       for c in todo]
+        else:
+            futures = [(c, None) for c in todo]
+
+        for candidate, future in futures:
+            try:
+                if future is not None:
+                    candidate.encoded[stage] = future.result()
                 else:
-                    # A4 세로 방향일 때
-                    x_offset = (a4_width - img_width) / 2
-                    y_offset = (a4_height - img_height) / 2
-
-                # 이미지 삽입 영역 정의
-                insert_rect = pymupdf.Rect(x_offset, y_offset, x_offset + img_width, y_offset + img_height)
-                new_p.insert_image(insert_rect, stream=img_buf.read())
-
-                # 9. 스탬프 데이터가 있으면 페이지에 삽입
-                if has_stamps:
-                    # 가리개(mask)를 먼저 그리고, 나머지(stamp/text)를 그 위에 그리기 위해 정렬
-                    # type이 'mask'이면 우선순위 0, 그 외에는 1
-                    sorted_stamps = sorted(
-                        final_stamp_data[new_idx],
-                        key=lambda s: 0 if s.get('type') == 'mask' else 1
-                    )
-                    
-                    for stamp in sorted_stamps: # <--- 변환된 데이터 사용
-                        try:
-                            stamp_pix: QPixmap = stamp['pixmap']
-                            
-                            # QPixmap을 PNG 바이트로 변환 (io.BytesIO -> QBuffer)
-                            byte_array = QByteArray()
-                            buffer = QBuffer(byte_array)
-                            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
-                            stamp_pix.save(buffer, "PNG")
-                            stamp_bytes = bytes(buffer.data())
-                            
-                            base_rect = insert_rect
-                            
-                            stamp_w = base_rect.width * stamp['w_ratio']
-                            stamp_h = base_rect.height * stamp['h_ratio']
-                            stamp_x = base_rect.x0 + base_rect.width * stamp['x_ratio']
-                            stamp_y = base_rect.y0 + base_rect.height * stamp['y_ratio']
-                            
-                            stamp_rect = pymupdf.Rect(stamp_x, stamp_y, stamp_x + stamp_w, stamp_y + stamp_h)
-                            
-                            new_p.insert_image(stamp_rect, stream=stamp_bytes, overlay=True)
-
-                        except Exception as e_stamp:
-                            print(f"[compress] page {actual_page_idx+1} stamp insertion error: {e_stamp}")
-                
+                    candidate.encoded[stage] = _derive_stage(candidate.encoded[candidate.source_stage],
+                                                             candidate.source_stage, stage)
             except Exception as e:
-                # 실패하면 그대로 복사(품질 보존 우선)
-                print(f"[compress] page {actual_page_idx+1} fallback copy: {e}")
-                dst.insert_pdf(src, from_page=actual_page_idx, to_page=actual_page_idx)
+                candidate.fail(e)
 
-            finally:
-                gc.collect()
 
-        dst.save(
-            output_path,
-            garbage=4, deflate=True,
-            clean=True, pretty=False
-        )
-        final_mb = os.path.getsize(output_path) / (1024 * 1024)
-        return final_mb
+def _insert_recompressed_page(dst: "pymupdf.Document", page_pdf: bytes,
+                              stamps: list[tuple[dict, bytes]], page_label: int):
+    """이미지를 줄인 한 페이지 PDF를 붙이고 그 위에 스탬프를 올린다. (회전은 페이지에 이미 적용됨)"""
+    with pymupdf.open(stream=page_pdf, filetype="pdf") as page_doc:
+        dst.insert_pdf(page_doc)
+    new_p = dst[-1]
+    _insert_stamps(new_p, new_p.rect, stamps, page_label)
+
+
+def _build_pdf_bytes(src: "pymupdf.Document", candidates: list[_PageCandidate], levels: list[int]) -> bytes:
+    """캐시된 결과로 페이지별 레벨(levels)의 PDF를 메모리에서 조립한다. (재렌더링 없음)"""
+    dst = pymupdf.open()
+    try:
+        for candidate, level in zip(candidates, levels):
+            resolved = candidate.resolve(level)
+            page_label = candidate.actual_page_idx + 1
+            if resolved is None:
+                dst.insert_pdf(src, from_page=candidate.actual_page_idx, to_page=candidate.actual_page_idx)
+            elif resolved[0] == COMPRESSION_MODE_IMAGES:
+                _insert_recompressed_page(dst, candidate.image_pages[resolved[1]], candidate.stamps, page_label)
+            else:
+                _insert_raster_page(dst, candidate.encoded[resolved[1]], candidate.insert_rect,
+                                    candidate.is_visual_landscape, candidate.stamps, page_label)
+        return dst.tobytes(garbage=4, deflate=True, clean=True, pretty=False)
     finally:
-        src.close()
         dst.close()
 
+
+def _estimate_copy_bytes(src: "pymupdf.Document", candidates: list[_PageCandidate]):
+    """그대로 복사되는 페이지의 크기 추정치를 저장된(압축된) 스트림 크기로 정한다.
+
+    여러 페이지가 함께 쓰는 이미지(로고, 직인 등)는 최종 파일에 한 번만 들어가므로 쓰는 페이지 수로 나눠 센다.
+    (재렌더링 여부를 가르는 size_threshold_kb 판단은 기존대로 페이지별 이미지 크기를 쓴다)
+    """
+    def raw_size(xref: int) -> int:
+        try:
+            return len(src.xref_stream_raw(xref))
+        except Exception:
+            return 0
+
+    page_xrefs = [{img[0] for img in c.image_list} for c in candidates]
+    users: dict[int, int] = {}
+    for xrefs in page_xrefs:
+        for xref in xrefs:
+            users[xref] = users.get(xref, 0) + 1
+    image_sizes = {xref: raw_size(xref) for xref in users}
+
+    for candidate, xrefs in zip(candidates, page_xrefs):
+        try:
+            content_bytes = sum(raw_size(xref) for xref in src.load_page(candidate.actual_page_idx).get_contents())
+        except Exception:
+            content_bytes = candidate.content_size
+        shared_image_bytes = sum(image_sizes[xref] / users[xref] for xref in xrefs)
+        candidate.copy_bytes = content_bytes + int(shared_image_bytes)
+        candidate.image_users = users
+
+
+def _copied_base_bytes(src: "pymupdf.Document", candidates: list[_PageCandidate]) -> int:
+    """어느 단계에서도 그대로 복사되는 페이지만 모은 문서 크기 (폰트 등 공유 자원 포함)"""
+    copied = [c.actual_page_idx for c in candidates if not c.processed_stages()]
+    if not copied:
+        return 0
+    base = pymupdf.open()
+    try:
+        for page_idx in copied:
+            base.insert_pdf(src, from_page=page_idx, to_page=page_idx)
+        return len(base.tobytes(garbage=4, deflate=True, clean=True, pretty=False))
+    finally:
+        base.close()
+
+
+def _allocate_levels(pool: _CompressPool, candidates: list[_PageCandidate], levels: list[int],
+                     base_bytes: int, budget_bytes: float, compression_mode: str) -> bool:
+    """예산(budget_bytes) 안에 들도록 페이지별 레벨을 낮춘다. levels를 직접 고친다.
+
+    줄인 용량 1바이트당 가독성 손실이 가장 작은 페이지부터 레벨을 낮추므로
+    큰 사진 페이지가 먼저 줄고, 문서 페이지는 예산이 모자랄 때만 낮아진다.
+    images 방식에서는 이미지 축소 단계로 모자랄 때만 페이지 래스터 결과를 만들어 후보에 넣는다.
+    배분 요약과 페이지별 결정은 예산 초과 여부와 관계없이 logger에 INFO로 남긴다.
+
+    Returns:
+        예측 크기가 예산 이하가 되었으면 True
+    """
+    def total_bytes() -> int:
+        return base_bytes + sum(c.estimated_bytes(level) for c, level in zip(candidates, levels)
+                                if c.processed_stages())
+
+    total = total_bytes()
+    initial_total = total
+    start_levels = list(levels)
+    if total > budget_bytes:
+        print(f"🎯 예측 크기 {total / (1024 * 1024):.2f} MB가 예산 {budget_bytes / (1024 * 1024):.2f} MB를 넘어 "
+              f"페이지별 단계를 조정합니다.")
+
+    # 처리 방식별로 묶은 레벨 [[이미지 축소 2, 3단계], [페이지 래스터 1~3단계]] (1단계는 이미 준비됨)
+    table = _compression_levels(compression_mode)
+    tiers: list[list[int]] = []
+    for level in range(1, len(table)):
+        if tiers and table[tiers[-1][-1]][0] == table[level][0]:
+            tiers[-1].append(level)
+        else:
+            tiers.append([level])
+
+    for tier in tiers:
+        if total <= budget_bytes:
+            break
+        # 같은 방식의 낮은 레벨 크기가 모두 필요하므로 한꺼번에 병렬로 준비한다
+        for level in tier:
+            pool.prepare(candidates, level)
+        total = total_bytes()
+
+        while total > budget_bytes:
+            best = None  # (바이트당 손실, 페이지 위치, 새 레벨, 줄어드는 바이트)
+            for idx, candidate in enumerate(candidates):
+                if not candidate.processed_stages():
+                    continue
+                level = levels[idx]
+                for lower in range(level + 1, tier[-1] + 1):
+                    saved = candidate.estimated_bytes(level) - candidate.estimated_bytes(lower)
+                    if saved <= 0:
+                        continue
+                    cost = (candidate.legibility_loss(lower) - candidate.legibility_loss(level)) / saved
+                    if best is None or cost < best[0]:
+                        best = (cost, idx, lower, saved)
+            if best is None:
+                break  # 이 방식으로는 더 낮출 페이지가 없음
+            _, idx, lower, saved = best
+            levels[idx] = lower
+            total -= saved
+
+    # 예산 안이라 그대로 둔 경우도 포함해 페이지별 결정을 기록 (가중치가 낮은 사진 페이지가 먼저 낮아진다)
+    fits = total <= budget_bytes
+    processed = [(idx, c) for idx, c in enumerate(candidates) if c.processed_stages()]
+    logger.info("압축 레벨 배분(%s): 예측 %.2f MB → %.2f MB, 예산 %.2f MB %s, 처리 페이지 %d개 / 복사 페이지 %d개",
+                compression_mode, initial_total / (1024 * 1024), total / (1024 * 1024), budget_bytes / (1024 * 1024),
+                "이내" if fits else "초과", len(processed), len(candidates) - len(processed))
+    for idx, candidate in processed:
+        weight = LEGIBILITY_WEIGHTS.get(candidate.kind, 1.0)
+        if levels[idx] == start_levels[idx]:
+            logger.info("   페이지 %d(%s, 가중치 %g): %s 유지 (%.0f KB)", candidate.actual_page_idx + 1,
+                        candidate.kind, weight, candidate.describe(levels[idx]),
+                        candidate.estimated_bytes(levels[idx]) / 1024)
+            continue
+        saved = candidate.estimated_bytes(start_levels[idx]) - candidate.estimated_bytes(levels[idx])
+        logger.info("   페이지 %d(%s, 가중치 %g): %s → %s, %.0f KB 절약", candidate.actual_page_idx + 1,
+                    candidate.kind, weight, candidate.describe(start_levels[idx]),
+                    candidate.describe(levels[idx]), saved / 1024)
+    return fits
+
+
+def _compress_single_pass(
+    input_bytes: bytes,
+    target_size_mb: float,
+    rotations: dict[int, int],
+    stamp_data: dict[int, list[dict]],
+    page_order: list[int] | None,
+    compression_mode: str = DEFAULT_COMPRESSION_MODE
+) -> tuple[bytes | None, list[int] | None]:
+    """목표 크기를 용량 예산으로 보고 페이지마다 압축 레벨을 골라 한 번에 조립한다.
+
+    모든 페이지를 첫 레벨(최고 화질)로 시작해, 예측 크기가 예산을 넘으면
+    페이지별 레벨별 크기로 가독성 손실 대비 절약이 큰 페이지부터 레벨을 낮춘다.
+    조립과 크기 확인은 메모리에서 하고, 파일 쓰기는 호출하는 쪽에서 한 번만 한다.
+
+    Returns:
+        (목표 이하인 PDF 바이트, 페이지별 레벨 번호). 목표에 맞출 수 없으면 (None, None)
+    """
+    target_bytes = target_size_mb * 1024 * 1024
+    src = pymupdf.open(stream=input_bytes, filetype="pdf")
+    pool = _CompressPool(src, input_bytes, compression_mode)
+    try:
+        if page_order is None:
+            page_order = list(range(src.page_count))
+        final_stamp_data = _to_output_positions(stamp_data, page_order)
+        final_rotations = _to_output_positions(rotations, page_order)
+
+        candidates = []
+        for new_idx, actual_page_idx in enumerate(page_order):
+            page = src.load_page(actual_page_idx)
+            image_list, image_size, content_size = _measure_page(src, page)
+            candidates.append(_PageCandidate(
+                new_idx, actual_page_idx, image_list, image_size, content_size,
+                final_rotations.get(new_idx, 0), final_stamp_data.get(new_idx, []), compression_mode
+            ))
+        _estimate_copy_bytes(src, candidates)
+        base_bytes = _copied_base_bytes(src, candidates)
+
+        # 첫 레벨 결과만 먼저 만든다. 낮은 레벨은 예산을 넘을 때만 만든다.
+        pool.prepare(candidates, 0)
+
+        level_count = len(_compression_levels(compression_mode))
+        levels = [0] * len(candidates)
+        budget_bytes = target_bytes * SIZE_ESTIMATE_MARGIN
+        for _ in range(MAX_BUDGET_RETRIES + 1):
+            fits = _allocate_levels(pool, candidates, levels, base_bytes, budget_bytes, compression_mode)
+            if not fits:
+                print("⚠️ 모든 페이지를 최저 단계로 낮춰도 예산을 넘습니다.")
+            pdf_bytes = _build_pdf_bytes(src, candidates, levels)
+            level_counts = [levels.count(level) for level in range(level_count)]
+            print(f"압축 후 크기: {len(pdf_bytes) / (1024 * 1024)} MB (레벨별 페이지 수 {level_counts})")
+            if len(pdf_bytes) <= target_bytes:
+                return pdf_bytes, levels
+            if not fits:
+                break
+            # 예측이 빗나간 만큼 예산을 줄여 다시 배분
+            budget_bytes -= len(pdf_bytes) - budget_bytes
+        return None, None
+    finally:
+        pool.close()
+        src.close()
+
+
+def _optimize_lossless(input_bytes: bytes, page_order: list[int] | None = None) -> bytes:
+    """화질 손실 없이 PDF를 다시 저장한다. (페이지를 이미지로 바꾸지 않으므로 글자 벡터가 유지됨)
+
+    - page_order가 있으면 페이지 순서를 반영한다 (순서에 없는 페이지는 뺀다)
+    - 폰트 서브셋: 실제로 쓰인 글리프만 남긴다
+    - 문서 정보/XMP 메타데이터 제거
+    - garbage=4: 쓰지 않는 객체 제거, 같은 이미지/폰트/스트림 병합
+    - 압축되지 않은 스트림(내용, 이미지, 폰트)을 deflate로 다시 압축, 가능하면 객체 스트림으로 묶음
+    """
+    doc = pymupdf.open(stream=input_bytes, filetype="pdf")
+    try:
+        if page_order is not None and page_order != list(range(doc.page_count)):
+            doc.select(page_order)
+        try:
+            doc.subset_fonts()
+        except Exception as e:
+            print(f"⚠️ 폰트 서브셋 건너뜀: {e}")
+        doc.set_metadata({})
+        doc.del_xml_metadata()
+
+        options = dict(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True, clean=True, pretty=False)
+        try:
+            return doc.tobytes(use_objstms=1, **options)
+        except TypeError:
+            return doc.tobytes(**options)  # 객체 스트림을 지원하지 않는 PyMuPDF
+    finally:
+        doc.close()
+
+
 def compress_pdf_with_multiple_stages(
     input_bytes: bytes,
     output_path: str,
     target_size_mb: float,
     rotations: dict[int, int] | None = None,
     stamp_data: dict[int, list[dict]] | None = None,
-    page_order: list[int] | None = None
+    page_order: list[int] | None = None,
+    compression_mode: str = DEFAULT_COMPRESSION_MODE
 ) -> bool:
     """
-    여러 단계를 거쳐 PDF를 압축하고 저장한다.
-    
+    목표 크기에 맞는 압축 단계를 골라 PDF를 저장한다.
+
+    먼저 화질 손실 없는 최적화만 해 보고, 그래도 목표를 넘거나 회전/스탬프를 반영해야 할 때만 압축한다.
+    images 방식(기본)은 페이지 안의 큰 이미지만 줄이고 글자는 벡터로 남기며,
+    이미지 축소로 목표에 못 미치는 페이지만 페이지 전체를 이미지로 다시 압축한다.
+    단계마다 전체 파일을 다시 만들어 크기를 재지 않고, 페이지마다 한 번만 만든 단계별 결과 크기로
+    최종 크기를 예측해 페이지별 단계를 고른다. 조립은 메모리에서 하고 출력 경로에는 한 번만 쓴다.
+
     Args:
         input_bytes (bytes): 입력 PDF 바이트 데이터
         output_path (str): 출력 PDF 파일 경로
@@ -267,17 +903,19 @@ def compress_pdf_with_multiple_stages(
         rotations (dict, optional): {page_num: rotation_angle} 형태의 딕셔너리. Defaults to None.
         stamp_data (dict, optional): 페이지별 스탬프 데이터. Defaults to None.
         page_order (list, optional): 페이지 순서를 지정하는 리스트. None이면 원본 순서 유지. Defaults to None.
-    
+        compression_mode (str, optional): 'images'(이미지만 축소) 또는 'raster'(페이지 전체 래스터).
+            Defaults to 'images'.
+
     Returns:
         bool: 압축 및 저장 성공 여부.
     """
-    import os
-    
+    if compression_mode not in COMPRESSION_MODES:
+        raise ValueError(f"지원하지 않는 압축 방식입니다: {compression_mode}")
     if not rotations:
         rotations = {}
     if not stamp_data:
         stamp_data = {}
-    
+
     # 페이지 순서가 변경되었는지 확인
     is_order_changed = False
     if page_order is not None:
@@ -292,52 +930,35 @@ def compress_pdf_with_multiple_stages(
             f.write(input_bytes)
         return True
 
-    # 2) 1단계 압축 시도 (중간 품질)
-    compressed_mb = compress_pdf_file(
-        input_bytes=input_bytes,
-        output_path=output_path,
-        jpeg_quality=83,
-        dpi=146,
-        size_threshold_kb=300,
-        user_rotations=rotations,
-        stamp_data=stamp_data,
-        page_order=page_order
-    )
-    print(f"1단계 압축 후 크기: {compressed_mb} MB")
-    if compressed_mb is not None and compressed_mb <= target_size_mb:
-        return True
-
-    # 3) 2단계 압축 시도 (낮은 품질)
-    compressed_mb = compress_pdf_file(
-        input_bytes=input_bytes,
-        output_path=output_path,
-        jpeg_quality=75,
-        dpi=125,
-        size_threshold_kb=0,
-        user_rotations=rotations,
-        stamp_data=stamp_data,
-        page_order=page_order
-    )
-    print(f"2단계 압축 후 크기: {compressed_mb} MB")
-    if compressed_mb is not None and compressed_mb <= target_size_mb:
-        return True
+    pdf_bytes = None
+    if input_bytes:
+        # 2) 무손실 최적화. 회전/스탬프가 없으면 이것만으로 목표에 맞는지 먼저 본다.
+        source_bytes = input_bytes
+        try:
+            optimized = _optimize_lossless(input_bytes, page_order)
+            print(f"🧹 무손실 최적화: {orig_mb:.2f} MB → {len(optimized) / (1024 * 1024):.2f} MB")
+            if not rotations and not stamp_data and len(optimized) / (1024 * 1024) <= target_size_mb:
+                with open(output_path, "wb") as f:
+                    f.write(optimized)
+                return True
+            # 페이지 순서는 이미 반영되었으므로 회전/스탬프 키를 새 위치로 바꾼다
+            source_bytes = optimized
+            if page_order is not None:
+                rotations = _to_output_positions(rotations, page_order)
+                stamp_data = _to_output_positions(stamp_data, page_order)
+                page_order = None
+        except Exception as e:
+            print(f"[오류] 무손실 최적화 실패, 원본으로 압축: {e}")
 
-    # 4) 3단계 압축 시도 (최저 품질)
-    compressed_mb = compress_pdf_file(
-        input_bytes=input_bytes,
-        output_path=output_path,
-        jpeg_quality=68,
-        dpi=100,
-        size_threshold_kb=0,
-        user_rotations=rotations,
-        stamp_data=stamp_data,
-        page_order=page_order
-    )
-    print(f"3단계 압축 후 크기: {compressed_mb} MB")
-    if compressed_mb is not None and compressed_mb <= target_size_mb:
+        # 3) 페이지별 단계를 골라 한 번만 저장
+        pdf_bytes, _ = _compress_single_pass(source_bytes, target_size_mb, rotations, stamp_data, page_order,
+                                             compression_mode)
+    if pdf_bytes is not None:
+        with open(output_path, "wb") as f:
+            f.write(pdf_bytes)
         return True
 
-    # 5) 모든 압축 실패시 원본 저장
+    # 4) 모든 압축 실패시 원본 저장
     try:
         with open(output_path, "wb") as f:
             f.write(input_bytes)
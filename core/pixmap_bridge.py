@@ -0,0 +1,48 @@
+"""
+PyMuPDF Pixmap → Qt 이미지 변환
+
+기존 변환은 pix.samples(bytes 복사) → QImage(...).copy() → QPixmap.fromImage(형식 변환 복사)로
+페이지 한 장마다 프레임 버퍼를 3번 이상 새로 만들었다.
+여기서는 PyMuPDF가 렌더링한 버퍼(samples_mv)를 복사하지 않고 QImage로 감싸고,
+Qt 쪽에서 필요한 복사(화면용 32비트 형식 변환 또는 축소)를 한 번만 수행한다.
+
+PyMuPDF는 불투명(alpha=False) 페이지를 3채널 RGB로만 렌더링하므로 32비트 형식으로 바로 그릴 수는 없다.
+(alpha=True는 배경이 투명해짐) 대신 Qt의 RGB888 → RGB32 변환이 곧 유일한 복사가 되도록 한다.
+"""
+import pymupdf
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+
+# 화면 표시용(QPixmap 백엔드) 32비트 형식
+DISPLAY_IMAGE_FORMAT = QImage.Format.Format_RGB32
+
+
+def wrap_pixmap(pix: "pymupdf.Pixmap") -> QImage:
+    """pix의 샘플 버퍼를 복사하지 않고 감싼 QImage를 반환한다.
+
+    반환된 QImage 객체가 pix를 참조로 붙잡아 두므로, 이 객체가 살아 있는 동안 버퍼가 유지된다.
+    단, 다른 스레드로 넘기거나 캐시에 보관할 이미지는 반드시 to_qimage/to_qpixmap으로 소유 복사본을 만든다.
+    (Qt의 암시적 공유 복사본은 Python 참조를 따라가지 않는다)
+    """
+    image_format = QImage.Format.Format_RGBA8888 if pix.alpha else QImage.Format.Format_RGB888
+    image = QImage(pix.samples_mv, pix.width, pix.height, pix.stride, image_format)
+    image._source_pixmap = pix  # 버퍼 소유자 유지
+    return image
+
+
+def to_qpixmap(pix: "pymupdf.Pixmap") -> QPixmap:
+    """pix → QPixmap. 프레임 할당은 QPixmap.fromImage의 형식 변환 한 번뿐이다."""
+    return QPixmap.fromImage(wrap_pixmap(pix))
+
+
+def to_qimage(pix: "pymupdf.Pixmap") -> QImage:
+    """pix → 버퍼를 소유한 32비트 QImage (작업 스레드에서 만들어 UI 스레드로 넘길 때 사용). 할당 한 번."""
+    return wrap_pixmap(pix).convertToFormat(DISPLAY_IMAGE_FORMAT)
+
+
+def to_scaled_qimage(pix: "pymupdf.Pixmap", max_width: int) -> QImage:
+    """pix를 폭 max_width 이하로 부드럽게 축소한 소유 QImage. 축소가 필요 없으면 to_qimage와 같다."""
+    image = wrap_pixmap(pix)
+    if image.width() <= max_width:
+        return image.convertToFormat(DISPLAY_IMAGE_FORMAT)
+    return image.scaledToWidth(max_width, Qt.TransformationMode.SmoothTransformation)
@@ -0,0 +1,192 @@
+"""
+인제스트 시점 렌더링 산출물 번들
+
+메일 수집 서비스(get_mail_logics/thread.py)의 전처리 워커가 신청 파일마다 미리 만들어 두는
+뷰어용 산출물 묶음이다. 작업자가 RN을 열 때 A4 변환, 첫 페이지 렌더링, 썸네일 생성을 건너뛴다.
+
+번들 위치: 뷰어가 열게 될 첫 번째 파일 경로 + BUNDLE_SUFFIX (디렉터리)
+  manifest.json   원본 파일 목록(이름/크기/수정 시각), 수집 시 설정, 페이지 크기/회전, 시트 셀 위치
+  document.pdf    뷰어가 그대로 여는 정규화된 PDF (전처리 파일 번들은 복사하지 않고 원본 파일을 그대로 연다)
+  thumbnails.jpg  썸네일 시트 (thumbnail_sheet)
+  page0.png       첫 페이지 미리보기 (BUNDLE_PREVIEW_ZOOM 배율, 회전 없음)
+
+번들은 뷰어 프로필과 무관한 고정 수집 설정(BUNDLE_*)으로 만들고 그 값을 manifest에 그대로 적는다.
+뷰어는 원본 파일의 크기/수정 시각과, 자신의 정규화 방식/DPI가 manifest 값과 같은지를 직접 확인한다.
+(첫 페이지 미리보기의 배율은 PdfViewWidget.preload_page_image가 render_zoom과 비교한다)
+"""
+import json
+import os
+import shutil
+import time
+import traceback
+from pathlib import Path
+
+import pymupdf
+from PyQt6.QtGui import QImage
+
+from core.pdf_render import PdfRender, NORMALIZE_MARGIN, NORMALIZE_MODE_RASTER, NORMALIZE_TARGET_DPI
+from core.thumbnail_sheet import build_thumbnail_sheet, split_thumbnail_sheet, DEFAULT_SHEET_OVERSAMPLING
+
+BUNDLE_SUFFIX = ".bundle"
+BUNDLE_VERSION = 2
+
+# 수집 서비스가 번들을 만들 때 쓰는 고정 설정 (뷰어의 렌더링 프로필을 따르지 않는다)
+BUNDLE_NORMALIZE_MODE = NORMALIZE_MODE_RASTER
+BUNDLE_NORMALIZE_DPI = NORMALIZE_TARGET_DPI
+# 첫 페이지 미리보기 배율 (뷰어의 render_zoom이 이 값일 때만 페이지 캐시에 바로 넣는다)
+BUNDLE_PREVIEW_ZOOM = 2.0
+
+MANIFEST_NAME = "manifest.json"
+DOCUMENT_NAME = "document.pdf"
+SHEET_NAME = "thumbnails.jpg"
+PREVIEW_NAME = "page0.png"
+
+
+def bundle_dir_for(viewer_paths: list[str]) -> Path:
+    """뷰어가 열 파일 목록에 대응하는 번들 디렉터리 경로"""
+    return Path(str(viewer_paths[0]) + BUNDLE_SUFFIX)
+
+
+def _file_signature(path: str) -> list:
+    stat = os.stat(path)
+    return [Path(path).name, stat.st_size, stat.st_mtime_ns]
+
+
+def write_render_bundle(viewer_paths: list[str], preprocessed: bool = False) -> Path | None:
+    """뷰어가 열 파일들에 대한 산출물 번들을 고정 수집 설정(BUNDLE_*)으로 만든다.
+
+    Args:
+        viewer_paths: DB에 저장되어 뷰어가 열게 될 파일 경로 목록
+        preprocessed: True면 단일 전처리 파일을 그대로 사용 (뷰어의 load_preprocessed_pdf와 동일, 복사하지 않음)
+    Returns:
+        번들 디렉터리 경로 (실패 시 None)
+    """
+    bundle_dir = bundle_dir_for(viewer_paths)
+    tmp_dir = bundle_dir.with_name(bundle_dir.name + ".tmp")
+    try:
+        if preprocessed:
+            with open(viewer_paths[0], "rb") as f:
+                pdf_bytes = f.read()
+        else:
+            if PdfRender.target_dpi != BUNDLE_NORMALIZE_DPI:
+                raise ValueError(f"정규화 DPI가 수집 설정과 다릅니다: {PdfRender.target_dpi} != {BUNDLE_NORMALIZE_DPI}")
+            # 뷰어와 같은 정규화 코드 사용 (디스크 캐시는 쓰지 않음)
+            renderer = PdfRender(normalize_mode=BUNDLE_NORMALIZE_MODE)
+            renderer.doc_cache = None
+            try:
+                renderer.load_many(list(viewer_paths))
+                pdf_bytes = renderer.get_pdf_bytes()
+            finally:
+                renderer.close()
+
+        sheet_bytes, layout = build_thumbnail_sheet(pdf_bytes, DEFAULT_SHEET_OVERSAMPLING)
+        with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+            page_sizes = [[page.rect.width, page.rect.height] for page in doc]
+            page_rotations = [page.rotation for page in doc]
+            preview_matrix = pymupdf.Matrix(BUNDLE_PREVIEW_ZOOM, BUNDLE_PREVIEW_ZOOM)
+            preview = doc.load_page(0).get_pixmap(matrix=preview_matrix, alpha=False)
+            preview_bytes = preview.tobytes("png")
+
+        manifest = {
+            "version": BUNDLE_VERSION,
+            "sources": [_file_signature(p) for p in viewer_paths],
+            "preprocessed": preprocessed,
+            # 정규화 설정은 일반 파일 번들에만 의미가 있다 (전처리 파일은 뷰어도 그대로 연다)
+            "normalize_mode": None if preprocessed else BUNDLE_NORMALIZE_MODE,
+            "normalize_dpi": None if preprocessed else BUNDLE_NORMALIZE_DPI,
+            "normalize_margin": None if preprocessed else NORMALIZE_MARGIN,
+            "page_count": len(page_sizes),
+            "page_sizes": page_sizes,
+            "page_rotations": page_rotations,
+            "sheet_layout": layout,
+            "preview_zoom": BUNDLE_PREVIEW_ZOOM,
+            "created": time.time(),
+        }
+
+        # 임시 디렉터리에 모두 쓴 뒤 교체하여, 만들다 만 번들이 읽히지 않게 한다
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        if not preprocessed:
+            (tmp_dir / DOCUMENT_NAME).write_bytes(pdf_bytes)
+        if sheet_bytes:
+            (tmp_dir / SHEET_NAME).write_bytes(sheet_bytes)
+        (tmp_dir / PREVIEW_NAME).write_bytes(preview_bytes)
+        (tmp_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        shutil.rmtree(bundle_dir, ignore_errors=True)
+        os.replace(tmp_dir, bundle_dir)
+        print(f"  📦 렌더링 번들 생성: {bundle_dir.name} ({len(page_sizes)} 페이지)")
+        return bundle_dir
+
+    except Exception as e:
+        print(f"  ⚠️ 렌더링 번들 생성 실패: {e}")
+        traceback.print_exc()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+
+
+class RenderBundle:
+    """디스크의 산출물 번들 (읽기 전용)"""
+
+    def __init__(self, bundle_dir: Path, manifest: dict):
+        self.bundle_dir = bundle_dir
+        self.manifest = manifest
+
+    @property
+    def pdf_path(self) -> str:
+        """뷰어가 열 PDF. 전처리 파일 번들은 번들 옆의 원본 전처리 파일을 가리킨다."""
+        if self.manifest.get("preprocessed"):
+            return str(self.bundle_dir.parent / self.manifest["sources"][0][0])
+        return str(self.bundle_dir / DOCUMENT_NAME)
+
+    @property
+    def page_count(self) -> int:
+        return self.manifest.get("page_count", 0)
+
+    def thumbnails(self) -> list[QImage]:
+        """페이지 순서대로의 회전 없는 기본 썸네일. 시트가 없으면 빈 목록."""
+        sheet_path = self.bundle_dir / SHEET_NAME
+        if not sheet_path.exists():
+            return []
+        return split_thumbnail_sheet(sheet_path.read_bytes(), self.manifest.get("sheet_layout", []))
+
+    def first_page_preview(self) -> tuple[QImage, float] | None:
+        """(첫 페이지 미리보기, 배율). 없거나 읽을 수 없으면 None."""
+        image = QImage(str(self.bundle_dir / PREVIEW_NAME))
+        if image.isNull():
+            return None
+        return image, self.manifest.get("preview_zoom", BUNDLE_PREVIEW_ZOOM)
+
+
+def find_render_bundle(viewer_paths: list[str], normalize_mode: str, normalize_dpi: int) -> RenderBundle | None:
+    """열려는 파일들에 맞는 유효한 번들을 찾는다.
+
+    일반 파일 번들은 뷰어의 정규화 방식/DPI(normalize_mode, normalize_dpi)가 번들의 수집 설정과 같을 때만 쓴다.
+    없거나 원본이 바뀌었거나 설정이 다르면 None.
+    """
+    if not viewer_paths:
+        return None
+    bundle_dir = bundle_dir_for(viewer_paths)
+    manifest_path = bundle_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != BUNDLE_VERSION:
+            return None
+        if manifest.get("sources") != [_file_signature(p) for p in viewer_paths]:
+            print(f"⚠️ 렌더링 번들이 원본과 달라 사용하지 않습니다: {bundle_dir.name}")
+            return None
+        if not manifest.get("preprocessed") and (
+                manifest.get("normalize_mode") != normalize_mode or manifest.get("normalize_dpi") != normalize_dpi
+                or manifest.get("normalize_margin") != NORMALIZE_MARGIN):
+            print(f"⚠️ 렌더링 번들의 수집 설정이 뷰어 설정과 달라 사용하지 않습니다: {bundle_dir.name} "
+                  f"({manifest.get('normalize_mode')}/{manifest.get('normalize_dpi')} DPI)")
+            return None
+        bundle = RenderBundle(bundle_dir, manifest)
+        if not Path(bundle.pdf_path).exists():
+            return None
+        return bundle
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 렌더링 번들 확인 실패: {e}")
+        return None
@@ -0,0 +1,122 @@
+"""
+렌더링 품질 프로필
+
+정규화 DPI, 뷰어 페이지 렌더링 배율, 썸네일 오버샘플링, 캐시 예산을 이름 있는 프로필 하나로 묶는다.
+- fast: 저사양 사무용 PC에서도 페이지 넘김이 밀리지 않도록 해상도와 캐시를 낮춘다
+- balanced: 기존 기본값 (정규화 200 DPI, 2배율 렌더링)
+- archival: 보관/출력용 고해상도 (정규화 300 DPI)
+- auto: 코어 수와 전체 물리 메모리로 fast/balanced 중에서 고른다.
+  단, 화면 배율/썸네일/캐시 예산만 따르고 정규화 DPI는 balanced 값으로 고정한다.
+  (같은 파일이 PC 상태에 따라 다른 해상도로 변환되어 디스크 캐시/번들이 어긋나지 않게)
+
+프로필 이름은 설정(render/profile)에 저장하고 MainWindow가 시작할 때 set_render_profile()로 적용한다.
+캐시 예산을 개별 설정(cache/page_cache_mb 등)으로 직접 지정했다면 그 값이 프로필보다 우선한다.
+"""
+import os
+import sys
+
+RENDER_PROFILE_AUTO = "auto"
+RENDER_PROFILE_FAST = "fast"
+RENDER_PROFILE_BALANCED = "balanced"
+RENDER_PROFILE_ARCHIVAL = "archival"
+DEFAULT_RENDER_PROFILE = RENDER_PROFILE_BALANCED
+
+# auto: 코어가 이 수 이하이거나 전체 물리 메모리가 이보다 적으면 fast
+AUTO_FAST_MAX_CORES = 2
+AUTO_FAST_MIN_TOTAL_MB = 6 * 1024
+
+
+class RenderProfile:
+    """프로필 하나의 값 묶음"""
+
+    def __init__(self, name: str, label: str, normalize_dpi: int, view_zoom: float,
+                 thumbnail_oversampling: float, page_cache_mb: int, doc_cache_mb: int):
+        self.name = name
+        self.label = label
+        self.normalize_dpi = normalize_dpi  # A4 정규화 래스터 해상도
+        self.view_zoom = view_zoom  # 뷰어 페이지 렌더링 배율 (render_zoom)
+        self.thumbnail_oversampling = thumbnail_oversampling  # 썸네일 폭 대비 렌더링 배수
+        self.page_cache_mb = page_cache_mb  # 렌더링된 페이지 메모리 캐시 예산
+        self.doc_cache_mb = doc_cache_mb  # 정규화 문서 디스크 캐시 예산
+
+    def describe(self) -> str:
+        return (f"정규화 {self.normalize_dpi} DPI, 화면 {self.view_zoom:g}배율, "
+                f"썸네일 {self.thumbnail_oversampling:g}배, 페이지 캐시 {self.page_cache_mb} MB")
+
+
+RENDER_PROFILES = {
+    RENDER_PROFILE_FAST: RenderProfile(RENDER_PROFILE_FAST, "빠르게", 150, 1.5, 1.5, 128, 512),
+    RENDER_PROFILE_BALANCED: RenderProfile(RENDER_PROFILE_BALANCED, "균형", 200, 2.0, 2.0, 256, 1024),
+    RENDER_PROFILE_ARCHIVAL: RenderProfile(RENDER_PROFILE_ARCHIVAL, "고화질(보관용)", 300, 3.0, 2.5, 512, 2048),
+}
+# 설정 화면에 보일 순서 (이름, 표시 이름)
+RENDER_PROFILE_CHOICES = [(RENDER_PROFILE_AUTO, "자동")] + [(p.name, p.label) for p in RENDER_PROFILES.values()]
+
+# 현재 적용된 프로필 (set_render_profile 전에는 기존 기본값과 같은 balanced)
+_active_profile: RenderProfile = RENDER_PROFILES[RENDER_PROFILE_BALANCED]
+
+
+def total_memory_mb() -> int | None:
+    """전체 물리 메모리(MB). 알 수 없으면 None. (순간 여유 메모리와 달리 실행할 때마다 바뀌지 않는다)"""
+    try:
+        import psutil
+        return int(psutil.virtual_memory().total // (1024 * 1024))
+    except ImportError:
+        pass
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                    ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                    ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                    ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+                ]
+
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return None
+            return int(status.ullTotalPhys // (1024 * 1024))
+        return int(os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024))
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def choose_auto_profile(cpu_count: int | None = None, total_mb: int | None = None) -> str:
+    """코어 수와 전체 물리 메모리로 프로필 이름을 고른다. (모르는 값은 판단에서 뺀다)"""
+    cpu_count = cpu_count if cpu_count is not None else os.cpu_count()
+    total_mb = total_mb if total_mb is not None else total_memory_mb()
+    if cpu_count is not None and cpu_count <= AUTO_FAST_MAX_CORES:
+        return RENDER_PROFILE_FAST
+    if total_mb is not None and total_mb < AUTO_FAST_MIN_TOTAL_MB:
+        return RENDER_PROFILE_FAST
+    return RENDER_PROFILE_BALANCED
+
+
+def resolve_render_profile(name: str) -> RenderProfile:
+    """프로필 이름(auto 포함)을 실제 프로필로 바꾼다. 모르는 이름이면 balanced.
+
+    auto는 고른 프로필의 화면 배율/썸네일/캐시 예산에 balanced의 정규화 DPI를 합친 프로필이다.
+    """
+    balanced = RENDER_PROFILES[RENDER_PROFILE_BALANCED]
+    if name == RENDER_PROFILE_AUTO:
+        base = RENDER_PROFILES[choose_auto_profile()]
+        return RenderProfile(RENDER_PROFILE_AUTO, base.label, balanced.normalize_dpi, base.view_zoom,
+                             base.thumbnail_oversampling, base.page_cache_mb, base.doc_cache_mb)
+    return RENDER_PROFILES.get(name, balanced)
+
+
+def get_render_profile() -> RenderProfile:
+    """현재 적용된 프로필을 반환한다."""
+    return _active_profile
+
+
+def set_render_profile(name: str) -> RenderProfile:
+    """프로필을 적용하고 반환한다. 값을 읽는 쪽(PdfRender, PdfViewWidget 등)은 각자 이 프로필을 반영한다."""
+    global _active_profile
+    _active_profile = resolve_render_profile(name)
+    return _active_profile
@@ -0,0 +1,149 @@
+"""
+페이지 렌더링 작업 스케줄러
+
+PdfViewWidget 전용 QThreadPool에서 렌더링 작업을 우선순위에 따라 실행한다.
+- 저장/DB 조회 Worker가 쓰는 전역 스레드 풀과 분리하여 서로 막지 않게 한다.
+- 우선순위: 현재 페이지 > 확대 타일 > 인접 페이지 미리 렌더링 > 썸네일
+- 현재 페이지에서 멀어진 대기 작업은 큐에서 빼서 취소한다.
+- 페이지 이동 속도에 따라 미리 렌더링 범위를 넓힌다.
+"""
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool
+
+# 작업 우선순위 (값이 클수록 먼저 실행)
+PRIORITY_THUMBNAIL = 0
+PRIORITY_PREFETCH = 5
+PRIORITY_TILE = 7  # 현재 페이지 확대 타일 (미리 렌더링보다 먼저)
+PRIORITY_CURRENT = 10
+
+# 미리 렌더링 범위 (현재 페이지 기준 앞뒤 페이지 수)
+MIN_PREFETCH_RADIUS = 1
+MAX_PREFETCH_RADIUS = 4
+# 이 간격(초)보다 빠르게 페이지를 넘기면 빠른 이동으로 본다
+FAST_NAVIGATION_INTERVAL = 0.35
+
+
+class RenderScheduler(QObject):
+    """우선순위와 취소를 지원하는 렌더링 작업 스케줄러"""
+
+    def __init__(self, max_threads: int | None = None, parent: QObject | None = None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        if max_threads is None:
+            # UI 스레드 몫 하나를 남기고, 렌더링은 최대 4개까지만 동시에
+            max_threads = max(1, min(4, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self.thread_pool.setMaxThreadCount(max_threads)
+        # 스레드별 문서 핸들(PdfRender._thread_docs)이 OS 스레드 id를 키로 쓰므로
+        # 유휴 스레드가 만료되어 주인 없는 핸들이 남지 않도록 스레드를 유지한다 (최대 max_threads개)
+        self.thread_pool.setExpiryTimeout(-1)
+
+        self._pending: dict[object, tuple[QRunnable, int]] = {}  # {작업 id: (작업, 우선순위)}
+        self._nav_history: deque[tuple[float, int]] = deque(maxlen=6)  # (시각, 페이지)
+
+    # --- 작업 제출/취소 ---
+    def submit(self, job_id, runnable: QRunnable, priority: int) -> bool:
+        """작업을 우선순위와 함께 제출한다.
+
+        같은 id의 작업이 더 낮은 우선순위로 대기 중이면 큐에서 빼고 다시 넣는다.
+        Returns:
+            새로 제출했으면 True, 이미 같은(또는 더 높은) 우선순위로 대기/실행 중이면 False
+        """
+        existing = self._pending.get(job_id)
+        if existing is not None:
+            old_runnable, old_priority = existing
+            if old_priority >= priority or not self._try_take(old_runnable):
+                return False
+
+        self._pending[job_id] = (runnable, priority)
+        self.thread_pool.start(runnable, priority)
+        return True
+
+    def is_pending(self, job_id) -> bool:
+        """작업이 대기 또는 실행 중인지 확인한다."""
+        return job_id in self._pending
+
+    def finish(self, job_id) -> None:
+        """작업 완료(또는 오류) 시 호출하여 추적 목록에서 제거한다."""
+        self._pending.pop(job_id, None)
+
+    def cancel(self, job_id) -> bool:
+        """아직 시작하지 않은 작업을 취소한다. 취소했으면 True."""
+        existing = self._pending.get(job_id)
+        if existing is None:
+            return False
+        if self._try_take(existing[0]):
+            del self._pending[job_id]
+            return True
+        return False
+
+    def cancel_where(self, predicate) -> list:
+        """조건에 맞는 대기 작업을 모두 취소하고 취소된 작업 id 목록을 반환한다."""
+        cancelled = []
+        for job_id in [j for j in self._pending if predicate(j)]:
+            if self.cancel(job_id):
+                cancelled.append(job_id)
+        return cancelled
+
+    def cancel_all(self) -> None:
+        """대기 중인 모든 작업을 취소하고 추적 목록을 비운다. (문서 교체 시)"""
+        for runnable, _ in self._pending.values():
+            self._try_take(runnable)
+        self._pending.clear()
+
+    def _try_take(self, runnable: QRunnable) -> bool:
+        """시작 전인 작업을 큐에서 제거한다.
+
+        이미 시작된 작업(autoDelete로 해제되었을 수 있음)은 건드리지 않는다.
+        """
+        if getattr(runnable, 'started', False):
+            return False
+        if self.thread_pool.tryTake(runnable):
+            runnable.cancelled = True
+            return True
+        return False
+
+    # --- 미리 렌더링 범위 ---
+    def note_navigation(self, page_num: int) -> None:
+        """페이지 이동을 기록한다. (이동 속도/방향 추정용)"""
+        if self._nav_history and self._nav_history[-1][1] == page_num:
+            return
+        self._nav_history.append((time.monotonic(), page_num))
+
+    def _navigation_state(self) -> tuple[int, int]:
+        """(미리 렌더링 반경, 이동 방향 +1/-1/0)을 추정한다."""
+        if len(self._nav_history) < 2:
+            return MIN_PREFETCH_RADIUS, 0
+
+        history = list(self._nav_history)
+        intervals = [b[0] - a[0] for a, b in zip(history, history[1:])]
+        steps = [b[1] - a[1] for a, b in zip(history, history[1:])]
+        direction = 1 if sum(steps) > 0 else -1 if sum(steps) < 0 else 0
+
+        # 최근 간격이 짧게 이어질수록 반경을 넓힌다
+        fast_moves = 0
+        for interval in reversed(intervals):
+            if interval > FAST_NAVIGATION_INTERVAL:
+                break
+            fast_moves += 1
+        radius = min(MAX_PREFETCH_RADIUS, MIN_PREFETCH_RADIUS + fast_moves)
+        return radius, direction
+
+    def prefetch_pages(self, page_num: int, page_count: int) -> list[int]:
+        """미리 렌더링할 페이지 목록을 가까운 순서로 반환한다.
+
+        빠르게 한 방향으로 이동 중이면 진행 방향 쪽으로 범위를 넓히고,
+        반대 방향은 한 페이지만 유지한다.
+        """
+        radius, direction = self._navigation_state()
+        forward = radius if direction >= 0 else MIN_PREFETCH_RADIUS
+        backward = radius if direction <= 0 else MIN_PREFETCH_RADIUS
+
+        pages = []
+        for distance in range(1, max(forward, backward) + 1):
+            if distance <= forward and page_num + distance < page_count:
+                pages.append(page_num + distance)
+            if distance <= backward and page_num - distance >= 0:
+                pages.append(page_num - distance)
+        return pages
@@ -0,0 +1,352 @@
+"""
+프로세스 분리 렌더 서버
+
+MuPDF로 원본/정규화 문서를 해석하는 무거운 작업을 뷰어 프로세스 밖의 작은 작업 프로세스 풀에서 실행하는 선택적 백엔드이다.
+작업 프로세스가 멈추거나 비정상 종료하면 그 작업만 실패하고 뷰어는 살아 있으며,
+무거운 렌더링이 UI 스레드와 같은 프로세스의 GIL을 다투지 않는다.
+
+작업 프로세스에서 실행하는 것 (백엔드가 'process'일 때):
+- 첨부 파일 로드 시의 A4 정규화 (PdfRender._append_source_file → normalize())
+  신뢰할 수 없는 원본 파일은 뷰어 프로세스에서 열지 않고, 정규화된 PDF 바이트만 돌려받는다.
+- 페이지 렌더링 (PdfRender.render_page_thread_safe, 미리보기 포함)
+- 썸네일 렌더링 (PdfRender.render_thumbnail_thread_safe)
+- 확대 타일 렌더링 (TileRenderWorker)
+
+뷰어 프로세스에 남아 있는 것 (모두 정규화가 끝난 문서를 다룸):
+- 정규화 결과를 합치는 insert_pdf, 디스크 캐시 적중 시의 캐시 문서 병합과 캐시 썸네일 시트 생성
+- 자르기/회전/삭제 등 편집, 페이지 교체 원본(replace_page), 동기 렌더링(render_page, create_thumbnail), 저장 시 압축
+따라서 격리는 "원본 첨부 파일 해석"과 "화면 렌더링"에 한정되며, 정규화 결과 자체를 MuPDF가
+다시 해석하다 죽는 경우까지 막지는 않는다.
+
+- 작업 프로세스마다 Pipe 하나로 요청/응답을 주고받는다. (한 번에 한 작업)
+- 렌더링된 프레임은 프로세스마다 뷰어가 만들어 둔 SharedMemory 버퍼로 돌아온다.
+  (버퍼가 작으면 키운 뒤 다시 복사를 요청. 피클로 프레임을 주고받지 않는다)
+- 문서는 작업 프로세스가 세대(doc_key)별로 한 개만 열어 둔다. 바이트 문서는 세대가 바뀔 때만 전송한다.
+- 작업마다 제한 시간이 있고, 시간을 넘기거나 프로세스가 죽으면 프로세스를 새로 띄운 뒤 오류를 낸다.
+
+PdfRender의 스레드 안전 렌더링 메서드가 get_render_server()로 활성 서버를 확인해 사용하므로
+PdfViewWidget과 각 Worker는 어떤 백엔드가 켜져 있는지 알 필요가 없다.
+"""
+import multiprocessing
+import queue
+import threading
+import traceback
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+import pymupdf
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+
+RENDER_BACKEND_THREAD = "thread"
+RENDER_BACKEND_PROCESS = "process"
+RENDER_BACKENDS = (RENDER_BACKEND_THREAD, RENDER_BACKEND_PROCESS)
+
+DEFAULT_RENDER_PROCESSES = 2
+# 작업 하나의 제한 시간(초). 넘기면 해당 작업 프로세스를 다시 시작한다.
+DEFAULT_RENDER_TIMEOUT_SEC = 20.0
+# 파일 하나의 정규화 제한 시간(초). 여러 페이지를 래스터 변환하므로 렌더링보다 길게 둔다.
+DEFAULT_NORMALIZE_TIMEOUT_SEC = 120.0
+# 프로세스별 공유 메모리 초기 크기 (A4 2배율 RGB 프레임이 들어가는 정도)
+INITIAL_SHM_BYTES = 8 * 1024 * 1024
+
+# 현재 활성화된 렌더 서버 (None이면 스레드 백엔드)
+_active_server: "RenderServer | None" = None
+
+
+class RenderTimeoutError(RuntimeError):
+    """작업 프로세스가 제한 시간 안에 렌더링을 끝내지 못했을 때"""
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """뷰어가 만든 공유 메모리에 붙는다. 정리(unlink)는 뷰어 몫이므로 가능하면 추적하지 않는다."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _server_main(conn) -> None:
+    """작업 프로세스 진입점. 요청을 하나씩 받아 렌더링/정규화한다."""
+    # spawn으로 뜬 프로세스에서만 필요한 모듈이므로 여기서 가져온다 (뷰어 쪽 순환 import 방지)
+    from core.pdf_render import PdfRender
+    from core.tile_renderer import TileRenderer
+
+    doc_key = None
+    doc = None
+    display_lists: OrderedDict = OrderedDict()
+    frame = None  # (pix, 기기 좌표 x, y)
+    shm_blocks: dict[str, shared_memory.SharedMemory] = {}
+
+    def copy_frame(shm_name: str, shm_size: int) -> tuple:
+        pix, device_x, device_y = frame
+        nbytes = pix.stride * pix.height
+        if nbytes > shm_size:
+            return ('too_small', nbytes)
+        block = shm_blocks.get(shm_name)
+        if block is None:
+            # 뷰어가 이름을 바꿨다면(버퍼를 키움) 이전 버퍼는 놓는다
+            for old in shm_blocks.values():
+                old.close()
+            shm_blocks.clear()
+            block = _attach_shared_memory(shm_name)
+            shm_blocks[shm_name] = block
+        block.buf[:nbytes] = pix.samples_mv
+        return ('ok', pix.width, pix.height, pix.stride, device_x, device_y)
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        command = request[0]
+        try:
+            if command == 'stop':
+                break
+            elif command == 'render':
+                _, key, source, page_num, spec, shm_name, shm_size = request
+                if key != doc_key or doc is None:
+                    if doc is not None:
+                        doc.close()
+                    doc = None
+                    display_lists.clear()
+                    if source is None:
+                        # 뷰어는 이 프로세스가 해당 세대를 열어 두었다고 보고 소스를 생략했다
+                        conn.send(('need_source',))
+                        continue
+                    doc = PdfRender._open_pdf_source(source)
+                    doc_key = key
+                if not (0 <= page_num < len(doc)):
+                    raise IndexError(f"잘못된 페이지 번호: {page_num}")
+                kind = spec[0]
+                if kind == 'page':
+                    _, zoom, rotation = spec
+                    matrix = pymupdf.Matrix(zoom, zoom).prerotate(rotation)
+                    frame = (doc.load_page(page_num).get_pixmap(matrix=matrix, alpha=False, annots=True), 0, 0)
+                elif kind == 'thumbnail':
+                    _, max_width, oversampling = spec
+                    display_list = PdfRender._cached_display_list(display_lists, doc, page_num)
+                    frame = (PdfRender._thumbnail_pixmap(display_list, max_width, oversampling), 0, 0)
+                elif kind == 'tile':
+                    display_list = PdfRender._cached_display_list(display_lists, doc, page_num)
+                    frame = TileRenderer.tile_pixmap(display_list, spec[1])
+                else:
+                    raise ValueError(f"지원하지 않는 렌더링 요청입니다: {kind}")
+                conn.send(copy_frame(shm_name, shm_size))
+            elif command == 'copy':
+                _, shm_name, shm_size = request
+                conn.send(copy_frame(shm_name, shm_size))
+            elif command == 'normalize':
+                _, path, normalize_mode, target_dpi = request
+                PdfRender.target_dpi = target_dpi
+                pdf_bytes, reports, raster_count = PdfRender.normalize_file(path, normalize_mode)
+                conn.send(('ok', pdf_bytes, reports, raster_count))
+        except Exception as e:
+            traceback.print_exc()
+            conn.send(('error', str(e)))
+
+    for block in shm_blocks.values():
+        block.close()
+    if doc is not None:
+        doc.close()
+
+
+class _RenderProcess:
+    """작업 프로세스 하나와 그 프로세스 전용 공유 메모리 버퍼"""
+
+    def __init__(self, context, index: int):
+        self._context = context
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.doc_key = None  # 작업 프로세스가 열어 둔 문서 세대
+        self.shm: shared_memory.SharedMemory | None = None
+        self.start()
+
+    def start(self) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        self.process = self._context.Process(
+            target=_server_main, args=(child_conn,), name=f"RenderServer-{self.index}", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.doc_key = None
+
+    def restart(self) -> None:
+        print(f"⚠️ 렌더 프로세스 {self.index} 재시작")
+        self.kill()
+        self.start()
+
+    def kill(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(2)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(2)
+        if self.conn is not None:
+            self.conn.close()
+
+    def ensure_shm(self, nbytes: int) -> shared_memory.SharedMemory:
+        if self.shm is None or self.shm.size < nbytes:
+            self.release_shm()
+            self.shm = shared_memory.SharedMemory(create=True, size=max(nbytes, INITIAL_SHM_BYTES))
+        return self.shm
+
+    def release_shm(self) -> None:
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class RenderServer:
+    """작업 프로세스 풀. render*/normalize()는 QThreadPool 작업 스레드나 로드 스레드에서 호출한다. (블로킹)"""
+
+    def __init__(self, processes: int = DEFAULT_RENDER_PROCESSES, timeout: float = DEFAULT_RENDER_TIMEOUT_SEC):
+        self.timeout = timeout
+        # Windows와 동작을 맞추기 위해 spawn 방식 사용 (main.py의 freeze_support 참고)
+        context = multiprocessing.get_context("spawn")
+        self._processes = [_RenderProcess(context, i) for i in range(max(1, processes))]
+        self._idle: queue.Queue[_RenderProcess] = queue.Queue()
+        for proc in self._processes:
+            self._idle.put(proc)
+        self._closed = False
+        self._lock = threading.Lock()
+        print(f"🧩 렌더 서버 시작: 작업 프로세스 {len(self._processes)}개")
+
+    def render(self, pdf_source: "bytes | str", page_num: int, zoom_factor: float = 2.0, user_rotation: int = 0,
+               doc_key: int | None = None) -> QPixmap:
+        """작업 프로세스에서 페이지를 렌더링하여 QPixmap을 반환한다.
+
+        Raises:
+            RenderTimeoutError: 제한 시간 초과 (프로세스는 재시작됨)
+            RuntimeError: 작업 프로세스의 렌더링 오류 또는 비정상 종료
+        """
+        # 공유 메모리를 복사 없이 감싼 뒤 QPixmap 변환 때 한 번만 복사한다
+        pixmap, _, _ = self._render(pdf_source, page_num, ('page', zoom_factor, user_rotation), doc_key,
+                                    QPixmap.fromImage)
+        return pixmap
+
+    def render_thumbnail(self, pdf_source: "bytes | str", page_num: int, max_width: int, oversampling: float,
+                         doc_key: int | None = None) -> QImage:
+        """작업 프로세스에서 썸네일을 렌더링하고 폭 max_width 이하로 축소한 소유 QImage를 반환한다."""
+        def scale(image: QImage) -> QImage:
+            if image.width() <= max_width:
+                return image.convertToFormat(QImage.Format.Format_RGB32)
+            return image.scaledToWidth(max_width, Qt.TransformationMode.SmoothTransformation)
+
+        image, _, _ = self._render(pdf_source, page_num, ('thumbnail', max_width, oversampling), doc_key, scale)
+        return image
+
+    def render_tile(self, pdf_source: "bytes | str", page_num: int, tile_key: tuple,
+                    doc_key: int | None = None) -> tuple[QImage, int, int]:
+        """작업 프로세스에서 타일 하나를 렌더링한다. TileRenderer.render_tile과 같은 (이미지, x, y)를 반환한다."""
+        return self._render(pdf_source, page_num, ('tile', tile_key), doc_key,
+                            lambda image: image.convertToFormat(QImage.Format.Format_RGB32))
+
+    def normalize(self, path: str, normalize_mode: str, target_dpi: int) -> tuple[bytes, list, int]:
+        """작업 프로세스에서 원본 파일 하나를 A4로 정규화한다.
+
+        Returns:
+            (정규화된 PDF 바이트, 페이지별 PageImageReport 목록, 래스터 변환 페이지 수)
+            변환된 페이지가 없으면 바이트는 비어 있다.
+        """
+        self._check_open()
+        proc = self._idle.get()
+        try:
+            reply = self._call(proc, ('normalize', path, normalize_mode, target_dpi), DEFAULT_NORMALIZE_TIMEOUT_SEC)
+        finally:
+            self._idle.put(proc)
+        if reply[0] == 'error':
+            raise RuntimeError(reply[1])
+        _, pdf_bytes, reports, raster_count = reply
+        return pdf_bytes, reports, raster_count
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("렌더 서버가 종료되었습니다.")
+
+    def _render(self, pdf_source, page_num: int, spec: tuple, doc_key, convert) -> tuple:
+        """렌더링 요청을 보내고 공유 메모리 프레임을 convert로 소유 이미지로 바꿔 (이미지, x, y)를 반환한다.
+
+        프레임 변환은 버퍼를 다른 작업이 덮어쓰기 전, 프로세스를 풀에 돌려놓기 전에 끝낸다.
+        """
+        self._check_open()
+        key = doc_key if doc_key is not None else id(pdf_source)
+        proc = self._idle.get()
+        try:
+            shm = proc.ensure_shm(INITIAL_SHM_BYTES)
+            source = None if proc.doc_key == key else pdf_source
+            reply = self._call(proc, ('render', key, source, page_num, spec, shm.name, shm.size))
+            if reply[0] == 'need_source':
+                reply = self._call(proc, ('render', key, pdf_source, page_num, spec, shm.name, shm.size))
+            proc.doc_key = key
+            if reply[0] == 'too_small':
+                shm = proc.ensure_shm(reply[1])
+                reply = self._call(proc, ('copy', shm.name, shm.size))
+            if reply[0] == 'error':
+                raise RuntimeError(reply[1])
+
+            _, width, height, stride, device_x, device_y = reply
+            image = QImage(shm.buf, width, height, stride, QImage.Format.Format_RGB888)
+            result = convert(image)
+            del image
+            return result, device_x, device_y
+        finally:
+            self._idle.put(proc)
+
+    def _call(self, proc: _RenderProcess, request: tuple, timeout: float | None = None) -> tuple:
+        """요청을 보내고 제한 시간 안에 응답을 기다린다. 실패하면 프로세스를 다시 시작한다."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            proc.conn.send(request)
+            if not proc.conn.poll(timeout):
+                proc.restart()
+                raise RenderTimeoutError(f"렌더링 제한 시간({timeout:g}초) 초과")
+            return proc.conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError, OSError) as e:
+            exitcode = proc.process.exitcode if proc.process else None
+            proc.restart()
+            raise RuntimeError(f"렌더 프로세스가 비정상 종료되었습니다 (exitcode={exitcode}): {e}")
+
+    def shutdown(self) -> None:
+        """작업 프로세스와 공유 메모리를 정리한다."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for proc in self._processes:
+            try:
+                proc.conn.send(('stop',))
+            except (OSError, ValueError):
+                pass
+            if proc.process is not None:
+                proc.process.join(2)
+            proc.kill()
+            proc.release_shm()
+        print("🧩 렌더 서버 종료")
+
+
+def get_render_server() -> "RenderServer | None":
+    """활성화된 렌더 서버를 반환한다. 스레드 백엔드면 None."""
+    return _active_server
+
+
+def set_render_backend(backend: str, processes: int = DEFAULT_RENDER_PROCESSES,
+                       timeout: float = DEFAULT_RENDER_TIMEOUT_SEC) -> None:
+    """렌더링 백엔드를 설정한다. ('thread' 또는 'process')"""
+    global _active_server
+    if backend not in RENDER_BACKENDS:
+        raise ValueError(f"지원하지 않는 렌더링 백엔드입니다: {backend}")
+    if _active_server is not None:
+        _active_server.shutdown()
+        _active_server = None
+    if backend == RENDER_BACKEND_PROCESS:
+        _active_server = RenderServer(processes, timeout)
+
+
+def shutdown_render_server() -> None:
+    """앱 종료 시 호출: 렌더 서버가 있으면 종료한다."""
+    set_render_backend(RENDER_BACKEND_THREAD)
@@ -0,0 +1,72 @@
+"""
+썸네일 시트
+
+문서의 페이지별 썸네일을 한 장의 JPEG 이미지로 묶어 파일 하나로 보관한다.
+- build_thumbnail_sheet: PDF 바이트 → (시트 JPEG 바이트, 페이지별 셀 위치 [x, y, w, h] 목록)
+- split_thumbnail_sheet: 시트 + 셀 위치 → 페이지별 QImage
+
+썸네일은 회전 없는 기본 방향이며 폭은 THUMBNAIL_WIDTH 이하이다.
+(ThumbnailViewWidget이 캐시하는 기본 썸네일과 같은 규격이라 그대로 재사용할 수 있다)
+"""
+import io
+
+import pymupdf
+from PIL import Image
+from PyQt6.QtGui import QImage
+
+THUMBNAIL_WIDTH = 120
+SHEET_COLUMNS = 10
+SHEET_JPEG_QUALITY = 85
+# 썸네일 폭 대비 렌더링 배수 기본값 (PdfRender.THUMBNAIL_OVERSAMPLING과 같은 값)
+DEFAULT_SHEET_OVERSAMPLING = 2.0
+
+
+def render_thumbnail(page: "pymupdf.Page", oversampling: float = DEFAULT_SHEET_OVERSAMPLING) -> Image.Image:
+    """페이지 하나의 썸네일을 만든다. (폭의 oversampling배로 렌더링한 뒤 부드럽게 축소)"""
+    rect = page.rect
+    zoom = max(1.0, THUMBNAIL_WIDTH * oversampling / rect.width) if rect.width else oversampling
+    pix = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False, annots=True)
+    image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples, "raw", "RGB", pix.stride)
+    if image.width > THUMBNAIL_WIDTH:
+        height = max(1, round(image.height * THUMBNAIL_WIDTH / image.width))
+        image = image.resize((THUMBNAIL_WIDTH, height), Image.Resampling.LANCZOS)
+    return image
+
+
+def build_thumbnail_sheet(pdf_bytes: bytes,
+                          oversampling: float = DEFAULT_SHEET_OVERSAMPLING) -> tuple[bytes, list[list[int]]]:
+    """PDF의 모든 페이지 썸네일을 격자로 배치한 시트를 만든다.
+
+    oversampling은 렌더링 프로필의 썸네일 오버샘플링(RenderProfile.thumbnail_oversampling)을 넘긴다.
+
+    Returns:
+        (JPEG 바이트, 페이지 순서대로의 셀 위치 [x, y, w, h] 목록). 페이지가 없으면 (b"", [])
+    """
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+        thumbnails = [render_thumbnail(page, oversampling) for page in doc]
+    if not thumbnails:
+        return b"", []
+
+    layout = []
+    sheet_height = 0
+    for row_start in range(0, len(thumbnails), SHEET_COLUMNS):
+        row = thumbnails[row_start:row_start + SHEET_COLUMNS]
+        for column, image in enumerate(row):
+            layout.append([column * THUMBNAIL_WIDTH, sheet_height, image.width, image.height])
+        sheet_height += max(image.height for image in row)
+
+    sheet = Image.new("RGB", (THUMBNAIL_WIDTH * min(SHEET_COLUMNS, len(thumbnails)), sheet_height), "white")
+    for image, (x, y, _, _) in zip(thumbnails, layout):
+        sheet.paste(image, (x, y))
+
+    buffer = io.BytesIO()
+    sheet.save(buffer, format="JPEG", quality=SHEET_JPEG_QUALITY)
+    return buffer.getvalue(), layout
+
+
+def split_thumbnail_sheet(sheet_bytes: bytes, layout: list[list[int]]) -> list[QImage]:
+    """시트를 페이지별 QImage로 잘라낸다. 시트를 읽을 수 없으면 빈 목록."""
+    sheet = QImage.fromData(sheet_bytes)
+    if sheet.isNull():
+        return []
+    return [sheet.copy(x, y, w, h) for x, y, w, h in layout]
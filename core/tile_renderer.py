@@ -0,0 +1,125 @@
+"""
+확대 시 선명도를 위한 타일 렌더러
+
+메인 뷰의 페이지 이미지는 render_zoom(기본 2.0) 배율로 한 번 렌더링된다.
+사용자가 그보다 크게 확대하면 화면에 보이는 영역만 실제 화면 배율에 맞춰
+타일(TILE_SIZE 픽셀 정사각형) 단위로 다시 렌더링한다.
+- 페이지 내용은 PdfRender가 캐시한 DisplayList로 한 번만 해석하고, 타일은 clip으로 잘라 렌더링한다.
+- 타일 렌더링은 렌더링 스케줄러의 작업 스레드(TileRenderWorker)에서 하고, UI 스레드는 캐시 조회와 배치만 한다.
+- 렌더링된 타일은 메모리 예산이 있는 LRU로 보관한다.
+
+좌표계:
+- 페이지 공간: PDF 페이지 좌표 (pt)
+- 장치 공간: Matrix(zoom).prerotate(rotation)을 적용하고 원점을 (0, 0)으로 옮긴 픽셀 좌표
+  (render_page_thread_safe의 결과 이미지와 같은 좌표계)
+"""
+import math
+from collections import OrderedDict
+
+import pymupdf
+from PyQt6.QtGui import QImage, QPixmap
+
+from core.pixmap_bridge import to_qimage
+
+TILE_SIZE = 512
+MAX_TILE_ZOOM = 8.0
+DEFAULT_TILE_CACHE_MB = 96
+
+
+class TileRenderer:
+    """DisplayList 기반 타일 렌더링 + 타일 LRU 캐시"""
+
+    def __init__(self, max_bytes: int = DEFAULT_TILE_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # {(세대, 페이지, 회전, 배율, 열, 행): (QPixmap, 장치 x, 장치 y)}
+        self._tiles: OrderedDict[tuple, tuple[QPixmap, int, int]] = OrderedDict()
+        self._current_bytes = 0
+
+    @staticmethod
+    def tile_zoom_for(effective_zoom: float, base_zoom: float) -> float | None:
+        """화면 배율에 맞는 타일 배율을 반환한다. 기본 이미지로 충분하면 None.
+
+        배율이 조금씩 바뀔 때마다 다시 렌더링하지 않도록 base_zoom의 √2 배수 단계로 올림한다.
+        """
+        if effective_zoom <= base_zoom * 1.15:
+            return None
+        steps = math.ceil(math.log(effective_zoom / base_zoom, math.sqrt(2)))
+        return min(base_zoom * math.sqrt(2) ** steps, MAX_TILE_ZOOM)
+
+    @staticmethod
+    def _matrix(zoom: float, rotation: int) -> pymupdf.Matrix:
+        return pymupdf.Matrix(zoom, zoom).prerotate(rotation)
+
+    def lookup_tiles(self, page_rect: "pymupdf.Rect", generation: int, page_num: int, rotation: int,
+                     zoom: float, visible_rect: tuple[float, float, float, float]
+                     ) -> tuple[dict[tuple, tuple[QPixmap, int, int]], list[tuple]]:
+        """장치 공간의 visible_rect(x0, y0, x1, y1)를 덮는 타일 중 캐시에 있는 것과 없는 것을 나눈다.
+
+        렌더링은 하지 않는다. 빠진 타일은 TileRenderWorker가 render_tile로 만들어 put으로 넣는다.
+        Returns:
+            ({타일 키: (QPixmap, 장치 x, 장치 y)}, [렌더링할 타일 키])
+        """
+        device_bounds = (page_rect * self._matrix(zoom, rotation)).irect
+
+        x0, y0, x1, y1 = visible_rect
+        x0, y0 = max(0.0, x0), max(0.0, y0)
+        x1, y1 = min(float(device_bounds.width), x1), min(float(device_bounds.height), y1)
+        if x1 <= x0 or y1 <= y0:
+            return {}, []
+
+        tiles, missing = {}, []
+        for row in range(int(y0 // TILE_SIZE), int(math.ceil(y1 / TILE_SIZE))):
+            for col in range(int(x0 // TILE_SIZE), int(math.ceil(x1 / TILE_SIZE))):
+                key = (generation, page_num, rotation, round(zoom, 3), col, row)
+                cached = self._tiles.get(key)
+                if cached is not None:
+                    self._tiles.move_to_end(key)
+                    tiles[key] = cached
+                else:
+                    missing.append(key)
+        return tiles, missing
+
+    @staticmethod
+    def tile_pixmap(display_list: "pymupdf.DisplayList | pymupdf.Page", key: tuple) -> tuple["pymupdf.Pixmap", int, int]:
+        """타일 키 하나를 렌더링한 PyMuPDF Pixmap을 반환한다. (Qt 없이 동작하므로 렌더 서버 작업 프로세스도 사용)
+
+        Returns:
+            (Pixmap, 장치 x, 장치 y)
+        """
+        _, _, rotation, zoom, col, row = key
+        matrix = TileRenderer._matrix(zoom, rotation)
+        device_bounds = (display_list.rect * matrix).irect
+        origin_x, origin_y = device_bounds.x0, device_bounds.y0
+        device_rect = pymupdf.Rect(
+            col * TILE_SIZE + origin_x, row * TILE_SIZE + origin_y,
+            min((col + 1) * TILE_SIZE, device_bounds.width) + origin_x,
+            min((row + 1) * TILE_SIZE, device_bounds.height) + origin_y,
+        )
+        pix = display_list.get_pixmap(matrix=matrix, clip=device_rect * ~matrix, alpha=False)
+        return pix, pix.x - origin_x, pix.y - origin_y
+
+    @staticmethod
+    def render_tile(display_list: "pymupdf.DisplayList", key: tuple) -> tuple[QImage, int, int]:
+        """타일 키 하나를 렌더링한다. (작업 스레드용, 버퍼를 소유한 QImage를 반환)
+
+        Returns:
+            (QImage, 장치 x, 장치 y)
+        """
+        pix, device_x, device_y = TileRenderer.tile_pixmap(display_list, key)
+        return to_qimage(pix), device_x, device_y
+
+    def put(self, key: tuple, entry: tuple[QPixmap, int, int]) -> None:
+        """렌더링된 타일을 캐시에 넣는다. 예산을 넘으면 오래된 타일부터 버린다."""
+        if key in self._tiles:
+            return
+        pixmap = entry[0]
+        self._tiles[key] = entry
+        self._current_bytes += pixmap.width() * pixmap.height() * 4
+        while self._current_bytes > self.max_bytes and len(self._tiles) > 1:
+            _, (old_pixmap, _, _) = self._tiles.popitem(last=False)
+            self._current_bytes -= old_pixmap.width() * old_pixmap.height() * 4
+
+    def clear(self) -> None:
+        """모든 타일을 버린다. (문서 교체 시)"""
+        self._tiles.clear()
+        self._current_bytes = 0
@@ -0,0 +1,126 @@
+"""
+되돌리기/다시 실행 기록 (undo journal)
+
+PdfViewWidget의 편집 기록을 보관한다.
+- 문서 내용을 바꾸는 작업(자르기 등)은 문서 전체 스냅샷 대신 바뀐 페이지만 담은
+  작은 PDF(PdfRender.extract_pages)를 작업 전/후로 저장한다.
+- 되돌린 작업은 다시 실행(redo) 스택으로 옮기고, 새 작업이 기록되면 redo 스택을 비운다.
+- 페이지 델타의 크기 합이 메모리 예산을 넘으면 가장 오래된 기록부터 버린다.
+- 페이지 삭제로 번호가 바뀌면 remap_deleted_pages로 기록의 페이지 번호를 맞춘다.
+"""
+from collections import deque
+
+DEFAULT_UNDO_JOURNAL_MB = 128
+
+
+class JournalEntry:
+    """기록 하나: (작업 이름, 대표 페이지, 작업별 데이터)와 영향받은 페이지, 차지하는 메모리"""
+
+    def __init__(self, action: str, page_num: int, data=None, pages: list[int] | None = None, nbytes: int = 0):
+        self.action = action
+        self.page_num = page_num
+        self.data = data
+        # 영향받은 페이지 목록 (페이지 삭제 시 번호 보정/폐기 기준)
+        self.pages = list(pages) if pages is not None else ([page_num] if page_num >= 0 else [])
+        self.nbytes = nbytes
+
+
+class UndoJournal:
+    """메모리 예산이 있는 되돌리기/다시 실행 스택"""
+
+    def __init__(self, max_bytes: int = DEFAULT_UNDO_JOURNAL_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._undo: deque[JournalEntry] = deque()
+        self._redo: list[JournalEntry] = []
+        self._current_bytes = 0
+
+    def record(self, action: str, page_num: int, data=None, pages: list[int] | None = None,
+               nbytes: int = 0) -> JournalEntry:
+        """새 작업을 기록한다. 다시 실행 스택은 비운다."""
+        for entry in self._redo:
+            self._current_bytes -= entry.nbytes
+        self._redo.clear()
+
+        entry = JournalEntry(action, page_num, data, pages, nbytes)
+        self._undo.append(entry)
+        self._current_bytes += nbytes
+        self._enforce_budget()
+        return entry
+
+    def undo(self) -> JournalEntry | None:
+        """되돌릴 기록을 꺼내 다시 실행 스택으로 옮긴다. 없으면 None."""
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._redo.append(entry)
+        return entry
+
+    def redo(self) -> JournalEntry | None:
+        """다시 실행할 기록을 꺼내 되돌리기 스택으로 옮긴다. 없으면 None."""
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._undo.append(entry)
+        return entry
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def _enforce_budget(self) -> None:
+        # 가장 오래된 되돌리기 기록부터, 그래도 넘으면 가장 먼 다시 실행 기록부터 버린다
+        while self._current_bytes > self.max_bytes and len(self._undo) > 1:
+            self._current_bytes -= self._undo.popleft().nbytes
+        while self._current_bytes > self.max_bytes and self._redo:
+            self._current_bytes -= self._redo.pop(0).nbytes
+
+    def remap_deleted_pages(self, deleted_pages) -> None:
+        """페이지 삭제 후 기록의 페이지 번호를 당긴다. 삭제된 페이지를 건드린 기록은 버린다."""
+        deleted = sorted(set(deleted_pages))
+        if not deleted:
+            return
+
+        def shift(page: int) -> int:
+            return page - sum(1 for d in deleted if d < page)
+
+        def remap(entries) -> list[JournalEntry]:
+            kept = []
+            for entry in entries:
+                if any(page in deleted for page in entry.pages):
+                    self._current_bytes -= entry.nbytes
+                    continue
+                entry.pages = [shift(page) for page in entry.pages]
+                if entry.page_num >= 0:
+                    entry.page_num = shift(entry.page_num)
+                if isinstance(entry.data, dict) and 'pages' in entry.data:
+                    entry.data['pages'] = list(entry.pages)
+                if isinstance(entry.data, dict) and 'stamps' in entry.data:
+                    # 페이지별로 보관한 스탬프 아이템 {페이지: [아이템]}의 키도 함께 당긴다
+                    entry.data['stamps'] = {shift(page): items for page, items in entry.data['stamps'].items()}
+                kept.append(entry)
+            return kept
+
+        self._undo = deque(remap(self._undo))
+        self._redo = remap(self._redo)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._current_bytes = 0
+
+    def stats(self) -> dict:
+        """기록 개수와 페이지 델타가 차지하는 메모리를 반환한다."""
+        return {
+            'undo': len(self._undo),
+            'redo': len(self._redo),
+            'bytes': self._current_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    def __bool__(self) -> bool:
+        return bool(self._undo)
@@ -1,17 +1,22 @@
 from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QImage, QPixmap
 import time
 from pathlib import Path
 import pandas as pd
 
 from core.pdf_render import PdfRender
+from core.render_server import get_render_server
 from core.pdf_saved import compress_pdf_with_multiple_stages
+from core.tile_renderer import TileRenderer
 
 
 class WorkerSignals(QObject):
     """
     Worker 스레드에서 발생할 수 있는 시그널 정의
     - finished: 렌더링 완료 시 (페이지 번호, 렌더링된 QPixmap)
+    - preview: 점진적 렌더링의 저해상도 1차 결과 (페이지 번호, QPixmap)
+    - thumbnail_finished: 썸네일 렌더링 완료 시 (페이지 번호, 회전 없는 썸네일 QImage)
+    - tile_finished: 확대 타일 하나 렌더링 완료 시 (타일 키, QImage, 장치 x, 장치 y)
     - error: 렌더링 오류 시 (페이지 번호, 에러 메시지)
     - save_finished: 저장 완료 시 (경로, 성공 여부)
     - save_error: 저장 오류 시 (에러 메시지)
@@ -19,6 +24,9 @@ class WorkerSignals(QObject):
     - fetch_error: DB 조회 오류 시 (에러 메시지)
     """
     finished = pyqtSignal(int, QPixmap)
+    preview = pyqtSignal(int, QPixmap)
+    thumbnail_finished = pyqtSignal(int, QImage)
+    tile_finished = pyqtSignal(object, QImage, int, int)
     error = pyqtSignal(int, str)
     save_finished = pyqtSignal(str, bool)
     save_error = pyqtSignal(str)
@@ -28,13 +36,19 @@ class WorkerSignals(QObject):
 class PdfRenderWorker(QRunnable):
     """단일 PDF 페이지를 렌더링하는 Worker 스레드"""
 
-    def __init__(self, pdf_bytes: bytes, page_num: int, zoom_factor: float = 2.0, user_rotation: int = 0):
+    def __init__(self, pdf_source: "bytes | str", page_num: int, zoom_factor: float = 2.0, user_rotation: int = 0,
+                 doc_key: int | None = None, progressive: bool = False):
         super().__init__()
-        self.pdf_bytes = pdf_bytes
+        self.pdf_source = pdf_source  # PDF 바이트 또는 수정되지 않은 파일 기반 문서의 경로
         self.page_num = page_num
         self.zoom_factor = zoom_factor
         self.user_rotation = user_rotation
+        self.doc_key = doc_key  # 문서 세대 id (스레드별 문서 핸들 재사용 키)
+        self.progressive = progressive  # True면 저해상도 미리보기(preview 시그널)를 먼저 보낸다
         self.signals = WorkerSignals()
+        # RenderScheduler가 사용하는 상태 플래그
+        self.started = False
+        self.cancelled = False
 
     @staticmethod
     def _is_a4_size(width_cm: float, height_cm: float, tolerance: float = 2.0) -> bool:
@@ -48,16 +62,88 @@ class PdfRenderWorker(QRunnable):
 
     def run(self):
         """백그라운드 스레드에서 렌더링 실행. 핵심 로직은 PdfRender 클래스에 위임."""
+        self.started = True
+        if self.cancelled:
+            return
         try:
-            # PdfRender의 스레드 안전 메서드를 호출 (A4 변환된 바이트 데이터 사용)
-            pixmap = PdfRender.render_page_thread_safe(
-                self.pdf_bytes, self.page_num, self.zoom_factor, self.user_rotation
-            )
+            # PdfRender의 스레드 안전 메서드를 호출 (A4 변환된 바이트 데이터 사용, 프로세스 분리 백엔드도 여기서 처리)
+            if self.progressive:
+                pixmap = PdfRender.render_page_progressive(
+                    self.pdf_source, self.page_num, self.zoom_factor, self.user_rotation,
+                    doc_key=self.doc_key,
+                    on_preview=lambda preview: self.signals.preview.emit(self.page_num, preview)
+                )
+            else:
+                pixmap = PdfRender.render_page_thread_safe(
+                    self.pdf_source, self.page_num, self.zoom_factor, self.user_rotation,
+                    doc_key=self.doc_key
+                )
             self.signals.finished.emit(self.page_num, pixmap)
 
         except Exception as e:
             self.signals.error.emit(self.page_num, str(e))
 
+class ThumbnailRenderWorker(QRunnable):
+    """페이지 썸네일을 렌더링하는 Worker 스레드 (UI 스레드에서는 QPixmap으로만 변환)"""
+
+    def __init__(self, pdf_source: "bytes | str", page_num: int, max_width: int, doc_key: int):
+        super().__init__()
+        self.pdf_source = pdf_source  # PDF 바이트 또는 수정되지 않은 파일 기반 문서의 경로
+        self.page_num = page_num
+        self.max_width = max_width
+        self.doc_key = doc_key
+        self.signals = WorkerSignals()
+        # RenderScheduler가 사용하는 상태 플래그
+        self.started = False
+        self.cancelled = False
+
+    def run(self):
+        self.started = True
+        if self.cancelled:
+            return
+        try:
+            image = PdfRender.render_thumbnail_thread_safe(
+                self.pdf_source, self.page_num, self.max_width, self.doc_key
+            )
+            self.signals.thumbnail_finished.emit(self.page_num, image)
+        except Exception as e:
+            self.signals.error.emit(self.page_num, str(e))
+
+class TileRenderWorker(QRunnable):
+    """현재 페이지의 확대 타일들을 렌더링하는 Worker 스레드 (UI 스레드에서는 QPixmap으로만 변환)"""
+
+    def __init__(self, pdf_source: "bytes | str", page_num: int, tile_keys: list[tuple], doc_key: int):
+        super().__init__()
+        self.pdf_source = pdf_source  # PDF 바이트 또는 수정되지 않은 파일 기반 문서의 경로
+        self.page_num = page_num
+        self.tile_keys = tile_keys
+        self.doc_key = doc_key
+        self.signals = WorkerSignals()
+        # RenderScheduler가 사용하는 상태 플래그 (실행 중에도 cancelled가 켜지면 남은 타일을 건너뛴다)
+        self.started = False
+        self.cancelled = False
+
+    def run(self):
+        self.started = True
+        if self.cancelled:
+            return
+        try:
+            server = get_render_server()
+            display_list = None
+            if server is None:
+                display_list = PdfRender._acquire_thread_display_list(self.pdf_source, self.doc_key, self.page_num)
+            for key in self.tile_keys:
+                if self.cancelled:
+                    return
+                if server is not None:
+                    # 프로세스 분리 백엔드: 작업 프로세스에서 렌더링하고 공유 메모리로 타일을 받는다
+                    image, device_x, device_y = server.render_tile(self.pdf_source, self.page_num, key, self.doc_key)
+                else:
+                    image, device_x, device_y = TileRenderer.render_tile(display_list, key)
+                self.signals.tile_finished.emit(key, image, device_x, device_y)
+        except Exception as e:
+            self.signals.error.emit(self.page_num, str(e))
+
 class PdfSaveWorker(QRunnable):
     """QThreadPool에서 PDF 압축 및 저장을 실행하기 위한 Worker"""
 
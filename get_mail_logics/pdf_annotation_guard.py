@@ -71,6 +71,15 @@ def _page_has_dropped_annots(page: "fitz.Page") -> Tuple[bool, list]:
     return has, types
 
 
+def page_will_lose_objects(page: "fitz.Page") -> bool:
+    """단일 페이지에 show_pdf_page 기반 변환 시 손실될 수 있는 주석이 있는지 판단.
+
+    뷰어(core.pdf_render)의 벡터 보존 A4 변환에서 페이지별로 래스터 여부를 고를 때 사용한다.
+    """
+    has, _ = _page_has_dropped_annots(page)
+    return has
+
+
 def pdf_will_lose_objects(pdf_path: str) -> bool:
     """현재 thread.py 전처리(show_pdf_page) 기준으로 손실될 수 있는 주석이 포함되어 있는지 판단.
 
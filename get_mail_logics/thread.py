@@ -62,6 +62,8 @@ TARGET_REGIONS = ['서울특별시', '울산광역시', '부산광역시']
 # 전처리 임계값 설정
 PREPROCESS_THRESHOLD_MB = 3.0  # 3MB 초과 시에만 전처리
 PROCESSED_DIR = "C:\\Users\\HP\\Desktop\\greet_db\\files\\processed"
+# 신청 건마다 뷰어용 렌더링 번들(정규화 PDF, 썸네일, 첫 페이지 미리보기) 생성 여부
+RENDER_BUNDLE_ENABLED = True
 
 # --- DB 및 Gmail API 연결 ---
 
@@ -826,6 +828,14 @@ def download_worker_thread():
                         else:
                             print(f"  📏 PDF 파일 없음 → 전처리 불필요")
                     
+                    # 전처리하지 않는 신청 건도 뷰어가 열 파일 그대로 렌더링 번들을 만든다
+                    if RENDER_BUNDLE_ENABLED and not needs_preprocess and file_paths:
+                        preprocess_queue.put({
+                            'thread_id': thread_id,
+                            'bundle_only': True,
+                            'original_paths': file_paths,
+                        })
+                    
                     # DB 업데이트: file_rendered = 0 (아직 전처리 안됨)
                     final_paths_str = ';'.join(file_paths)
                     update_email_attachment_path(conn, thread_id, final_paths_str, file_rendered=0)
@@ -875,6 +885,18 @@ def download_worker_thread():
             time.sleep(5)
 
 
+def write_render_bundle_for_viewer(viewer_paths: list, preprocessed: bool = False):
+    """뷰어가 열 파일들에 대한 렌더링 번들을 만든다. (실패해도 전처리 흐름은 계속)"""
+    if not RENDER_BUNDLE_ENABLED:
+        return None
+    try:
+        from core.render_bundle import write_render_bundle
+        return write_render_bundle(viewer_paths, preprocessed=preprocessed)
+    except Exception as e:
+        print(f"  ⚠️ 렌더링 번들 생성 건너뜀: {e}")
+        return None
+
+
 def preprocess_worker_thread():
     """✨ 전처리 큐를 감시하고 대용량 PDF 최적화 수행 (여러 파일 병합)"""
     print("🚀 전처리 워커 스레드 시작")
@@ -897,6 +919,13 @@ def preprocess_worker_thread():
                 preprocess_queue.task_done()
                 continue
             
+            if task.get('bundle_only'):
+                try:
+                    write_render_bundle_for_viewer(original_paths)
+                finally:
+                    preprocess_queue.task_done()
+                continue
+            
             # 전체 파일 크기 계산
             total_size_mb = sum(os.path.getsize(p) / (1024 * 1024) for p in original_paths)
             print(f"🔧 전처리 시작: {len(original_paths)}개 파일, 총 {total_size_mb:.2f} MB")
@@ -906,6 +935,9 @@ def preprocess_worker_thread():
                 merged_processed_path = merge_and_preprocess_pdfs(original_paths, PROCESSED_DIR, thread_id)
                 
                 if merged_processed_path:
+                    # DB 경로를 바꾸기 전에 번들을 만들어, 뷰어가 새 경로를 볼 때는 번들도 준비되어 있게 한다
+                    write_render_bundle_for_viewer([merged_processed_path], preprocessed=True)
+
                     # ✨ DB 업데이트: 병합된 파일 하나의 경로로 교체
                     conn = get_database_connection()
                     if conn:
@@ -936,6 +968,7 @@ def preprocess_worker_thread():
                                 conn.close()
                 else:
                     print(f"  ⚠️ 전처리 실패: (원본 파일 사용)")
+                    write_render_bundle_for_viewer(original_paths)
                 
             except Exception as e:
                 print(f"  ❌ 전처리 중 예외 발생: {e}")
@@ -3,6 +3,7 @@
 PDF Viewer 메인 애플리케이션
 """
 import sys
+import multiprocessing
 from widgets.main_window import create_app
 
 def main():
@@ -19,4 +20,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # 렌더 서버 작업 프로세스(spawn)가 PyInstaller 실행 파일에서도 시작되도록 한다
+    multiprocessing.freeze_support()
     main()
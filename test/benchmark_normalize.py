@@ -0,0 +1,93 @@
+"""
+PdfRender A4 정규화 방식(raster / hybrid) 비교 벤치마크.
+
+각 방식마다 별도 프로세스에서 load_pdf를 실행하여 로딩 시간, 결과 pdf_bytes 크기,
+프로세스 메모리(RSS)를 측정한다. 같은 프로세스에서 연달아 돌리면 앞선 실행의
+메모리가 섞이므로 방식별로 프로세스를 분리한다.
+
+사용 예시:
+  python test/benchmark_normalize.py test/800.pdf test/download.pdf
+  python test/benchmark_normalize.py path/to/file.pdf --repeat 3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MODES = ("raster", "hybrid")
+
+
+def _rss_mb() -> float:
+    """현재 프로세스의 RSS(MB). psutil이 없으면 최대 RSS로 대체한다."""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    except ImportError:
+        import resource  # Windows에는 없음 -> psutil 설치 필요
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_single(path: str, mode: str) -> dict:
+    """자식 프로세스에서 실행: 한 가지 방식으로 한 파일을 로드하고 측정값을 반환한다."""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from core.pdf_render import PdfRender
+
+    renderer = PdfRender(normalize_mode=mode)
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    renderer.load_pdf(path)
+    elapsed = time.perf_counter() - start
+    rss_after = _rss_mb()
+
+    result = {
+        "mode": mode,
+        "seconds": elapsed,
+        "pages": renderer.get_page_count(),
+        "bytes": len(renderer.get_pdf_bytes() or b""),
+        "rss_mb": rss_after,
+        "rss_delta_mb": rss_after - rss_before,
+    }
+    renderer.close()
+    return result
+
+
+def _spawn(path: str, mode: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", mode, path],
+        capture_output=True, text=True, encoding="utf-8", cwd=str(PROJECT_ROOT),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or f"자식 프로세스 실패 (code {proc.returncode})")
+    # load_pdf가 출력하는 진행 로그 뒤 마지막 줄이 결과 JSON
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="A4 정규화 방식 비교 벤치마크")
+    parser.add_argument("paths", nargs="*", help="벤치마크할 PDF 파일")
+    parser.add_argument("--repeat", type=int, default=1, help="방식별 반복 횟수 (최솟값 기준 출력)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_single(args.paths[0], args.child)))
+        return 0
+
+    paths = args.paths or [str(PROJECT_ROOT / "test" / "800.pdf")]
+    print(f"{'파일':<28} {'방식':<7} {'페이지':>5} {'시간(s)':>8} {'크기(KB)':>10} {'RSS(MB)':>8} {'ΔRSS':>7}")
+    for path in paths:
+        for mode in MODES:
+            runs = [_spawn(path, mode) for _ in range(max(1, args.repeat))]
+            best = min(runs, key=lambda r: r["seconds"])
+            print(f"{Path(path).name[:28]:<28} {mode:<7} {best['pages']:>5} {best['seconds']:>8.3f} "
+                  f"{best['bytes'] / 1024:>10.1f} {best['rss_mb']:>8.1f} {best['rss_delta_mb']:>7.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
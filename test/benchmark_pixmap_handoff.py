@@ -0,0 +1,92 @@
+"""
+PyMuPDF Pixmap → QPixmap 변환 경로 마이크로 벤치마크.
+
+기존 경로(pix.samples → QImage(...).copy() → QPixmap.fromImage)와
+core.pixmap_bridge 경로(samples_mv를 복사 없이 감싼 뒤 fromImage 한 번)를 같은 페이지 렌더링 결과로 비교한다.
+- 시간: 변환 1회 평균 (렌더링 시간 제외)
+- 파이썬 프레임 할당: tracemalloc으로 잡힌 프레임 크기 이상의 할당 횟수 (pix.samples의 bytes 복사 등)
+- Qt 프레임 복사: 경로상 QImage/QPixmap 복사 횟수 (감싼 QImage의 버퍼 주소가 pix.samples_ptr와 같은지 확인)
+
+사용 예시:
+  python test/benchmark_pixmap_handoff.py test/800.pdf
+  python test/benchmark_pixmap_handoff.py path/to/file.pdf --zoom 3 --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pymupdf
+from PyQt6.QtGui import QGuiApplication, QImage, QPixmap
+
+from core.pixmap_bridge import to_qpixmap, wrap_pixmap
+
+
+def legacy_to_qpixmap(pix: "pymupdf.Pixmap") -> QPixmap:
+    """변경 전 PdfRender._pixmap_to_qpixmap과 같은 경로"""
+    qimage = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format.Format_RGB888).copy()
+    return QPixmap.fromImage(qimage)
+
+
+# (이름, 변환 함수, 경로상 Qt 프레임 복사 횟수)
+PATHS = (
+    ("legacy", legacy_to_qpixmap, 2),   # .copy() + fromImage
+    ("bridge", to_qpixmap, 1),          # fromImage (RGB888 → RGB32 변환)
+)
+
+
+def _frame_allocations(convert, pix: "pymupdf.Pixmap") -> int:
+    """convert 1회 동안 파이썬 힙 최고 사용량이 프레임 몇 장 분량만큼 늘었는지 (바로 해제되는 임시 복사본 포함)"""
+    frame_bytes = pix.stride * pix.height
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    result = convert(pix)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return (peak - baseline) // frame_bytes
+
+
+def run(path: str, zoom: float, repeat: int) -> None:
+    with pymupdf.open(path) as doc:
+        pix = doc.load_page(0).get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+    frame_mb = pix.stride * pix.height / (1024 * 1024)
+    print(f"{Path(path).name}: {pix.width}x{pix.height} (프레임 {frame_mb:.1f} MB), 반복 {repeat}회")
+
+    wrapped = wrap_pixmap(pix)
+    zero_copy = int(wrapped.constBits()) == pix.samples_ptr
+    print(f"  samples_mv 감싸기 무복사: {'예' if zero_copy else '아니오'}")
+
+    print(f"  {'경로':<8} {'ms/회':>8} {'파이썬 프레임 할당':>16} {'Qt 프레임 복사':>14} {'합계':>5}")
+    for name, convert, qt_copies in PATHS:
+        convert(pix)  # 워밍업
+        start = time.perf_counter()
+        for _ in range(repeat):
+            convert(pix)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+        py_allocs = _frame_allocations(convert, pix)
+        print(f"  {name:<8} {elapsed_ms:>8.2f} {py_allocs:>16} {qt_copies:>14} {py_allocs + qt_copies:>5}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pixmap → QPixmap 변환 경로 비교")
+    parser.add_argument("paths", nargs="*", help="첫 페이지를 렌더링할 PDF 파일")
+    parser.add_argument("--zoom", type=float, default=2.0, help="렌더링 배율 (기본 2.0 = 뷰어 render_zoom)")
+    parser.add_argument("--repeat", type=int, default=30, help="경로별 반복 횟수")
+    args = parser.parse_args(argv)
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)  # QPixmap 생성에 필요
+    for path in args.paths or [str(PROJECT_ROOT / "test" / "800.pdf")]:
+        run(path, args.zoom, max(1, args.repeat))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+"""
+연속 스크롤 보기의 페이지 배치
+
+모든 페이지를 세로로 이어 놓은 가벼운 자리표시(placeholder) 사각형만 씬에 두고,
+실제 페이지 이미지(QGraphicsPixmapItem)는 화면 근처의 페이지에만 자리표시의 자식으로 붙였다가
+멀어지면 떼어 낸다. 수백 쪽 문서라도 씬에는 사각형 수백 개와 이미지 몇 장만 남는다.
+
+렌더링/캐시/스탬프는 PdfViewWidget이 맡고, 이 클래스는 배치와 페이지 아이템의 수명만 관리한다.
+씬 좌표는 단일 페이지 보기와 같이 render_zoom 픽셀 단위이다.
+"""
+import bisect
+from typing import Callable
+
+from PyQt6.QtCore import QPointF, QRectF, QSize, Qt
+from PyQt6.QtGui import QBrush, QColor, QPen, QPixmap
+from PyQt6.QtWidgets import QGraphicsPixmapItem, QGraphicsRectItem, QGraphicsScene
+
+# 페이지 사이 간격 (render_zoom 픽셀)
+PAGE_SPACING = 24
+# 보이는 영역 위아래로 이미지를 붙여 둘 범위 (화면 높이의 배수)
+PREFETCH_SCREENS = 1.0
+
+
+class ContinuousPageLayout:
+    """페이지 자리표시를 세로로 쌓고, 보이는 페이지에만 이미지 아이템을 붙인다."""
+
+    def __init__(self, scene: QGraphicsScene, spacing: int = PAGE_SPACING,
+                 on_detach: Callable[[int], None] | None = None):
+        """
+        Args:
+            on_detach: 페이지 이미지 아이템을 지우기 직전에 페이지 번호로 호출된다. (자식 스탬프 아이템 보관용)
+        """
+        self._scene = scene
+        self._spacing = spacing
+        self._on_detach = on_detach
+        self._order: list[int] = []  # 위에서부터의 실제 페이지 번호
+        self._tops: list[float] = []  # _order 순서의 자리표시 윗변 y
+        self._slots: dict[int, QGraphicsRectItem] = {}  # {page_num: 자리표시}
+        self._items: dict[int, QGraphicsPixmapItem] = {}  # {page_num: 붙어 있는 페이지 이미지}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def order(self) -> list[int]:
+        return list(self._order)
+
+    def build(self, pages: list[tuple[int, QSize]]):
+        """(페이지 번호, 예상 픽셀 크기) 목록 순서대로 자리표시를 만든다. 기존 배치는 지운다."""
+        self.clear()
+        for page_num, size in pages:
+            slot = QGraphicsRectItem(0, 0, size.width(), size.height())
+            slot.setPen(QPen(QColor(200, 200, 200)))
+            slot.setBrush(QBrush(Qt.GlobalColor.white))
+            slot.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+            self._scene.addItem(slot)
+            self._slots[page_num] = slot
+            self._order.append(page_num)
+        self._restack()
+
+    def clear(self):
+        """자리표시와 페이지 아이템을 모두 씬에서 제거하고 씬 영역을 자동 계산으로 되돌린다."""
+        for page_num in list(self._items):
+            self.detach(page_num)
+        for slot in self._slots.values():
+            if slot.scene() is not None:
+                self._scene.removeItem(slot)  # 자식(페이지 이미지, 스탬프)도 함께 제거됨
+        self._order.clear()
+        self._tops.clear()
+        self._slots.clear()
+        self._items.clear()
+        self._scene.setSceneRect(QRectF())
+
+    def _restack(self):
+        """자리표시를 위에서부터 다시 쌓고 씬 영역을 맞춘다. (가운데 정렬)"""
+        self._tops = []
+        y = 0.0
+        max_width = 0.0
+        for page_num in self._order:
+            slot = self._slots[page_num]
+            rect = slot.rect()
+            slot.setPos(-rect.width() / 2, y)
+            self._tops.append(y)
+            y += rect.height() + self._spacing
+            max_width = max(max_width, rect.width())
+        # 씬 영역을 직접 지정해야 페이지가 줄거나 문서가 바뀐 뒤에도 스크롤 범위가 남지 않는다
+        margin = self._spacing
+        self._scene.setSceneRect(QRectF(-max_width / 2 - margin, -margin,
+                                        max_width + 2 * margin, max(y, 0.0) + margin))
+
+    def set_page_size(self, page_num: int, size: QSize) -> bool:
+        """페이지 자리표시 크기를 바꾸고(회전, 자르기) 아래 페이지를 다시 쌓는다. 바뀌었으면 True."""
+        slot = self._slots.get(page_num)
+        if slot is None or slot.rect().size().toSize() == size:
+            return False
+        slot.setRect(0, 0, size.width(), size.height())
+        self._restack()
+        return True
+
+    def page_rect(self, page_num: int) -> QRectF:
+        """페이지 자리표시의 씬 좌표 영역. 없는 페이지면 빈 사각형."""
+        slot = self._slots.get(page_num)
+        return slot.sceneBoundingRect() if slot is not None else QRectF()
+
+    def pages_between(self, top: float, bottom: float) -> list[int]:
+        """세로 구간 [top, bottom]에 걸친 페이지 번호를 위에서부터 반환한다."""
+        if not self._order:
+            return []
+        first = max(bisect.bisect_right(self._tops, top) - 1, 0)
+        last = bisect.bisect_right(self._tops, bottom)
+        return [self._order[i] for i in range(first, last)
+                if self._tops[i] + self._slots[self._order[i]].rect().height() >= top]
+
+    def most_visible_page(self, rect: QRectF) -> int | None:
+        """rect(씬 좌표)에서 가장 많이 보이는 페이지. 같으면 위쪽 페이지."""
+        best_page, best_height = None, 0.0
+        for page_num in self.pages_between(rect.top(), rect.bottom()):
+            visible = self.page_rect(page_num).intersected(rect).height()
+            if visible > best_height:
+                best_page, best_height = page_num, visible
+        return best_page
+
+    def page_at(self, scene_pos: QPointF) -> int | None:
+        """씬 좌표 위치에 있는 페이지 번호. 페이지 사이 간격이면 None."""
+        for page_num in self.pages_between(scene_pos.y(), scene_pos.y()):
+            if self.page_rect(page_num).contains(scene_pos):
+                return page_num
+        return None
+
+    def item(self, page_num: int) -> QGraphicsPixmapItem | None:
+        """페이지에 붙어 있는 이미지 아이템. 없으면 None."""
+        return self._items.get(page_num)
+
+    def attached_pages(self) -> list[int]:
+        return list(self._items)
+
+    def attach(self, page_num: int, pixmap: QPixmap) -> tuple[QGraphicsPixmapItem | None, bool]:
+        """페이지 자리표시에 이미지를 붙인다.
+
+        크기가 같은 이미지가 이미 붙어 있으면 픽스맵만 바꿔 자식(스탬프) 아이템을 유지한다.
+
+        Returns:
+            (페이지 아이템, 새로 만들었는지 여부). 배치에 없는 페이지면 (None, False)
+        """
+        slot = self._slots.get(page_num)
+        if slot is None:
+            return None, False
+        self.set_page_size(page_num, pixmap.size())
+
+        item = self._items.get(page_num)
+        if item is not None:
+            if item.pixmap().size() == pixmap.size():
+                item.setPixmap(pixmap)
+                return item, False
+            self.detach(page_num)
+
+        item = QGraphicsPixmapItem(pixmap, slot)
+        self._items[page_num] = item
+        return item, True
+
+    def detach(self, page_num: int):
+        """페이지 이미지(와 그 자식 아이템)를 떼어 내 메모리를 돌려준다. 자리표시는 남는다."""
+        item = self._items.pop(page_num, None)
+        if item is None:
+            return
+        if self._on_detach is not None:
+            self._on_detach(page_num)
+        if item.scene() is not None:
+            self._scene.removeItem(item)
@@ -28,11 +28,12 @@ class MovableStampItem(QGraphicsPixmapItem):
         self._delete_callback = delete_callback
         self._drag_start_pos = QPointF()
 
+        # QPixmap은 암시적으로 공유되므로 복사하지 않고 같은 픽스맵을 참조한다
         original_pixmap = self.stamp_data.get('original_pixmap')
         if isinstance(original_pixmap, QPixmap) and not original_pixmap.isNull():
-            self._base_pixmap = original_pixmap.copy()
+            self._base_pixmap = original_pixmap
         else:
-            self._base_pixmap = pixmap.copy()
+            self._base_pixmap = pixmap
             self.stamp_data['original_pixmap'] = self._base_pixmap
 
         self._background_applied = bool(self.stamp_data.get('background_applied', False))
@@ -40,6 +41,23 @@ class MovableStampItem(QGraphicsPixmapItem):
         self.setFlag(QGraphicsPixmapItem.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsPixmapItem.GraphicsItemFlag.ItemIsSelectable)
 
+    def sync_with_data(self, page_size: QSizeF):
+        """보관해 둔 아이템을 다시 붙일 때 데이터(위치/크기 비율, 배경 상태)와 페이지 크기에 맞춘다."""
+        self.page_size = page_size
+        pixmap = self.stamp_data.get('pixmap')
+        if isinstance(pixmap, QPixmap) and pixmap.cacheKey() != self.pixmap().cacheKey():
+            self.setPixmap(pixmap)
+        self._background_applied = bool(self.stamp_data.get('background_applied', False))
+        self.setPos(
+            self.stamp_data.get('x_ratio', 0.0) * page_size.width(),
+            self.stamp_data.get('y_ratio', 0.0) * page_size.height(),
+        )
+        # 픽스맵은 스탬프를 찍을 때의 렌더링 배율 픽셀이므로, 배율이 바뀐 페이지에서는 w_ratio에 맞춰 확대/축소한다
+        w_ratio = self.stamp_data.get('w_ratio', 0.0)
+        pixmap_width = self.pixmap().width()
+        if w_ratio > 0 and pixmap_width > 0:
+            self.setScale(w_ratio * page_size.width() / pixmap_width)
+
     def mousePressEvent(self, event):
         """Stores the starting position of the drag."""
         self._drag_start_pos = self.pos()
@@ -56,7 +74,7 @@ class MovableStampItem(QGraphicsPixmapItem):
 
         # Get the bounding rectangles
         parent_rect = parent.boundingRect()
-        item_rect = self.boundingRect()
+        item_rect = self.mapRectToParent(self.boundingRect())  # 배율(setScale)을 반영한 크기
         
         # Current item position in parent coordinates
         current_pos = self.pos()
@@ -125,7 +143,7 @@ class MovableStampItem(QGraphicsPixmapItem):
 
     def _toggle_background(self):
         """Toggle a white background behind the stamp pixmap."""
-        previous_pixmap = self.pixmap().copy()
+        previous_pixmap = self.pixmap()
 
         if not self._background_applied:
             new_pixmap = QPixmap(self._base_pixmap.size())
@@ -142,7 +160,7 @@ class MovableStampItem(QGraphicsPixmapItem):
                 new_state=True,
             )
         else:
-            new_pixmap = self._base_pixmap.copy()
+            new_pixmap = self._base_pixmap
             self._apply_pixmap_change(
                 previous_pixmap=previous_pixmap,
                 new_pixmap=new_pixmap,
@@ -170,9 +188,9 @@ class MovableStampItem(QGraphicsPixmapItem):
             self._history_callback(
                 page_index=self._page_index,
                 stamp_data=self.stamp_data,
-                previous_pixmap=previous_pixmap.copy(),
+                previous_pixmap=previous_pixmap,
                 previous_state=previous_state,
-                new_pixmap=new_pixmap.copy(),
+                new_pixmap=new_pixmap,
                 new_state=new_state,
             )
     
@@ -7,7 +7,7 @@ import pymupdf
 import traceback
 import pandas as pd
 
-from PyQt6.QtCore import Qt, QThreadPool, pyqtSignal, QObject, QTimer
+from PyQt6.QtCore import Qt, QThreadPool, pyqtSignal, QObject, QTimer, QEventLoop
 from PyQt6.QtGui import QAction, QKeySequence
 from PyQt6.QtWidgets import (QApplication, QHBoxLayout, QMainWindow,
                              QMessageBox, QSplitter, QStackedWidget, QWidget, QFileDialog, QStatusBar,
@@ -15,7 +15,12 @@ from PyQt6.QtWidgets import (QApplication, QHBoxLayout, QMainWindow,
 from PyQt6 import uic
 from qt_material import apply_stylesheet
 
-from core.pdf_render import PdfRender
+from core.pdf_render import PdfRender, NORMALIZE_MODE_RASTER, NORMALIZE_MODES
+from core.doc_cache import DocumentCache
+from core.render_profiles import DEFAULT_RENDER_PROFILE, get_render_profile, set_render_profile
+from core.render_bundle import find_render_bundle
+from core.render_server import (set_render_backend, shutdown_render_server, RENDER_BACKENDS,
+                                RENDER_BACKEND_THREAD, DEFAULT_RENDER_PROCESSES, DEFAULT_RENDER_TIMEOUT_SEC)
 from core.pdf_saved import compress_pdf_with_multiple_stages
 from core.sql_manager import claim_subsidy_work, get_original_pdf_path_by_rn
 from core.utility import normalize_basic_info, get_converted_path
@@ -42,6 +47,9 @@ from widgets.notification_info_dialog import NotificationInfoDialog
 class MainWindow(QMainWindow):
     """메인 윈도우"""
 
+    # 여러 파일 병합 로드 진행 상황 (완료 수, 전체 수, 파일 경로)
+    document_load_progress = pyqtSignal(int, int, str)
+
     # --- 초기화 및 설정 ---
     
     def __init__(self):
@@ -50,6 +58,9 @@ class MainWindow(QMainWindow):
         # 1. UI 로드 및 변수 초기화
         self._load_ui_file()
         self._init_variables()
+        self._setup_render_profile()
+        self._setup_document_cache()
+        self._setup_render_backend()
         
         # 2. 위젯 생성 및 타이머 설정
         self._create_widgets()
@@ -73,6 +84,48 @@ class MainWindow(QMainWindow):
         ui_path = Path(__file__).parent.parent / "ui" / "main_window.ui"
         uic.loadUi(str(ui_path), self)
 
+    def _setup_render_profile(self):
+        """설정된 렌더링 품질 프로필(render/profile)을 적용한다. (정규화 DPI, 썸네일 오버샘플링)"""
+        from PyQt6.QtCore import QSettings
+        settings = QSettings("GyeonggooLee", "NewViewer")
+        name = settings.value("render/profile", DEFAULT_RENDER_PROFILE, type=str)
+        profile = set_render_profile(name)
+        PdfRender.target_dpi = profile.normalize_dpi
+        PdfRender.thumbnail_oversampling = profile.thumbnail_oversampling
+        print(f"🎚️ 렌더링 품질 프로필: {profile.label} ({name}) - {profile.describe()}")
+
+        # A4 정규화 방식 (다음에 여는 문서부터 적용)
+        normalize_mode = settings.value("render/normalize_mode", NORMALIZE_MODE_RASTER, type=str)
+        PdfRender.default_normalize_mode = normalize_mode if normalize_mode in NORMALIZE_MODES else NORMALIZE_MODE_RASTER
+        print(f"📐 A4 정규화 방식: {PdfRender.default_normalize_mode}")
+        return profile
+
+    def _setup_document_cache(self):
+        """같은 파일을 다시 열 때 A4 변환/썸네일 생성을 건너뛰도록 정규화 문서 디스크 캐시를 연결한다."""
+        from PyQt6.QtCore import QSettings
+        settings = QSettings("GyeonggooLee", "NewViewer")
+        if not settings.value("cache/doc_cache_enabled", True, type=bool):
+            PdfRender.default_doc_cache = None
+            return
+        profile = get_render_profile()
+        budget_mb = settings.value("cache/doc_cache_mb", profile.doc_cache_mb, type=int)
+        PdfRender.default_doc_cache = DocumentCache(max_bytes=max(budget_mb, 64) * 1024 * 1024,
+                                                    thumbnail_oversampling=profile.thumbnail_oversampling)
+
+    def _setup_render_backend(self):
+        """설정에 따라 페이지 렌더링을 작업 프로세스 풀(render/backend=process)에서 실행하도록 한다."""
+        from PyQt6.QtCore import QSettings
+        settings = QSettings("GyeonggooLee", "NewViewer")
+        backend = settings.value("render/backend", RENDER_BACKEND_THREAD, type=str)
+        processes = settings.value("render/processes", DEFAULT_RENDER_PROCESSES, type=int)
+        timeout = settings.value("render/timeout_sec", DEFAULT_RENDER_TIMEOUT_SEC, type=float)
+        try:
+            set_render_backend(backend if backend in RENDER_BACKENDS else RENDER_BACKEND_THREAD,
+                               processes=processes, timeout=timeout)
+        except Exception as e:
+            print(f"⚠️ 렌더 서버 시작 실패, 스레드 렌더링 사용: {e}")
+            set_render_backend(RENDER_BACKEND_THREAD)
+
     def _init_variables(self):
         """클래스 멤버 변수들을 초기화한다."""
         self.renderer: PdfRender | None = None
@@ -213,6 +266,11 @@ class MainWindow(QMainWindow):
         undo_action.triggered.connect(self._pdf_view_widget.undo_last_action)
         self.menu_edit.addAction(undo_action)
 
+        redo_action = QAction("다시 실행", self)
+        redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        redo_action.triggered.connect(self._pdf_view_widget.redo_last_action)
+        self.menu_edit.addAction(redo_action)
+
         self.menu_edit.addSeparator()
 
         # 지역 관리 액션 (UI 파일에 정의됨)
@@ -231,6 +289,12 @@ class MainWindow(QMainWindow):
         todo_action.triggered.connect(self._todo_widget.toggle_overlay)
         self.menu_view.addAction(todo_action)
         
+        self.continuous_scroll_action = QAction("연속 스크롤 보기", self)
+        self.continuous_scroll_action.setCheckable(True)
+        self.continuous_scroll_action.setChecked(self._pdf_view_widget.is_continuous_scroll())
+        self.continuous_scroll_action.toggled.connect(self._set_continuous_scroll)
+        self.menu_view.addAction(self.continuous_scroll_action)
+
         self.menu_view.addSeparator()
         
         self.worker_progress_action = QAction("현황판", self)
@@ -279,11 +343,13 @@ class MainWindow(QMainWindow):
         self._thumbnail_viewer.page_change_requested.connect(self.change_page)
         self._thumbnail_viewer.page_order_changed.connect(self._update_page_order)
         self._pdf_view_widget.page_change_requested.connect(self.change_page)
+        self._pdf_view_widget.visible_page_changed.connect(self._on_visible_page_changed)
         self._thumbnail_viewer.undo_requested.connect(self._handle_undo_request)
         self._thumbnail_viewer.page_delete_requested.connect(self._handle_page_delete_request)
         self._thumbnail_viewer.page_replace_with_original_requested.connect(self._handle_page_replace_with_original)
         # self._pdf_view_widget.page_aspect_ratio_changed.connect(self.set_splitter_sizes)
         self._pdf_view_widget.save_completed.connect(self._handle_save_completed) # 저장 완료 시그널 연결
+        self.document_load_progress.connect(self._on_document_load_progress)
         self._pdf_view_widget.toolbar.save_pdf_requested.connect(self._save_document)
         self._pdf_view_widget.toolbar.setting_requested.connect(self._open_settings_dialog)
         self._pdf_view_widget.toolbar.email_requested.connect(self._open_special_note_dialog)
@@ -477,6 +543,8 @@ class MainWindow(QMainWindow):
         if self._settings_dialog.exec():
             # 사용자가 OK를 누르면 변경된 단축키를 다시 적용
             self._apply_shortcuts()
+            # 렌더링 품질 프로필: 화면 배율/캐시는 바로, 정규화 DPI는 다음에 여는 문서부터 적용
+            self._pdf_view_widget.apply_render_profile(self._setup_render_profile())
     
     def _open_config_dialog(self):
         """환경설정 다이얼로그를 연다."""
@@ -562,6 +630,12 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "알림", "AI 결과 데이터가 없습니다.")
 
     # === 문서 생명주기 관리 ===
+    def _on_document_load_progress(self, done: int, total: int, path: str):
+        """파일 병합 진행 상황을 상태바에 표시한다."""
+        self.statusBar.showMessage(f"문서 불러오는 중... ({done}/{total}) {Path(path).name}", 3000)
+        # 로딩이 UI 스레드에서 동기적으로 진행되므로 상태바만 갱신되도록 (사용자 입력 제외) 이벤트 처리
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+
     def load_document(self, pdf_paths: list, is_preprocessed: bool = False, metadata: dict = None):
         """PDF 및 이미지 문서를 로드하고 뷰를 전환한다."""
         if not pdf_paths:
@@ -578,17 +652,21 @@ class MainWindow(QMainWindow):
         if self.renderer:
             self.renderer.close()
 
+        bundle = None
         try:
             self.renderer = PdfRender()
+            # 수집 서비스가 미리 만들어 둔 렌더링 번들이 있으면 변환/썸네일 생성 없이 바로 연다
+            bundle = find_render_bundle(pdf_paths, self.renderer.normalize_mode, PdfRender.target_dpi)
+            if bundle is not None:
+                print(f"📦 렌더링 번들 사용: {bundle.bundle_dir.name}")
+                self.renderer.load_preprocessed_pdf(bundle.pdf_path, thumbnails=bundle.thumbnails())
+                self.renderer.pdf_path = pdf_paths[0]
             # 고속 로딩: 전처리된 단일 파일
-            if is_preprocessed and len(pdf_paths) == 1:
+            elif is_preprocessed and len(pdf_paths) == 1:
                 self.renderer.load_preprocessed_pdf(pdf_paths[0])
-            # 일반 로딩: A4 변환 및 병합 필요한 파일들
+            # 일반 로딩: A4 변환 및 병합 필요한 파일들 (한 번에 병합 후 1회 직렬화)
             else:
-                # 첫 번째 파일이든 여러 파일이든 append_file을 통해 순차적으로 처리
-                # (append_file 내부에 초기 로드 로직이 포함되어 있거나, 첫 호출 시 처리됨)
-                for path in pdf_paths:
-                    self.renderer.append_file(path)
+                self.renderer.load_many(pdf_paths, progress_callback=self.document_load_progress.emit)
                 
         except Exception as e:
             QMessageBox.critical(self, "오류", f"문서를 여는 데 실패했습니다: {e}")
@@ -604,6 +682,11 @@ class MainWindow(QMainWindow):
         # 썸네일 생성 시 회전 정보 전달
         self._thumbnail_viewer.set_renderer(self.renderer, self._page_order, rotations=self._pdf_view_widget.get_page_rotations()) 
         self._pdf_view_widget.set_renderer(self.renderer) # PDF 뷰어 사전 작업(준비 작업, 밑에서 펼침)
+        if bundle is not None:
+            # 첫 페이지는 번들의 미리 렌더링된 이미지로 즉시 표시
+            preview = bundle.first_page_preview()
+            if preview is not None:
+                self._pdf_view_widget.preload_page_image(0, *preview)
 
         # PDF 편집 모드를 위한 필요한 영역 활성화/필요 없는 영역 숨기기
         self._pdf_load_widget.hide()
@@ -1057,7 +1140,7 @@ class MainWindow(QMainWindow):
             old_page_count = self.renderer.get_page_count()
             
             # 파일 병합
-            self.renderer.append_file(file_path)
+            self.renderer.load_many([file_path], progress_callback=self.document_load_progress.emit)
             
             # 페이지 순서 업데이트 (기존 순서 유지 + 새 페이지 추가)
             self._page_order.extend(range(old_page_count, self.renderer.get_page_count()))
@@ -1229,6 +1312,7 @@ class MainWindow(QMainWindow):
             # '보이는' 순서를 '실제' 페이지 번호로 변환
             actual_page_num = self._page_order[visual_page_num]
             
+            self._pdf_view_widget.set_page_order(self._page_order)
             self._pdf_view_widget.show_page(actual_page_num)
             self._thumbnail_viewer.set_current_page(visual_page_num)
             self._update_page_navigation()
@@ -1242,8 +1326,25 @@ class MainWindow(QMainWindow):
     def _update_page_order(self, new_order: list[int]):
         """페이지 순서가 변경되면 호출되는 슬롯"""
         self._page_order = new_order
+        self._pdf_view_widget.set_page_order(new_order)
         print(f"MainWindow가 새 페이지 순서를 받음: {self._page_order}")
 
+    def _on_visible_page_changed(self, actual_page_num: int):
+        """연속 스크롤로 뷰어의 현재 페이지가 바뀌면 썸네일과 네비게이션만 맞춘다. (뷰는 이동하지 않음)"""
+        if actual_page_num not in self._page_order:
+            return
+        self.current_page = self._page_order.index(actual_page_num)
+        self._thumbnail_viewer.set_current_page(self.current_page)
+        self._update_page_navigation()
+
+    def _set_continuous_scroll(self, enabled: bool):
+        """연속 스크롤 보기를 켜거나 끄고 설정에 저장한다."""
+        from PyQt6.QtCore import QSettings
+        settings = QSettings("GyeonggooLee", "NewViewer")
+        settings.setValue("view/continuous_scroll", enabled)
+        self._pdf_view_widget.set_page_order(self._page_order)
+        self._pdf_view_widget.set_continuous_scroll(enabled)
+
     def _update_page_navigation(self):
         """페이지 네비게이션 상태(라벨, 버튼 활성화)를 업데이트한다."""
         total_pages = len(self._page_order)
@@ -1452,6 +1553,9 @@ class MainWindow(QMainWindow):
         
         if self.renderer:
             self.renderer.close()
+        if PdfRender.default_doc_cache is not None:
+            PdfRender.default_doc_cache.flush()  # 모아 둔 캐시 색인(적중/실패 횟수 등) 저장
+        shutdown_render_server()
         event.accept()
 
     # === 사용자 상호작용 핸들러 ===
@@ -1804,7 +1908,7 @@ class MainWindow(QMainWindow):
 
             old_page_count = self.renderer.get_page_count()
             
-            self.renderer.append_file(found_file_path)
+            self.renderer.load_many([found_file_path], progress_callback=self.document_load_progress.emit)
             
             # 페이지 순서 업데이트 (기존 순서 유지 + 새 페이지 추가)
             self._page_order.extend(range(old_page_count, self.renderer.get_page_count()))
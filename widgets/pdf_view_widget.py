@@ -1,17 +1,23 @@
+import itertools
 from pathlib import Path
 
 from PyQt6 import uic
-from PyQt6.QtCore import (QObject, QRunnable, Qt, QThreadPool, pyqtSignal, QPointF, QSizeF, QRectF, QEvent)
+from PyQt6.QtCore import (QObject, QRunnable, Qt, QThreadPool, pyqtSignal, QPointF, QSizeF, QRectF, QEvent, QSettings, QSize, QTimer)
 from PyQt6.QtGui import QImage, QPainter, QPixmap, QFont, QFontMetrics, QPen, QColor, QBrush
 from PyQt6.QtWidgets import (QApplication, QFileDialog, QGraphicsPixmapItem,
                                  QGraphicsScene, QGraphicsView, QMessageBox,
                                  QWidget, QGraphicsItem, QMenu, QGraphicsRectItem)
 
 import pymupdf
-from core.workers import PdfRenderWorker, PdfSaveWorker
+from core.workers import PdfRenderWorker, PdfSaveWorker, TileRenderWorker
 from core.edit_mixin import ViewModeMixin, EditMixin
 from core.insert_utils import add_stamp_item
 from core.pdf_render import PdfRender
+from core.page_cache import PageCache
+from core.render_profiles import RenderProfile, get_render_profile
+from core.undo_journal import UndoJournal, DEFAULT_UNDO_JOURNAL_MB
+from core.render_scheduler import RenderScheduler, PRIORITY_CURRENT, PRIORITY_PREFETCH, PRIORITY_TILE
+from core.tile_renderer import TileRenderer
 from core.pdf_saved import compress_pdf_with_multiple_stages, export_deleted_pages
 from core.utility import get_converted_path
 from .crop_dialog import CropDialog
@@ -20,6 +26,13 @@ from .stamp_overlay_widget import StampOverlayWidget
 from .zoomable_graphics_view import ZoomableGraphicsView
 from .custom_item import MovableStampItem
 from .mail_content_overlay import MailContentOverlay
+from .continuous_page_layout import ContinuousPageLayout, PAGE_SPACING, PREFETCH_SCREENS
+from .stamp_layers import StampLayers
+
+# 확대 타일 작업의 스케줄러 id (페이지 렌더링 작업 id는 페이지 번호)
+TILE_JOB_ID = "tile"
+# 스탬프 너비(_stamp_desired_width)의 기준 렌더링 배율. 실제 픽셀 너비는 render_zoom에 비례한다
+STAMP_REFERENCE_ZOOM = 2.0
 
 class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
     """PDF 뷰어 위젯"""
@@ -33,6 +46,7 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
     pdf_loaded = pyqtSignal(str, float, int)  # file_path, file_size_mb, total_pages
     page_info_updated = pyqtSignal(int, float, float, int)  # page_num, width, height, rotation
     thumbnail_updated = pyqtSignal(int)  # page_num: 썸네일 업데이트가 필요한 페이지 번호
+    visible_page_changed = pyqtSignal(int)  # 연속 스크롤로 현재 페이지가 바뀜 ('실제' 페이지 번호)
 
     def __init__(self):
         super().__init__()
@@ -45,9 +59,11 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
 
         # --- 페이지 별 오버레이 아이템 "데이터" 관리 ---
         self._overlay_items: dict[int, list[dict]] = {}
+        # --- 페이지 별로 유지되는 스탬프 아이템 (페이지를 다시 표시할 때 부모만 바꿔 재사용) ---
+        self._stamp_layers = StampLayers(self.scene, self._create_stamp_item)
         
-        # --- 되돌리기(Undo)를 위한 작업 기록 ---
-        self._history_stack: list[tuple] = []
+        # --- 되돌리기(Undo)/다시 실행(Redo)을 위한 작업 기록 (페이지 델타, 메모리 예산 있음) ---
+        self._history = UndoJournal(self._load_undo_journal_budget())
 
         # --- 오버레이 위젯 ---
         self.stamp_overlay = None
@@ -55,7 +71,9 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         # --- 스탬프 모드 ---
         self._is_stamp_mode = False
         self._stamp_pixmap: QPixmap | None = None
-        self._stamp_desired_width: int = 110
+        self._stamp_desired_width: int = 110  # STAMP_REFERENCE_ZOOM 배율 기준 픽셀 (-1이면 원본 크기)
+        # 같은 도장을 여러 번 찍으면 축소한 픽스맵을 공유한다 {(원본 cacheKey, 너비): 픽스맵}
+        self._scaled_stamp_cache: dict[tuple[int, int], QPixmap] = {}
 
         # --- 가리개(Mask) 모드 ---
         self._is_mask_mode = False
@@ -63,12 +81,42 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         self._mask_rect_item: QGraphicsRectItem | None = None
         
         # --- 비동기 처리 및 캐싱 설정 ---
-        self.thread_pool = QThreadPool.globalInstance()
-        self.page_cache = {}  # 페이지 캐시: {page_num: QPixmap}
-        self.rendering_jobs = set()  # 현재 렌더링 중인 페이지 번호
+        self.thread_pool = QThreadPool.globalInstance()  # 저장 등 일반 작업용
+        self.render_scheduler = RenderScheduler(parent=self)  # 페이지 렌더링 전용 (우선순위/취소 지원)
+        self.render_zoom = get_render_profile().view_zoom  # 페이지 렌더링 배율 (렌더링 품질 프로필)
+        # 페이지 인덱스 체계가 바뀔 때(새 문서, 페이지 삭제) 증가하는 캐시 세대
+        self._cache_generation = 0
+        self.page_cache = PageCache(self._load_page_cache_budget())  # 메모리 예산이 있는 LRU 페이지 캐시
+        # 렌더링 중인 페이지: {page_num: (캐시 키, 작업 토큰)}
+        # 자르기/되돌리기는 캐시 키를 바꾸지 않으므로 작업마다 새 토큰을 붙여 편집 전 작업의 결과를 가려낸다
+        self.rendering_jobs: dict[int, tuple[tuple, int]] = {}
+        self._render_job_tokens = itertools.count(1)
+        self._preview_page: int | None = None  # 저해상도 미리보기를 표시 중인 페이지
+
+        # --- 확대 시 보이는 영역만 선명하게 다시 그리는 타일 ---
+        self.tile_renderer = TileRenderer()
+        self._tile_items: dict[tuple, QGraphicsPixmapItem] = {}
+        self._wanted_tiles: set[tuple] = set()  # 마지막으로 요청한 화면의 타일 키
+        self._tile_worker: TileRenderWorker | None = None
+        self._tile_timer = QTimer(self)
+        self._tile_timer.setSingleShot(True)
+        self._tile_timer.setInterval(120)  # 휠/스크롤이 멈춘 뒤 렌더링
+        self._tile_timer.timeout.connect(self._update_zoom_tiles)
         self.current_page = -1
         self.page_rotations = {}  # 페이지별 사용자 회전 각도 저장 {page_num: rotation}
 
+        # --- 연속 스크롤 보기 (화면 근처 페이지에만 이미지를 붙이는 가상화 배치) ---
+        self._continuous_scroll = self._load_continuous_scroll()
+        self._continuous_layout = ContinuousPageLayout(self.scene, on_detach=self._stamp_layers.detach)
+        self._continuous_wanted: set[int] = set()  # 이미지를 붙여 둘 페이지 (보이는 영역 + 여유)
+        self._continuous_needs_fit = True  # 배치를 새로 만든 뒤 첫 페이지 표시 때 배율 맞춤
+        self._page_order: list[int] | None = None  # 연속 보기에서 쌓을 순서 (None이면 문서 순서)
+        self._jump_scroll_value: int | None = None  # show_page가 스크롤한 위치 (사용자가 스크롤하기 전까지 현재 페이지 유지)
+        self._continuous_timer = QTimer(self)
+        self._continuous_timer.setSingleShot(True)
+        self._continuous_timer.setInterval(50)  # 스크롤이 잠시 멈추면 보이는 페이지 갱신
+        self._continuous_timer.timeout.connect(self._update_continuous_pages)
+
         self.init_ui()
 
         # --- 툴바 추가 ---
@@ -182,9 +230,98 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         
         return pixmap
 
+    @staticmethod
+    def _load_page_cache_budget() -> int:
+        """설정에 저장된 페이지 캐시 메모리 예산(byte)을 불러온다. (없으면 렌더링 품질 프로필의 값)"""
+        settings = QSettings("GyeonggooLee", "NewViewer")
+        budget_mb = settings.value("cache/page_cache_mb", get_render_profile().page_cache_mb, type=int)
+        return max(budget_mb, 16) * 1024 * 1024
+
+    @staticmethod
+    def _load_undo_journal_budget() -> int:
+        """설정에 저장된 되돌리기 기록 메모리 예산(byte)을 불러온다."""
+        settings = QSettings("GyeonggooLee", "NewViewer")
+        budget_mb = settings.value("history/undo_journal_mb", DEFAULT_UNDO_JOURNAL_MB, type=int)
+        return max(budget_mb, 8) * 1024 * 1024
+
+    @staticmethod
+    def _load_continuous_scroll() -> bool:
+        """설정에 저장된 연속 스크롤 보기 사용 여부를 불러온다."""
+        settings = QSettings("GyeonggooLee", "NewViewer")
+        return settings.value("view/continuous_scroll", False, type=bool)
+
+    def _page_cache_key(self, page_num: int) -> tuple:
+        """현재 상태(캐시 세대, 회전, 배율) 기준 페이지 캐시 키"""
+        return PageCache.make_key(
+            self._cache_generation, page_num, self.page_rotations.get(page_num, 0), self.render_zoom
+        )
+
+    def _cached_pixmap(self, page_num: int) -> QPixmap | None:
+        """현재 상태에 맞는 페이지 캐시를 반환한다. 없으면 None."""
+        return self.page_cache.get(self._page_cache_key(page_num))
+
+    def invalidate_page_cache(self, page_nums: list[int] | None = None):
+        """페이지 캐시를 무효화한다.
+
+        Args:
+            page_nums: 지정하면 해당 페이지만 제거, None이면 세대를 올리고 전체 제거
+                       (진행 중인 렌더링 결과도 이전 세대로 간주되어 버려진다)
+        """
+        if page_nums is None:
+            self._cache_generation += 1
+            self.page_cache.clear()
+            # 페이지 번호가 바뀌었을 수 있으므로 보관한 스탬프 아이템도 버린다 (데이터에서 다시 만든다)
+            self._stamp_layers.clear()
+            self.rendering_jobs.clear()
+            self.render_scheduler.cancel_all()
+        else:
+            self.page_cache.invalidate_pages(page_nums)
+            for page_num in page_nums:
+                self._drop_render_job(page_num)
+
+        if self._continuous_scroll:
+            if page_nums is None:
+                # 페이지 번호 체계가 바뀌었을 수 있으므로 배치를 버리고 다음 show_page에서 다시 만든다
+                self._clear_tile_items()
+                self._stamp_layers.clear()
+                self._continuous_layout.clear()
+            else:
+                for page_num in page_nums:
+                    self._continuous_layout.detach(page_num)
+            self.current_page_item = self._continuous_layout.item(self.current_page)
+            self._continuous_timer.start()
+
+    def apply_render_profile(self, profile: RenderProfile):
+        """렌더링 품질 프로필의 렌더링 배율과 캐시 예산을 적용하고 현재 페이지를 다시 그린다."""
+        self.page_cache.set_max_bytes(self._load_page_cache_budget())
+        if round(profile.view_zoom, 3) == round(self.render_zoom, 3):
+            return
+        self.render_zoom = profile.view_zoom
+        # 이전 배율로 렌더링한 페이지는 다시 쓰이지 않으므로 비운다
+        self.invalidate_page_cache()
+        self.tile_renderer.clear()
+        if self.current_page >= 0:
+            self.show_page(self.current_page)
+
+    def get_page_cache_stats(self) -> dict:
+        """페이지 캐시 적중/실패/제거 통계를 반환한다."""
+        return self.page_cache.stats()
+
+    def preload_page_image(self, page_num: int, image: QImage, zoom: float) -> bool:
+        """미리 렌더링된 페이지 이미지(렌더링 번들 등)를 페이지 캐시에 넣는다.
+
+        현재 렌더링 배율과 같고 회전이 없는 페이지만 받는다. 넣었으면 True.
+        """
+        if image.isNull() or round(zoom, 3) != round(self.render_zoom, 3):
+            return False
+        if self.page_rotations.get(page_num, 0):
+            return False
+        self.page_cache.put(self._page_cache_key(page_num), QPixmap.fromImage(image))
+        return True
+
     def _open_crop_dialog(self):
         """자르기 다이얼로그를 연다."""
-        if self.current_page < 0 or not self.renderer or not self.renderer.get_pdf_bytes():
+        if self.current_page < 0 or not self.renderer or not self.renderer.has_document():
             QMessageBox.warning(self, "알림", "자르기할 페이지가 선택되지 않았습니다.")
             return
 
@@ -203,22 +340,24 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
             
             # 3. 화면을 다시 그려서 스탬프가 삭제된 것을 반영
             # 현재 캐시된 페이지를 다시 로드하여 화면을 갱신
-            if self.current_page in self.page_cache:
-                self._display_pixmap(self.page_cache[self.current_page])
+            cached_pixmap = self._cached_pixmap(self.current_page)
+            if cached_pixmap is not None:
+                self._display_pixmap(cached_pixmap)
                 QApplication.processEvents() # 화면 업데이트를 즉시 반영
 
 
         # 다이얼로그에 표시할 선명한 미리보기용 이미지를 새로 렌더링한다.
-        pdf_bytes = self.renderer.get_pdf_bytes()
+        pdf_source = self.renderer.get_render_source()
         page_num = self.current_page
         user_rotation = self.page_rotations.get(page_num, 0)
         
-        # zoom_factor=2.0 (약 200DPI)로 선명한 이미지를 생성
+        # 뷰어와 같은 렌더링 배율(render_zoom)로 선명한 이미지를 생성
         preview_pixmap = PdfRender.render_page_thread_safe(
-            pdf_bytes,
+            pdf_source,
             page_num,
-            zoom_factor=2.0,
-            user_rotation=user_rotation
+            zoom_factor=self.render_zoom,
+            user_rotation=user_rotation,
+            doc_key=self.renderer.get_generation()
         )
         
         dialog = CropDialog(self)
@@ -277,13 +416,7 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
             return
             
         try:
-            # --- 되돌리기를 위해 자르기 전 PDF 데이터(bytes) 저장 ---
-            before_crop_bytes = bytes(self.renderer.get_pdf_bytes())
-            self._history_stack.append((
-                'crop_pages',
-                -1,  # 대표 페이지는 쓰지 않음
-                {'pages': list(page_nums), 'bytes': before_crop_bytes}
-            ))
+            page_nums = sorted(set(page_nums))
 
             # 정규화된 QRectF를 튜플로 변환
             crop_tuple = (
@@ -306,18 +439,28 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
                 
                 if reply == QMessageBox.StandardButton.No:
                     return
-                
-                # 스탬프 삭제
-                for page_num in pages_with_stamps:
-                    del self._overlay_items[page_num]
-            
+
+            # --- 되돌리기를 위해 자르기 전 대상 페이지만 떼어 둔다 (문서 전체 스냅샷 대신) ---
+            before_pages = self.renderer.extract_pages(page_nums)
+
+            # 스탬프 삭제 (되돌리기 시 복원할 수 있도록 보관)
+            removed_stamps = {page_num: self._overlay_items.pop(page_num) for page_num in pages_with_stamps}
+
             # 자르기 적용
             self.renderer.apply_crop_to_pages(page_nums, crop_tuple)
-            
-            # --- 중요 ---
-            # 자르기가 적용되면 PDF 데이터 자체가 변경되므로, 기존의 모든 페이지 캐시는 무효화됩니다.
-            # 캐시를 비워서 모든 페이지(현재 페이지 포함)를 새로운 데이터로 다시 렌더링하도록 강제합니다.
-            self.page_cache.clear()
+
+            # 다시 실행을 위해 자른 뒤의 대상 페이지도 떼어 둔다
+            after_pages = self.renderer.extract_pages(page_nums)
+            self._history.record(
+                'crop_pages',
+                -1,  # 대표 페이지는 쓰지 않음
+                {'pages': page_nums, 'before': before_pages, 'after': after_pages, 'stamps': removed_stamps},
+                pages=page_nums,
+                nbytes=len(before_pages) + len(after_pages),
+            )
+
+            # 자르기는 대상 페이지만 제자리 교체하므로 해당 페이지 캐시만 무효화한다.
+            self.invalidate_page_cache(page_nums)
             
             # 현재 페이지가 자른 페이지 중 하나라면 다시 렌더링
             if self.current_page in page_nums:
@@ -347,15 +490,16 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
 
     def apply_default_crop_to_current_page_sync(self):
         """(공개 메소드, 동기식) 현재 페이지에 기본 자르기를 적용하고 렌더링이 끝날 때까지 기다린다."""
-        if self.current_page < 0 or not self.renderer or not self.renderer.get_pdf_bytes():
+        if self.current_page < 0 or not self.renderer or not self.renderer.has_document():
             return
         
         # 1. 기본 자르기 영역 계산 (다이얼로그를 직접 사용하되 보여주지 않음)
-        pdf_bytes = self.renderer.get_pdf_bytes()
+        pdf_source = self.renderer.get_render_source()
         page_num = self.current_page
         user_rotation = self.page_rotations.get(page_num, 0)
         preview_pixmap = PdfRender.render_page_thread_safe(
-            pdf_bytes, page_num, zoom_factor=2.0, user_rotation=user_rotation
+            pdf_source, page_num, zoom_factor=self.render_zoom, user_rotation=user_rotation,
+            doc_key=self.renderer.get_generation()
         )
         
         temp_dialog = CropDialog(self)
@@ -423,6 +567,121 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         # 이벤트 필터 설치 (마우스 이벤트를 가로채기 위함)
         view.viewport().installEventFilter(self)
 
+        # 확대/스크롤 시 보이는 영역의 타일 갱신 예약
+        if isinstance(view, ZoomableGraphicsView):
+            view.zoom_changed.connect(lambda _scale: self._tile_timer.start())
+        view.horizontalScrollBar().valueChanged.connect(lambda _value: self._tile_timer.start())
+        view.verticalScrollBar().valueChanged.connect(lambda _value: self._tile_timer.start())
+        # 연속 보기: 스크롤/확대 후 보이는 페이지 갱신 예약
+        if isinstance(view, ZoomableGraphicsView):
+            view.zoom_changed.connect(lambda _scale: self._schedule_continuous_update())
+        view.verticalScrollBar().valueChanged.connect(lambda _value: self._schedule_continuous_update())
+
+    def _clear_tile_items(self):
+        """현재 페이지 위에 올린 타일 아이템을 제거하고 진행 중인 타일 작업을 멈춘다."""
+        self._drop_tile_job()
+        self._wanted_tiles = set()
+        for item in self._tile_items.values():
+            if item.scene() is not None:
+                item.scene().removeItem(item)
+        self._tile_items.clear()
+
+    def _drop_tile_job(self):
+        """타일 작업을 취소한다. 이미 실행 중이면 남은 타일을 건너뛰게 한다."""
+        if self._tile_worker is not None:
+            self._tile_worker.cancelled = True
+            self._tile_worker = None
+        self.render_scheduler.cancel(TILE_JOB_ID)
+        self.render_scheduler.finish(TILE_JOB_ID)
+
+    def _update_zoom_tiles(self):
+        """뷰 배율이 렌더링 배율보다 크면 화면에 보이는 영역을 실제 배율의 타일로 덮는다.
+
+        캐시에 있는 타일은 바로 올리고, 없는 타일은 렌더링 스케줄러에 맡겨 완료되는 대로 올린다.
+        """
+        if (not self.renderer or self.renderer.doc is None or self.current_page_item is None
+                or self._preview_page is not None or self.current_page < 0):
+            self._clear_tile_items()
+            return
+
+        view = self.pdf_graphics_view
+        effective_zoom = self.render_zoom * view.transform().m11() * view.devicePixelRatioF()
+        tile_zoom = TileRenderer.tile_zoom_for(effective_zoom, self.render_zoom)
+        if tile_zoom is None:
+            self._clear_tile_items()
+            return
+
+        # 타일 픽셀 → 페이지 아이템(render_zoom 픽셀) 좌표 비율
+        tile_scale = self.render_zoom / tile_zoom
+        visible = self.current_page_item.mapRectFromScene(
+            view.mapToScene(view.viewport().rect()).boundingRect()
+        )
+        visible_device_rect = (
+            visible.left() / tile_scale, visible.top() / tile_scale,
+            visible.right() / tile_scale, visible.bottom() / tile_scale,
+        )
+
+        try:
+            tiles, missing = self.tile_renderer.lookup_tiles(
+                self.renderer.doc.load_page(self.current_page).rect, self.renderer.get_generation(),
+                self.current_page, self.page_rotations.get(self.current_page, 0), tile_zoom, visible_device_rect
+            )
+        except Exception as e:
+            print(f"타일 렌더링 오류: {e}")
+            self._clear_tile_items()
+            return
+
+        self._wanted_tiles = set(tiles) | set(missing)
+        for key in [k for k in self._tile_items if k not in self._wanted_tiles]:
+            item = self._tile_items.pop(key)
+            if item.scene() is not None:
+                item.scene().removeItem(item)
+
+        for key, entry in tiles.items():
+            self._attach_tile(key, entry)
+
+        # 이전 화면의 타일 작업은 버리고 지금 보이는 빠진 타일만 요청한다
+        self._drop_tile_job()
+        if missing:
+            self._start_tile_job(missing)
+
+    def _start_tile_job(self, tile_keys: list[tuple]):
+        """빠진 타일들을 미리 렌더링보다 높은 우선순위로 렌더링 스케줄러에 제출한다."""
+        pdf_source = self.renderer.get_render_source()
+        if not pdf_source:
+            return
+        worker = TileRenderWorker(pdf_source, self.current_page, tile_keys, doc_key=self.renderer.get_generation())
+        worker.signals.tile_finished.connect(self._on_tile_rendered)
+        worker.signals.error.connect(lambda _page, error_msg: print(f"타일 렌더링 오류: {error_msg}"))
+        if self.render_scheduler.submit(TILE_JOB_ID, worker, PRIORITY_TILE):
+            self._tile_worker = worker
+
+    def _on_tile_rendered(self, key: tuple, image: QImage, device_x: int, device_y: int):
+        """타일 하나가 렌더링되었을 때 호출된다. 현재 문서 세대면 캐시에 넣고, 아직 보이는 타일이면 올린다."""
+        if not self.renderer or key[0] != self.renderer.get_generation():
+            return
+        entry = (QPixmap.fromImage(image), device_x, device_y)
+        self.tile_renderer.put(key, entry)
+        if key in self._wanted_tiles:
+            self._attach_tile(key, entry)
+
+    def _attach_tile(self, key: tuple, entry: tuple[QPixmap, int, int]):
+        """타일을 현재 페이지 아이템 위에 올린다."""
+        _, page_num, rotation, tile_zoom, _, _ = key
+        if (key in self._tile_items or self.current_page_item is None or self._preview_page is not None
+                or page_num != self.current_page or rotation != self.page_rotations.get(page_num, 0)):
+            return
+        pixmap, device_x, device_y = entry
+        tile_scale = self.render_zoom / tile_zoom
+        # 페이지 아이템의 자식으로 두어 스탬프(z=0)보다 아래, 기본 이미지보다 위에 그린다
+        item = QGraphicsPixmapItem(pixmap, self.current_page_item)
+        item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        item.setScale(tile_scale)
+        item.setPos(device_x * tile_scale, device_y * tile_scale)
+        item.setZValue(-1)
+        item.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self._tile_items[key] = item
+
     def eventFilter(self, source, event):
         """뷰포트 이벤트를 필터링하여 스탬프/가리개 모드를 처리한다."""
         if hasattr(self, 'pdf_graphics_view') and source == self.pdf_graphics_view.viewport():
@@ -441,6 +700,8 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
     def _handle_mouse_press(self, event):
         """마우스 클릭 이벤트를 처리한다 (스탬프 모드, 가리개 모드)."""
         if event.button() == Qt.MouseButton.LeftButton:
+            # 연속 보기에서는 클릭한 페이지가 스탬프/가리개 대상이 된다
+            self._focus_continuous_page_at(event.pos())
             if self._is_stamp_mode:
                 if self.current_page_item:
                     # 뷰포트 좌표를 씬 좌표로 변환
@@ -540,11 +801,18 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
 
         # --- Begin integrated logic from core.insert_utils ---
         
-        # 1. Scale pixmap if needed
+        # 1. Scale pixmap if needed (페이지 대비 크기가 렌더링 배율과 무관하도록 render_zoom에 비례)
         if self._stamp_desired_width > 0:
-            scaled_pixmap = self._stamp_pixmap.scaledToWidth(
-                self._stamp_desired_width, Qt.TransformationMode.SmoothTransformation
-            )
+            stamp_width = max(1, round(self._stamp_desired_width * self.render_zoom / STAMP_REFERENCE_ZOOM))
+            cache_key = (self._stamp_pixmap.cacheKey(), stamp_width)
+            scaled_pixmap = self._scaled_stamp_cache.get(cache_key)
+            if scaled_pixmap is None:
+                if len(self._scaled_stamp_cache) >= 16:
+                    self._scaled_stamp_cache.clear()
+                scaled_pixmap = self._stamp_pixmap.scaledToWidth(
+                    stamp_width, Qt.TransformationMode.SmoothTransformation
+                )
+                self._scaled_stamp_cache[cache_key] = scaled_pixmap
         else:
             scaled_pixmap = self._stamp_pixmap
 
@@ -574,7 +842,7 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
 
         # --- End integrated logic ---
 
-        page_pixmap = self.page_cache.get(self.current_page)
+        page_pixmap = self._cached_pixmap(self.current_page)
         if page_pixmap:
             page_width = page_pixmap.width()
             page_height = page_pixmap.height()
@@ -594,7 +862,7 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
                 'y_ratio': final_pos.y() / page_height,
                 'w_ratio': scaled_pixmap.width() / page_width,
                 'h_ratio': scaled_pixmap.height() / page_height,
-                'original_pixmap': scaled_pixmap.copy(),
+                'original_pixmap': scaled_pixmap,  # 암시적 공유 (배경 토글 시 새 픽스맵을 만든다)
                 'background_applied': False,
             }
 
@@ -602,20 +870,11 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
                 self._overlay_items[self.current_page] = []
             self._overlay_items[self.current_page].append(stamp_data)
 
-            # Create our custom item and add it to the scene
-            page_size = QSizeF(page_width, page_height)
-            stamp_item = MovableStampItem(
-                scaled_pixmap,
-                self.current_page_item,
-                stamp_data,
-                page_size,
-                page_index=self.current_page,
-                history_callback=self._on_stamp_background_toggled,
-                delete_callback=self._on_stamp_delete_requested,
-            )
+            # Create our custom item and add it to the scene (페이지 스탬프 층에 보관)
+            stamp_item = self._stamp_layers.create(self.current_page, self.current_page_item, stamp_data)
             stamp_item.setPos(final_pos)
 
-            self._history_stack.append(('add_stamp', self.current_page, None))
+            self._history.record('add_stamp', self.current_page, None)
             print(f"페이지 {self.current_page + 1}에 스탬프 추가 및 이동 가능: {stamp_item.pos()}")
 
     def resizeEvent(self, event):
@@ -629,11 +888,17 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
             self.stamp_overlay.setGeometry(0, 0, self.width(), self.height())
         if self.mail_overlay and self.mail_overlay.isVisible():
             self.mail_overlay.show_overlay(self.size())
+        self._schedule_continuous_update()
     
     def keyPressEvent(self, event):
-        """키보드 'Q', 'E' 또는 화살표 위/아래를 눌러 페이지를 변경하고, Ctrl+Z로 되돌리기를 실행한다."""
-        if event.key() == Qt.Key.Key_Z and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
+        """키보드 'Q', 'E' 또는 화살표 위/아래를 눌러 페이지를 변경하고, Ctrl+Z로 되돌리기, Ctrl+Y(Ctrl+Shift+Z)로 다시 실행을 한다."""
+        ctrl = Qt.KeyboardModifier.ControlModifier
+        ctrl_shift = Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier
+        if event.key() == Qt.Key.Key_Z and event.modifiers() == ctrl:
             self._undo_last_action()
+        elif (event.key() == Qt.Key.Key_Y and event.modifiers() == ctrl) or \
+                (event.key() == Qt.Key.Key_Z and event.modifiers() == ctrl_shift):
+            self._redo_last_action()
         elif event.key() == Qt.Key.Key_Delete:
             self._prompt_delete_current_page()
         elif event.key() == Qt.Key.Key_Q or event.key() == Qt.Key.Key_Up:
@@ -730,7 +995,7 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         """PDF 저장 프로세스를 시작한다."""
         print(f"[save_pdf 호출] is_give_works={is_give_works}, rn={rn}, skip_confirmation={skip_confirmation}")
         try:
-            if not self.renderer or not self.renderer.get_pdf_bytes():
+            if not self.renderer or not self.renderer.has_document():
                 QMessageBox.warning(self, "저장 오류", "저장할 PDF 파일이 없습니다.")
                 self.save_completed.emit()  # 저장 실패 시에도 정리 작업 수행
                 return
@@ -899,16 +1164,19 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         self.pdf_path = renderer.pdf_path if renderer else None
 
         # 기존 상태 초기화
+        self._tile_items.clear()
+        self.tile_renderer.clear()
+        self._stamp_layers.clear()
+        self._continuous_layout.clear()
         self.scene.clear()
         self.current_page_item = None
-        self.page_cache.clear() # 이전 PDF 파일 정보를 잊어버리기
-        self.rendering_jobs.clear()
+        self.invalidate_page_cache() # 이전 PDF 파일 정보를 잊어버리기
         self.current_page = -1 # 지금 보고 있는 페이지 없음 (존재하지 않는 페이지 번호로 -1로 설정)
         
         # 새로운 PDF를 로드할 때만 오버레이 아이템과 히스토리 초기화
         if renderer is not None and clear_overlay:
             self._overlay_items.clear()
-            self._history_stack.clear()
+            self._history.clear()
             self.page_rotations.clear()  # 회전 정보도 초기화
         elif renderer is None:
             # renderer가 None일 때도 회전 정보 초기화 (메인 화면으로 돌아갈 때)
@@ -934,12 +1202,32 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
 
     def show_page(self, page_num: int):
         """지정된 페이지를 뷰에 표시한다. 캐시를 확인하고, 없으면 백그라운드 렌더링을 시작한다."""
-        if not self.renderer or not self.renderer.get_pdf_bytes() or page_num < 0 or page_num >= self.renderer.get_page_count():
+        if not self.renderer or not self.renderer.has_document() or page_num < 0 or page_num >= self.renderer.get_page_count():
             return
 
+        previous_page = self.current_page
         self.current_page = page_num
-        
-        # --- 페이지 정보 시그널 발생 ---
+        self.render_scheduler.note_navigation(page_num)
+        self._emit_page_info(page_num)
+
+        if self._continuous_scroll:
+            self._show_page_continuous(page_num, previous_page)
+            return
+
+        pixmap = self._cached_pixmap(page_num)
+        if pixmap is not None:
+            # 캐시에 있으면 바로 표시
+            self._display_pixmap(pixmap)
+        else:
+            # 캐시에 없으면 로딩 메시지 표시 후 렌더링 시작
+            self._show_loading_message()
+            self._start_render_job(page_num)
+
+        # 인접 페이지 미리 렌더링
+        self._pre_render_adjacent_pages(page_num)
+
+    def _emit_page_info(self, page_num: int):
+        """정보 패널에 페이지 크기/회전 정보를 보낸다."""
         try:
             page = self.renderer.doc.load_page(page_num)
             rect = page.rect
@@ -949,94 +1237,321 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
             # 오류 발생 시 기본값으로 전송
             self.page_info_updated.emit(page_num, 0, 0, 0)
 
+    # === 연속 스크롤 보기 ===
 
-        if page_num in self.page_cache:
-            # 캐시에 있으면 바로 표시
-            pixmap = self.page_cache[page_num]
+    def is_continuous_scroll(self) -> bool:
+        """연속 스크롤 보기 사용 여부"""
+        return self._continuous_scroll
+
+    def set_continuous_scroll(self, enabled: bool):
+        """연속 스크롤 보기를 켜거나 끈다. 보고 있던 페이지는 유지한다."""
+        if enabled == self._continuous_scroll:
+            return
+        self._continuous_scroll = enabled
+        self._continuous_timer.stop()
+        self._clear_tile_items()
+        self._stamp_layers.detach_all()
+        self._continuous_layout.clear()
+        self.scene.clear()
+        self.current_page_item = None
+        self._preview_page = None
+        self._jump_scroll_value = None
+        self._continuous_needs_fit = True
+        print(f"연속 스크롤 보기: {'켜짐' if enabled else '꺼짐'}")
+        if self.current_page >= 0:
+            self.show_page(self.current_page)
+
+    def set_page_order(self, page_order: list[int]):
+        """연속 보기에서 페이지를 쌓을 순서('보이는' 순서의 실제 페이지 번호)를 지정한다."""
+        page_order = list(page_order)
+        if page_order == self._page_order:
+            return
+        self._page_order = page_order
+        if len(self._continuous_layout):
+            # 순서가 바뀌면 다음 show_page에서 배치를 다시 만든다
+            self._clear_tile_items()
+            self._continuous_layout.clear()
+            self.current_page_item = None
+
+    def _build_continuous_layout(self):
+        """모든 페이지의 자리표시를 예상 렌더링 크기로 만든다. (이미지는 아직 없음)"""
+        page_count = self.renderer.get_page_count()
+        order = self._page_order
+        if order is None or len(order) != page_count or set(order) != set(range(page_count)):
+            order = list(range(page_count))
+        self._continuous_layout.build([(page_num, self._expected_page_size(page_num)) for page_num in order])
+        self._continuous_wanted = set()
+        self._continuous_needs_fit = True
+
+    def _show_page_continuous(self, page_num: int, previous_page: int):
+        """연속 보기의 show_page: 페이지 위치로 스크롤하고 화면 근처 페이지의 이미지를 준비한다."""
+        if not len(self._continuous_layout):
+            self._build_continuous_layout()
+
+        if page_num == previous_page and self._continuous_layout.item(page_num) is not None:
+            # 같은 페이지 새로고침(되돌리기 등): 스크롤은 그대로 두고 스탬프 아이템까지 다시 만든다
+            self._clear_tile_items()
+            self._continuous_layout.detach(page_num)
+        else:
+            self._scroll_to_continuous_page(page_num)
+
+        self._preview_page = None
+        pixmap = self._cached_pixmap(page_num)
+        if pixmap is not None:
             self._display_pixmap(pixmap)
         else:
-            # 캐시에 없으면 로딩 메시지 표시 후 렌더링 시작
-            self._show_loading_message()
+            self._clear_tile_items()
+            self.current_page_item = self._continuous_layout.item(page_num)
             self._start_render_job(page_num)
+        self._update_continuous_pages()
 
-        # 인접 페이지 미리 렌더링
-        self._pre_render_adjacent_pages(page_num)
+    def _scroll_to_continuous_page(self, page_num: int):
+        """페이지 윗부분이 화면 위쪽에 오도록 스크롤한다."""
+        view = self.pdf_graphics_view
+        page_rect = self._continuous_layout.page_rect(page_num)
+        if page_rect.isEmpty():
+            return
+        visible_height = view.mapToScene(view.viewport().rect()).boundingRect().height()
+        view.centerOn(page_rect.center().x(), page_rect.top() - PAGE_SPACING / 2 + visible_height / 2)
+        self._jump_scroll_value = view.verticalScrollBar().value()
+
+    def _schedule_continuous_update(self):
+        """연속 보기일 때 보이는 페이지 갱신을 예약한다."""
+        if self._continuous_scroll:
+            self._continuous_timer.start()
+
+    def _update_continuous_pages(self):
+        """연속 보기: 화면 근처 페이지에 이미지를 붙이고(캐시에 없으면 렌더링 요청) 멀어진 페이지의 이미지는 뗀다."""
+        if (not self._continuous_scroll or not self.renderer or not self.renderer.has_document()
+                or not len(self._continuous_layout)):
+            return
 
-    def _start_render_job(self, page_num: int):
-        """지정된 페이지의 백그라운드 렌더링 작업을 시작한다."""
-        pdf_bytes = self.renderer.get_pdf_bytes()
-        if (not self.renderer or not pdf_bytes or
+        view = self.pdf_graphics_view
+        visible_rect = view.mapToScene(view.viewport().rect()).boundingRect()
+        margin = visible_rect.height() * PREFETCH_SCREENS
+        visible = self._continuous_layout.pages_between(visible_rect.top(), visible_rect.bottom())
+        nearby = self._continuous_layout.pages_between(visible_rect.top() - margin, visible_rect.bottom() + margin)
+
+        # 사용자가 스크롤했으면 가장 많이 보이는 페이지를 현재 페이지로 삼는다
+        if view.verticalScrollBar().value() != self._jump_scroll_value:
+            self._jump_scroll_value = None
+            page_num = self._continuous_layout.most_visible_page(visible_rect)
+            if page_num is not None and page_num != self.current_page:
+                self._set_continuous_current_page(page_num)
+
+        keep = set(nearby) | {self.current_page}
+        self._continuous_wanted = keep
+        for page_num in self._continuous_layout.attached_pages():
+            if page_num not in keep:
+                self._continuous_layout.detach(page_num)  # 화면에서 멀어진 페이지 이미지 해제
+        for cancelled_page in self.render_scheduler.cancel_where(lambda job_id: job_id != TILE_JOB_ID and job_id not in keep):
+            self.rendering_jobs.pop(cancelled_page, None)
+
+        # 보이는 페이지부터 요청한다 (현재 페이지만 점진적 미리보기를 받는다)
+        for page_num in visible + [p for p in nearby if p not in visible]:
+            pixmap = self._cached_pixmap(page_num)
+            if pixmap is None:
+                priority = PRIORITY_CURRENT if page_num == self.current_page else PRIORITY_PREFETCH
+                self._start_render_job(page_num, priority)
+                continue
+            item = self._continuous_layout.item(page_num)
+            if item is None or item.pixmap().cacheKey() != pixmap.cacheKey():
+                self._attach_continuous_page(page_num, pixmap)
+        self.current_page_item = self._continuous_layout.item(self.current_page)
+
+    def _set_continuous_current_page(self, page_num: int):
+        """스크롤/클릭으로 바뀐 현재 페이지를 반영한다. (스크롤 위치는 건드리지 않음)"""
+        self._clear_tile_items()
+        self._preview_page = None
+        self.current_page = page_num
+        self.current_page_item = self._continuous_layout.item(page_num)
+        self.render_scheduler.note_navigation(page_num)
+        self._emit_page_info(page_num)
+        self.visible_page_changed.emit(page_num)
+        self._tile_timer.start()
+
+    def _focus_continuous_page_at(self, view_pos):
+        """연속 보기에서 뷰포트 좌표 아래의 페이지를 현재 페이지로 삼는다."""
+        if not self._continuous_scroll:
+            return
+        page_num = self._continuous_layout.page_at(self.pdf_graphics_view.mapToScene(view_pos))
+        if (page_num is not None and page_num != self.current_page
+                and self._continuous_layout.item(page_num) is not None):
+            self._set_continuous_current_page(page_num)
+
+    def _attach_continuous_page(self, page_num: int, pixmap: QPixmap) -> QGraphicsPixmapItem | None:
+        """연속 보기의 페이지 자리표시에 이미지를 붙이고, 새로 만든 아이템이면 스탬프 층도 올린다."""
+        item, created = self._continuous_layout.attach(page_num, pixmap)
+        if created:
+            self._attach_stamp_layer(item, page_num)
+        return item
+
+    def _refresh_continuous_page(self, page_num: int):
+        """연속 보기에서 현재 페이지가 아닌 페이지를 다시 그린다. (스탬프 되돌리기 등)"""
+        if self._continuous_scroll and self._continuous_layout.item(page_num) is not None:
+            self._continuous_layout.detach(page_num)
+            self._continuous_timer.start()
+
+    def _drop_render_job(self, page_num: int):
+        """페이지의 렌더링 작업 추적을 끝낸다. 아직 시작 전이면 큐에서 취소한다.
+        (이미 실행 중인 작업의 결과는 작업 토큰이 맞지 않아 버려진다)"""
+        self.rendering_jobs.pop(page_num, None)
+        self.render_scheduler.cancel(page_num)
+        self.render_scheduler.finish(page_num)
+
+    def _start_render_job(self, page_num: int, priority: int = PRIORITY_CURRENT):
+        """지정된 페이지의 백그라운드 렌더링 작업을 시작한다.
+
+        같은 페이지가 더 낮은 우선순위로 대기 중이면 우선순위를 올려 다시 제출한다.
+        """
+        pdf_source = self.renderer.get_render_source() if self.renderer else None
+        if (not self.renderer or not pdf_source or
                 page_num < 0 or page_num >= self.renderer.get_page_count()):
             return
-        if page_num in self.page_cache or page_num in self.rendering_jobs:
+        cache_key = self._page_cache_key(page_num)
+        if cache_key in self.page_cache:
             return
+        if page_num in self.rendering_jobs and self.rendering_jobs[page_num][0] != cache_key:
+            # 회전 등으로 키가 바뀐 이전 작업은 정리
+            self._drop_render_job(page_num)
 
-        self.rendering_jobs.add(page_num)
         # 현재 회전 각도를 워커에 전달
         user_rotation = self.page_rotations.get(page_num, 0)
-        worker = PdfRenderWorker(pdf_bytes, page_num, zoom_factor=2.0, user_rotation=user_rotation)
-        worker.signals.finished.connect(self._on_page_rendered)
-        worker.signals.error.connect(self._on_render_error)
-        self.thread_pool.start(worker)
+        # 현재 페이지는 저해상도 미리보기를 먼저 받아 로딩 대기 시간을 줄인다
+        worker = PdfRenderWorker(pdf_source, page_num, zoom_factor=self.render_zoom, user_rotation=user_rotation,
+                                 doc_key=self.renderer.get_generation(),
+                                 progressive=(priority == PRIORITY_CURRENT))
+        # 요청 시점의 캐시 키와 작업 토큰을 함께 넘겨, 그 사이 추적이 끝난 작업이면 결과를 버린다
+        job = (cache_key, next(self._render_job_tokens))
+        worker.signals.finished.connect(
+            lambda rendered_page, pixmap, job=job: self._on_page_rendered(rendered_page, pixmap, job)
+        )
+        worker.signals.preview.connect(
+            lambda preview_page, preview, job=job: self._on_page_preview(preview_page, preview, job)
+        )
+        worker.signals.error.connect(
+            lambda failed_page, error_msg, job=job: self._on_render_error(failed_page, error_msg, job)
+        )
+        if self.render_scheduler.submit(page_num, worker, priority):
+            self.rendering_jobs[page_num] = job
 
-    def _on_page_rendered(self, page_num: int, pixmap: QPixmap):
+    def _on_page_rendered(self, page_num: int, pixmap: QPixmap, job: tuple[tuple, int] | None = None):
         """페이지 렌더링이 완료되었을 때 호출된다."""
-        self.page_cache[page_num] = pixmap
-        if page_num in self.rendering_jobs:
-            self.rendering_jobs.remove(page_num)
+        # 렌더링 도중 무효화(문서 교체, 자르기, 되돌리기, 회전 등)되어 추적이 끝난 작업의 결과는 버린다
+        if job is None or self.rendering_jobs.get(page_num) != job:
+            return
+        cache_key = job[0]
+        del self.rendering_jobs[page_num]
+        self.render_scheduler.finish(page_num)
+
+        self.page_cache.put(cache_key, pixmap)
 
         if page_num == self.current_page:
-            self._display_pixmap(pixmap)
+            if (self._preview_page == page_num and self.current_page_item is not None
+                    and self.current_page_item.pixmap().size() == pixmap.size()):
+                # 미리보기를 최종 해상도로 교체 (자식 스탬프 아이템 위치와 뷰 배율은 그대로 유지)
+                self.current_page_item.setPixmap(pixmap)
+                self._preview_page = None
+                self._tile_timer.start()  # 미리보기 동안 미뤄둔 확대 타일 갱신
+            else:
+                self._display_pixmap(pixmap)
+        elif self._continuous_scroll and page_num in self._continuous_wanted:
+            self._attach_continuous_page(page_num, pixmap)
+
+    def _expected_page_size(self, page_num: int) -> QSize:
+        """render_zoom으로 렌더링했을 때의 최종 픽셀 크기 (사용자 회전 반영)"""
+        rect = self.renderer.doc.load_page(page_num).rect * pymupdf.Matrix(self.render_zoom, self.render_zoom)
+        irect = rect.irect
+        if self.page_rotations.get(page_num, 0) in (90, 270):
+            return QSize(irect.height, irect.width)
+        return QSize(irect.width, irect.height)
+
+    def _on_page_preview(self, page_num: int, preview: QPixmap, job: tuple[tuple, int]):
+        """점진적 렌더링의 저해상도 1차 결과를 로딩 메시지 대신 표시한다."""
+        if (page_num != self.current_page or self.current_page_item is not None
+                or self.rendering_jobs.get(page_num) != job):
+            return  # 이미 최종 결과가 표시되었거나 다른 페이지로 이동함
+
+        # 최종 해상도와 같은 크기로 늘려 표시해야 스탬프 위치(x_ratio/y_ratio)와 뷰 배율이 교체 후에도 유지된다
+        pixmap = preview.scaled(
+            self._expected_page_size(page_num),
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        self._display_pixmap(pixmap)
+        self._preview_page = page_num
 
-    def _on_render_error(self, page_num: int, error_msg: str):
+    def _on_render_error(self, page_num: int, error_msg: str, job: tuple[tuple, int] | None = None):
         """페이지 렌더링 중 오류 발생 시 호출된다."""
-        if page_num in self.rendering_jobs:
-            self.rendering_jobs.remove(page_num)
+        if job is not None and self.rendering_jobs.get(page_num) != job:
+            return  # 이미 정리된 오래된 작업
+        self.rendering_jobs.pop(page_num, None)
+        self.render_scheduler.finish(page_num)
 
         if page_num == self.current_page:
-            self.scene.clear()
+            if not self._continuous_scroll:  # 연속 보기에서는 자리표시를 그대로 둔다
+                self._tile_items.clear()
+                self._stamp_layers.detach_all()
+                self.scene.clear()
             QMessageBox.warning(self, "렌더링 오류", f"페이지 {page_num + 1}을(를) 표시하는 중 오류 발생: {error_msg}")
 
     def _display_pixmap(self, pixmap: QPixmap):
         """주어진 QPixmap을 씬에 표시한다."""
+        self._preview_page = None
+        if self._continuous_scroll:
+            # 연속 보기: 씬을 비우지 않고 현재 페이지 자리표시에 붙인다 (배율은 처음 한 번만 맞춤)
+            self._clear_tile_items()
+            self.current_page_item = self._attach_continuous_page(self.current_page, pixmap)
+            self._emit_page_aspect_ratio(pixmap)
+            if self._continuous_needs_fit and self.current_page_item is not None:
+                self._continuous_needs_fit = False
+                self.set_fit_to_page()
+                self._scroll_to_continuous_page(self.current_page)
+            self._tile_timer.start()
+            return
+
+        self._tile_items.clear()  # scene.clear()가 타일 아이템도 함께 삭제
+        self._stamp_layers.detach_all()  # 스탬프 아이템은 지우지 않고 보관
         self.scene.clear()
         self.current_page_item = self.scene.addPixmap(pixmap)
-        
-        # A4 세로 기준으로 페이지 비율을 평가
+        self._emit_page_aspect_ratio(pixmap)
+
+        # A4 세로 기준 통일된 뷰 적용
+        self.set_fit_to_page()
+        self._tile_timer.start()
+
+        self._attach_stamp_layer(self.current_page_item, self.current_page)
+
+    def _emit_page_aspect_ratio(self, pixmap: QPixmap):
+        """A4 세로 기준으로 페이지 비율을 평가하여 알린다."""
         # A4 세로 비율: 21:29.7 ≈ 1:1.414
         a4_portrait_ratio = 29.7 / 21.0
         page_ratio = pixmap.height() / pixmap.width()
-        
+
         # 페이지가 A4 세로보다 가로가 상대적으로 긴지 판단
         is_landscape = page_ratio < a4_portrait_ratio
         self.page_aspect_ratio_changed.emit(is_landscape)
 
-        # A4 세로 기준 통일된 뷰 적용
-        self.set_fit_to_page()
-
-        if self.current_page in self._overlay_items:
-            page_width = pixmap.width()
-            page_height = pixmap.height()
-            
-            for stamp_data in self._overlay_items[self.current_page]:
-                stamp_pixmap = stamp_data['pixmap']
-                
-                # QGraphicsPixmapItem 대신 MovableStampItem 사용
-                page_size = QSizeF(pixmap.width(), pixmap.height())
-                stamp_item = MovableStampItem(
-                    stamp_pixmap,
-                    self.current_page_item,
-                    stamp_data,
-                    page_size,
-                    page_index=self.current_page,
-                    history_callback=self._on_stamp_background_toggled,
-                    delete_callback=self._on_stamp_delete_requested,
-                )
-                
-                # 저장된 비율을 기반으로 위치 설정
-                pos_x = stamp_data.get('x_ratio', 0.0) * page_width
-                pos_y = stamp_data.get('y_ratio', 0.0) * page_height
-                stamp_item.setPos(pos_x, pos_y)
+    def _attach_stamp_layer(self, page_item: QGraphicsPixmapItem, page_num: int):
+        """페이지 아이템 위에 그 페이지의 스탬프 층을 올린다. (보관된 아이템은 재사용)"""
+        self._stamp_layers.attach(page_num, page_item, self._overlay_items.get(page_num, []))
+
+    def _create_stamp_item(self, stamp_data: dict, page_item: QGraphicsPixmapItem, page_size: QSizeF,
+                           page_num: int) -> MovableStampItem:
+        """스탬프 데이터로 MovableStampItem을 만들고 저장된 비율로 위치를 잡는다."""
+        stamp_item = MovableStampItem(
+            stamp_data['pixmap'],
+            page_item,
+            stamp_data,
+            page_size,
+            page_index=page_num,
+            history_callback=self._on_stamp_background_toggled,
+            delete_callback=self._on_stamp_delete_requested,
+        )
+        
+        # 저장된 비율을 기반으로 위치와 크기 설정 (렌더링 배율이 바뀐 페이지에서도 같은 크기)
+        stamp_item.sync_with_data(page_size)
+        return stamp_item
 
     def _on_stamp_background_toggled(
         self,
@@ -1052,20 +1567,18 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         stamp_data['pixmap'] = new_pixmap
         stamp_data['background_applied'] = new_state
         if 'original_pixmap' not in stamp_data:
-            stamp_data['original_pixmap'] = previous_pixmap.copy()
-
-        self._history_stack.append(
-            (
-                'stamp_background',
-                page_index,
-                {
-                    'stamp_data': stamp_data,
-                    'previous_pixmap': previous_pixmap,
-                    'previous_state': previous_state,
-                    'new_pixmap': new_pixmap,
-                    'new_state': new_state,
-                },
-            )
+            stamp_data['original_pixmap'] = previous_pixmap
+
+        self._history.record(
+            'stamp_background',
+            page_index,
+            {
+                'stamp_data': stamp_data,
+                'previous_pixmap': previous_pixmap,
+                'previous_state': previous_state,
+                'new_pixmap': new_pixmap,
+                'new_state': new_state,
+            },
         )
     
     def _on_stamp_delete_requested(self, page_index: int, stamp_data: dict, stamp_item):
@@ -1079,88 +1592,66 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
             except ValueError:
                 print(f"경고: 페이지 {page_index + 1}에서 삭제할 스탬프 데이터를 찾을 수 없습니다.")
         
-        # 2. scene에서 아이템 제거
+        # 2. scene과 페이지 스탬프 층에서 아이템 제거
         scene = stamp_item.scene()
         if scene:
             scene.removeItem(stamp_item)
+        self._stamp_layers.forget(page_index, stamp_data)
         
         # 3. 히스토리에 기록 (되돌리기 지원)
-        # stamp_data의 복사본을 저장 (원본 pixmap 포함)
+        # stamp_data의 복사본을 저장 (픽스맵은 암시적 공유로 참조만 보관)
         stamp_data_copy = {
-            'pixmap': stamp_data.get('pixmap').copy() if stamp_data.get('pixmap') else None,
+            'pixmap': stamp_data.get('pixmap'),
             'x_ratio': stamp_data.get('x_ratio', 0.0),
             'y_ratio': stamp_data.get('y_ratio', 0.0),
             'w_ratio': stamp_data.get('w_ratio', 0.0),
             'h_ratio': stamp_data.get('h_ratio', 0.0),
-            'original_pixmap': stamp_data.get('original_pixmap').copy() if stamp_data.get('original_pixmap') else None,
+            'original_pixmap': stamp_data.get('original_pixmap'),
             'background_applied': stamp_data.get('background_applied', False),
         }
         
-        self._history_stack.append(
-            ('delete_stamp', page_index, stamp_data_copy)
-        )
+        self._history.record('delete_stamp', page_index, stamp_data_copy)
         
         print(f"페이지 {page_index + 1}의 스탬프를 삭제했습니다.")
 
     def _undo_last_action(self):
         """마지막으로 수행한 작업을 되돌린다."""
-        if not self._history_stack:
+        entry = self._history.undo()
+        if entry is None:
             print("되돌릴 작업이 없습니다.")
             return
 
-        action, page_num, data = self._history_stack.pop()
+        action, page_num, data = entry.action, entry.page_num, entry.data
 
         if action == 'add_stamp':
             if page_num in self._overlay_items and self._overlay_items[page_num]:
-                self._overlay_items[page_num].pop()
+                # 다시 실행할 수 있도록 제거한 스탬프를 기록에 보관
+                data = self._overlay_items[page_num].pop()
+                entry.data = data
                 print(f"페이지 {page_num + 1}의 마지막 스탬프를 제거했습니다.")
         
         elif action == 'rotate_page':
-            old_rotation = data
+            old_rotation = data['old']
             self.page_rotations[page_num] = old_rotation
             self.page_rotation_changed.emit(page_num, old_rotation)
-            # 캐시 제거해서 새로 렌더링하도록 함
-            if page_num in self.page_cache:
-                del self.page_cache[page_num]
+            # 회전 각도가 캐시 키에 포함되므로 이전 회전의 캐시가 있으면 그대로 재사용된다
             print(f"페이지 {page_num + 1}의 회전을 되돌렸습니다.")
 
-        elif action in ('crop_page', 'crop_pages'):
-            pages = []
-            if action == 'crop_pages' and isinstance(data, dict):
-                before_bytes = data.get('bytes')
-                pages = data.get('pages', [])
-            else:
-                # 과거 호환: ('crop_page', page_num, bytes)
-                before_bytes = data
-                if page_num >= 0:
-                    pages = [page_num]
-
-            if before_bytes:
-                self.renderer.set_pdf_bytes(before_bytes)
-                self.page_cache.clear()
-                print(
-                    "여러 페이지 자르기를 되돌렸습니다."
-                    if len(pages) != 1 else f"페이지 {pages[0] + 1}의 자르기를 되돌렸습니다."
-                )
-
-            # 현재 페이지가 영향받은 페이지였다면 화면 갱신
-            if not pages or self.current_page in pages:
+        elif action == 'crop_pages':
+            pages = data['pages']
+            self._restore_page_delta(pages, data['before'])
+            # 자르기로 지워졌던 스탬프 복원
+            for stamp_page, items in data.get('stamps', {}).items():
+                self._overlay_items.setdefault(stamp_page, []).extend(items)
+            print(
+                "여러 페이지 자르기를 되돌렸습니다."
+                if len(pages) != 1 else f"페이지 {pages[0] + 1}의 자르기를 되돌렸습니다."
+            )
+            if self.current_page in pages:
                 self.show_page(self.current_page)
 
         elif action == 'stamp_background':
-            info = data or {}
-            stamp_data = info.get('stamp_data')
-            previous_pixmap = info.get('previous_pixmap')
-            previous_state = info.get('previous_state')
-
-            if stamp_data and previous_pixmap is not None:
-                stamp_data['pixmap'] = previous_pixmap
-                stamp_data['background_applied'] = bool(previous_state)
-                if 'original_pixmap' not in stamp_data:
-                    stamp_data['original_pixmap'] = previous_pixmap.copy()
-
-                if page_num == self.current_page:
-                    self.show_page(self.current_page)
+            self._apply_stamp_background_state(page_num, data, previous=True)
         
         elif action == 'delete_stamp':
             # 삭제된 스탬프를 복원한다
@@ -1173,22 +1664,114 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         # 현재 보고 있는 페이지의 작업을 되돌렸다면, 화면을 새로고침
         if page_num == self.current_page:
             self.show_page(self.current_page)
+        else:
+            self._refresh_continuous_page(page_num)
+
+    def _redo_last_action(self):
+        """마지막으로 되돌린 작업을 다시 실행한다."""
+        entry = self._history.redo()
+        if entry is None:
+            print("다시 실행할 작업이 없습니다.")
+            return
+
+        action, page_num, data = entry.action, entry.page_num, entry.data
+
+        if action == 'add_stamp':
+            if data:
+                self._overlay_items.setdefault(page_num, []).append(data)
+                print(f"페이지 {page_num + 1}에 스탬프를 다시 추가했습니다.")
+
+        elif action == 'rotate_page':
+            new_rotation = data['new']
+            self.page_rotations[page_num] = new_rotation
+            self.page_rotation_changed.emit(page_num, new_rotation)
+            print(f"페이지 {page_num + 1}의 회전을 다시 적용했습니다.")
+
+        elif action == 'crop_pages':
+            pages = data['pages']
+            for stamp_page in data.get('stamps', {}):
+                self._overlay_items.pop(stamp_page, None)
+            self._restore_page_delta(pages, data['after'])
+            print(f"{len(pages)}개 페이지 자르기를 다시 적용했습니다.")
+            if self.current_page in pages:
+                self.show_page(self.current_page)
+
+        elif action == 'stamp_background':
+            self._apply_stamp_background_state(page_num, data, previous=False)
+
+        elif action == 'delete_stamp':
+            # 복원했던 스탬프를 다시 삭제한다 (복원 시 추가된 같은 객체를 찾는다)
+            items = self._overlay_items.get(page_num, [])
+            if data in items:
+                items.remove(data)
+                print(f"페이지 {page_num + 1}의 스탬프를 다시 삭제했습니다.")
+
+        if page_num == self.current_page:
+            self.show_page(self.current_page)
+        else:
+            self._refresh_continuous_page(page_num)
+
+    def _restore_page_delta(self, pages: list[int], pages_pdf_bytes: bytes) -> None:
+        """기록된 페이지 델타로 해당 페이지만 교체하고, 그 페이지의 캐시와 썸네일만 갱신한다."""
+        self.renderer.restore_pages(pages, pages_pdf_bytes)
+        self.invalidate_page_cache(pages)
+        for page in pages:
+            self.thumbnail_updated.emit(page)
+
+    def _apply_stamp_background_state(self, page_num: int, data: dict, previous: bool) -> None:
+        """스탬프 배경 토글 기록의 이전(previous=True) 또는 새 상태를 스탬프에 적용한다."""
+        info = data or {}
+        stamp_data = info.get('stamp_data')
+        pixmap = info.get('previous_pixmap' if previous else 'new_pixmap')
+        state = info.get('previous_state' if previous else 'new_state')
+
+        if stamp_data and pixmap is not None:
+            stamp_data['pixmap'] = pixmap
+            stamp_data['background_applied'] = bool(state)
+            if 'original_pixmap' not in stamp_data:
+                stamp_data['original_pixmap'] = info.get('previous_pixmap')
 
     def undo_last_action(self):
         """공개 메서드: 마지막 작업을 되돌린다."""
         self._undo_last_action()
 
+    def redo_last_action(self):
+        """공개 메서드: 마지막으로 되돌린 작업을 다시 실행한다."""
+        self._redo_last_action()
+
     def _show_loading_message(self):
         """로딩 중 메시지를 표시한다."""
+        if self._continuous_scroll:
+            # 연속 보기: 자리표시가 로딩 표시를 대신한다 (회전으로 크기가 바뀌면 자리표시도 맞춘다)
+            self._clear_tile_items()
+            self._continuous_layout.detach(self.current_page)
+            self._continuous_layout.set_page_size(self.current_page, self._expected_page_size(self.current_page))
+            self.current_page_item = None
+            self._preview_page = None
+            return
+        self._tile_items.clear()
+        self._stamp_layers.detach_all()
         self.scene.clear()
         self.current_page_item = None
+        self._preview_page = None
         # 나중에 더 예쁜 스피너 등으로 교체 가능
         self.scene.addText(f"페이지 {self.current_page + 1} 로딩 중...")
 
     def _pre_render_adjacent_pages(self, page_num: int):
-        """현재 페이지의 이전/다음 페이지를 미리 렌더링한다."""
-        self._start_render_job(page_num + 1)
-        self._start_render_job(page_num - 1)
+        """현재 페이지 주변을 미리 렌더링한다.
+
+        페이지를 빠르게 넘길수록 진행 방향으로 범위를 넓히고,
+        범위를 벗어난 대기 작업은 취소하여 현재 페이지가 먼저 렌더링되게 한다.
+        """
+        wanted_pages = self.render_scheduler.prefetch_pages(page_num, self.renderer.get_page_count())
+        keep = set(wanted_pages) | {page_num}
+
+        cancelled = self.render_scheduler.cancel_where(lambda job_id: job_id != TILE_JOB_ID and job_id not in keep)
+        for cancelled_page in cancelled:
+            self.rendering_jobs.pop(cancelled_page, None)
+
+        for prefetch_page in wanted_pages:
+            self._start_render_job(prefetch_page, PRIORITY_PREFETCH)
 
     def rotate_current_page_by_90_sync(self):
         """(공개 메소드, 동기식) 현재 페이지를 90도 회전시키고 렌더링이 끝날 때까지 기다린다."""
@@ -1201,23 +1784,20 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         self.page_rotations[self.current_page] = new_user_rotation
         self.page_rotation_changed.emit(self.current_page, new_user_rotation)
         
-        # 2. 캐시 제거
-        if self.current_page in self.page_cache:
-            del self.page_cache[self.current_page]
-
-        # 3. 동기 렌더링
+        # 2. 동기 렌더링 (회전 각도가 캐시 키에 포함되므로 별도 캐시 제거 불필요)
         try:
-            pdf_bytes = self.renderer.get_pdf_bytes()
-            if not pdf_bytes:
+            pdf_source = self.renderer.get_render_source()
+            if not pdf_source:
                 raise Exception("PDF 바이트 데이터를 가져올 수 없습니다.")
             
             # 비동기 워커의 로직을 그대로 가져와서 동기적으로 실행
             pixmap = PdfRender.render_page_thread_safe(
-                pdf_bytes, self.current_page, zoom_factor=2.0, user_rotation=new_user_rotation
+                pdf_source, self.current_page, zoom_factor=self.render_zoom, user_rotation=new_user_rotation,
+                doc_key=self.renderer.get_generation()
             )
             
-            # 4. 캐시에 저장하고 즉시 표시
-            self.page_cache[self.current_page] = pixmap
+            # 3. 캐시에 저장하고 즉시 표시
+            self.page_cache.put(self._page_cache_key(self.current_page), pixmap)
             self._display_pixmap(pixmap)
             
             # Qt 이벤트 루프가 화면을 업데이트할 시간을 줌
@@ -1241,15 +1821,19 @@ class PdfViewWidget(QWidget, ViewModeMixin, EditMixin):
         self.page_rotations[self.current_page] = new_user_rotation
         self.page_rotation_changed.emit(self.current_page, new_user_rotation)
 
-        # 되돌리기를 위해 이전 회전 값 저장
-        self._history_stack.append(('rotate_page', self.current_page, current_user_rotation))
+        # 되돌리기/다시 실행을 위해 이전/새 회전 값 저장
+        self._history.record(
+            'rotate_page', self.current_page, {'old': current_user_rotation, 'new': new_user_rotation}
+        )
         
         # 현재 페이지를 다시 렌더링 (회전 적용)
         if self.current_page >= 0:
-            # 캐시에서 제거하여 새로 렌더링하도록 함
-            if self.current_page in self.page_cache:
-                del self.page_cache[self.current_page]
-            
+            # 회전 각도가 캐시 키에 포함되므로 이미 렌더링된 각도면 바로 표시
+            pixmap = self._cached_pixmap(self.current_page)
+            if pixmap is not None:
+                self._display_pixmap(pixmap)
+                return
+
             self._show_loading_message()
             self._start_render_job(self.current_page)
 
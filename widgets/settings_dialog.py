@@ -5,6 +5,10 @@ from PyQt6.QtWidgets import QDialog
 from PyQt6.QtCore import QSettings
 from PyQt6.QtGui import QKeySequence
 
+from core.render_profiles import (RENDER_PROFILE_AUTO, RENDER_PROFILE_CHOICES, DEFAULT_RENDER_PROFILE,
+                                  resolve_render_profile)
+from core.pdf_render import NORMALIZE_MODE_CHOICES, NORMALIZE_MODE_RASTER
+
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -12,6 +16,12 @@ class SettingsDialog(QDialog):
         uic.loadUi(str(ui_path), self)
         
         self.settings = QSettings("GyeonggooLee", "NewViewer")
+
+        for name, label in RENDER_PROFILE_CHOICES:
+            self.comboBox_render_profile.addItem(label, name)
+        self.comboBox_render_profile.currentIndexChanged.connect(self._update_render_profile_info)
+        for name, label in NORMALIZE_MODE_CHOICES:
+            self.comboBox_normalize_mode.addItem(label, name)
         
         self._load_settings()
         
@@ -40,6 +50,28 @@ class SettingsDialog(QDialog):
         self.keySequenceEdit_insert_7.setKeySequence(QKeySequence(self.settings.value("shortcuts/unused_6", "")))
         self.keySequenceEdit_insert_8.setKeySequence(QKeySequence(self.settings.value("shortcuts/unused_7", "")))
 
+        # 렌더링 품질 프로필
+        profile_name = self.settings.value("render/profile", DEFAULT_RENDER_PROFILE, type=str)
+        index = self.comboBox_render_profile.findData(profile_name)
+        self.comboBox_render_profile.setCurrentIndex(index if index >= 0 else 0)
+        self._update_render_profile_info()
+
+        # A4 정규화 방식
+        normalize_mode = self.settings.value("render/normalize_mode", NORMALIZE_MODE_RASTER, type=str)
+        index = self.comboBox_normalize_mode.findData(normalize_mode)
+        self.comboBox_normalize_mode.setCurrentIndex(index if index >= 0 else 0)
+
+    def _update_render_profile_info(self):
+        """선택한 렌더링 품질 프로필의 실제 값을 안내 문구로 보여준다."""
+        name = self.comboBox_render_profile.currentData()
+        if name is None:
+            return
+        profile = resolve_render_profile(name)
+        text = profile.describe()
+        if name == RENDER_PROFILE_AUTO:
+            text = f"이 PC에서는 '{profile.label}' 기준 (정규화 DPI는 고정): {text}"
+        self.label_render_profile_info.setText(text + "\n(정규화 DPI와 A4 변환 방식은 다음에 여는 문서부터 적용)")
+
 
     def _save_settings(self):
         """UI에 설정된 단축키를 저장합니다."""
@@ -58,6 +90,9 @@ class SettingsDialog(QDialog):
         self.settings.setValue("shortcuts/unused_6", self.keySequenceEdit_insert_7.keySequence().toString())
         self.settings.setValue("shortcuts/unused_7", self.keySequenceEdit_insert_8.keySequence().toString())
 
+        self.settings.setValue("render/profile", self.comboBox_render_profile.currentData())
+        self.settings.setValue("render/normalize_mode", self.comboBox_normalize_mode.currentData())
+
     def get_shortcuts(self):
         """외부에서 단축키를 가져갈 수 있도록 사전을 반환합니다."""
         # 이 메서드는 나중에 QAction에 단축키를 적용할 때 필요합니다.
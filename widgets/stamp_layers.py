@@ -0,0 +1,99 @@
+"""
+페이지별 스탬프 아이템 층
+
+페이지를 표시할 때마다 저장된 스탬프 데이터(_overlay_items)로 MovableStampItem을 새로 만들지 않고,
+한 번 만든 아이템을 페이지별로 보관해 두었다가 새 페이지 이미지 아이템에 다시 붙인다(re-parent).
+씬을 비우기 전에는 반드시 detach_all()로 아이템을 씬에서 떼어 내야 함께 삭제되지 않는다.
+
+어떤 스탬프가 있어야 하는지의 기준은 언제나 _overlay_items의 데이터이고,
+이 클래스는 데이터 딕셔너리(객체 동일성)와 아이템을 짝지어 재사용할 뿐이다.
+"""
+from typing import Callable
+
+from PyQt6 import sip
+from PyQt6.QtCore import QSizeF
+from PyQt6.QtWidgets import QGraphicsPixmapItem, QGraphicsScene
+
+from .custom_item import MovableStampItem
+
+
+class StampLayers:
+    """{페이지: {id(stamp_data): MovableStampItem}} 보관소"""
+
+    def __init__(self, scene: QGraphicsScene, item_factory: Callable[..., MovableStampItem]):
+        """
+        Args:
+            item_factory: (stamp_data, page_item, page_size, page_num) -> MovableStampItem
+        """
+        self._scene = scene
+        self._item_factory = item_factory
+        self._layers: dict[int, dict[int, MovableStampItem]] = {}
+
+    def create(self, page_num: int, page_item: QGraphicsPixmapItem, stamp_data: dict) -> MovableStampItem:
+        """새 스탬프 아이템을 만들어 페이지 층에 등록한다."""
+        page_size = QSizeF(page_item.pixmap().size())
+        item = self._item_factory(stamp_data, page_item, page_size, page_num)
+        self._layers.setdefault(page_num, {})[id(stamp_data)] = item
+        return item
+
+    def attach(self, page_num: int, page_item: QGraphicsPixmapItem, stamp_list: list[dict]):
+        """페이지 이미지 아이템 위에 스탬프 아이템을 올린다.
+
+        보관된 아이템은 부모만 바꾸고 데이터(위치 비율, 픽스맵)에 맞춘다.
+        없는 스탬프는 새로 만들고, 데이터에서 사라진 스탬프(되돌리기/삭제/자르기)의 아이템은 버린다.
+        """
+        layer = self._layers.get(page_num, {})
+        page_size = QSizeF(page_item.pixmap().size())
+        alive = set()
+        for stamp_data in stamp_list:
+            key = id(stamp_data)
+            item = layer.get(key)
+            if item is None or sip.isdeleted(item) or item.stamp_data is not stamp_data:
+                item = self.create(page_num, page_item, stamp_data)
+            else:
+                if item.parentItem() is not page_item:
+                    item.setParentItem(page_item)  # 부모가 씬에 있으면 함께 씬에 들어간다
+                item.sync_with_data(page_size)
+            alive.add(key)
+
+        layer = self._layers.get(page_num, {})
+        for key in [k for k in layer if k not in alive]:
+            self._remove(layer.pop(key))
+        if not layer:
+            self._layers.pop(page_num, None)
+
+    def detach(self, page_num: int):
+        """페이지의 스탬프 아이템을 씬에서 떼어 보관한다. (페이지 이미지 아이템을 지우기 전에 호출)"""
+        for item in self._layers.get(page_num, {}).values():
+            self._remove(item)
+
+    def detach_all(self):
+        """모든 스탬프 아이템을 씬에서 떼어 보관한다. (scene.clear() 전에 호출)"""
+        for page_num in self._layers:
+            self.detach(page_num)
+
+    def forget(self, page_num: int, stamp_data: dict):
+        """삭제된 스탬프의 아이템을 보관소에서 뺀다."""
+        layer = self._layers.get(page_num)
+        if layer is None:
+            return
+        item = layer.pop(id(stamp_data), None)
+        if item is not None:
+            self._remove(item)
+        if not layer:
+            del self._layers[page_num]
+
+    def clear(self):
+        """모든 아이템을 씬에서 떼고 보관소를 비운다. (문서 교체, 페이지 번호 체계 변경)"""
+        self.detach_all()
+        self._layers.clear()
+
+    def item_count(self) -> int:
+        return sum(len(layer) for layer in self._layers.values())
+
+    def _remove(self, item: MovableStampItem):
+        if sip.isdeleted(item):
+            return  # 보관하지 못한 채 씬과 함께 삭제된 아이템
+        item.setParentItem(None)
+        if item.scene() is not None:
+            item.scene().removeItem(item)
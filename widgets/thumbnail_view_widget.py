@@ -1,12 +1,24 @@
+import itertools
 from pathlib import Path
 from typing import Union
 
 from PyQt6 import uic
-from PyQt6.QtCore import QEvent, QObject, Qt, pyqtSignal
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon, QImage, QPainter, QPixmap, QTransform
 from PyQt6.QtWidgets import QListWidgetItem, QWidget, QListWidget, QApplication, QMenu
 
-from core.pdf_render import PdfRender
+from core.pdf_render import PdfRender, A4_WIDTH_PT, A4_HEIGHT_PT
 from core.edit_mixin import EditMixin
+from core.render_scheduler import RenderScheduler, PRIORITY_THUMBNAIL
+from core.workers import ThumbnailRenderWorker
+from core.thumbnail_sheet import THUMBNAIL_WIDTH
+
+# 디스크 캐시의 썸네일 시트와 같은 폭이어야 시트 이미지를 그대로 쓸 수 있다
+THUMBNAIL_MAX_WIDTH = THUMBNAIL_WIDTH
+# 썸네일 렌더링 스레드 수 (메인 뷰 렌더링과 CPU를 나눠 쓰므로 적게)
+THUMBNAIL_RENDER_THREADS = 2
+# 화면에 보이는 영역 위아래로 이 비율(뷰포트 높이 기준)만큼 미리 렌더링
+THUMBNAIL_PREFETCH_VIEWPORTS = 1.0
 
 class ThumbnailViewWidget(QWidget):
     """썸네일 뷰어 위젯"""
@@ -21,6 +33,18 @@ class ThumbnailViewWidget(QWidget):
         super().__init__()
         self.renderer: PdfRender | None = None
         self._page_rotations: dict[int, int] = {}  # 페이지별 회전 정보 저장
+        # 회전 없는 기본 썸네일 캐시 {실제 페이지 번호: QImage}. 회전은 이 이미지를 돌려서 표시한다.
+        self._base_thumbnails: dict[int, QImage] = {}
+        # 렌더링 중인 썸네일 {실제 페이지 번호: 작업 토큰}. 토큰이 다른 결과는 버린다.
+        self._thumbnail_jobs: dict[int, int] = {}
+        self._job_tokens = itertools.count(1)
+        self._placeholder_icon: QIcon | None = None
+        self.thumbnail_scheduler = RenderScheduler(max_threads=THUMBNAIL_RENDER_THREADS, parent=self)
+        # 스크롤/크기 변경이 연달아 들어와도 한 번만 보이는 행을 계산하도록 지연
+        self._visible_timer = QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.setInterval(50)
+        self._visible_timer.timeout.connect(self._request_visible_thumbnails)
         self.init_ui()
         self.setup_connections()
         
@@ -30,6 +54,8 @@ class ThumbnailViewWidget(QWidget):
 
     def eventFilter(self, watched: QObject, event: QEvent) -> bool:
         """이벤트 필터. thumbnail_list_widget의 키 이벤트를 가로챈다."""
+        if watched == self.thumbnail_list_widget and event.type() == QEvent.Type.Resize:
+            self._schedule_visible_update()
         if watched == self.thumbnail_list_widget and event.type() == QEvent.Type.KeyPress:
             if event.key() == Qt.Key.Key_Z and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
                 self.undo_requested.emit()
@@ -159,6 +185,9 @@ class ThumbnailViewWidget(QWidget):
         
         # --- 모델의 데이터 변경 시그널 연결 ---
         list_widget.model().rowsMoved.connect(self._on_rows_moved)
+        
+        # --- 보이는 행이 바뀌면 해당 썸네일 렌더링 요청 ---
+        list_widget.verticalScrollBar().valueChanged.connect(self._schedule_visible_update)
     
     def setup_connections(self):
         """시그널-슬롯 연결"""
@@ -166,8 +195,14 @@ class ThumbnailViewWidget(QWidget):
             self.thumbnail_list_widget.itemClicked.connect(self.on_thumbnail_clicked)
     
     def set_renderer(self, renderer: PdfRender | None, page_order: list[int] | None = None, rotations: dict | None = None):
-        """PDF 렌더러를 설정하고 썸네일을 생성한다. page_order가 있으면 그 순서대로 생성한다."""
+        """PDF 렌더러를 설정하고 썸네일 목록을 만든다. page_order가 있으면 그 순서대로 만든다.
+
+        목록은 자리표시 아이콘으로 즉시 채우고, 실제 썸네일은 화면에 보이는 행 주변부터
+        백그라운드에서 렌더링하여 도착하는 대로 교체한다.
+        """
         self.renderer = renderer
+        self._reset_thumbnail_jobs()
+        self._base_thumbnails.clear()
         self.thumbnail_list_widget.clear()
         
         # 회전 정보 저장
@@ -183,64 +218,151 @@ class ThumbnailViewWidget(QWidget):
         if page_order is None:
             page_order = list(range(self.renderer.get_page_count()))
 
-        # page_order 순서대로 썸네일 생성
+        # 디스크 캐시에서 함께 읽어 온 썸네일은 바로 표시
+        self._base_thumbnails.update(self.renderer.get_preloaded_thumbnails())
+
         for visual_index, actual_page_num in enumerate(page_order):
-            try:
-                # 회전 각도 가져오기
-                user_rotation = self._page_rotations.get(actual_page_num, 0)
-                
-                # 실제 페이지 번호로 썸네일 이미지 생성
-                icon = self.renderer.create_thumbnail(actual_page_num, max_width=120, user_rotation=user_rotation)
-                
-                # 텍스트는 '보이는 순서' (1부터 시작)
-                item = QListWidgetItem(icon, f"{visual_index + 1}")
-                
-                # UserRole에는 '실제 페이지 번호' 저장
-                item.setData(Qt.ItemDataRole.UserRole, actual_page_num)
-                
-                self.thumbnail_list_widget.addItem(item)
-            except (IndexError, RuntimeError) as e:
-                print(f"썸네일 생성 오류 (실제 페이지 {actual_page_num}): {e}")
+            # 텍스트는 '보이는 순서' (1부터 시작)
+            item = QListWidgetItem(self._thumbnail_icon(actual_page_num), f"{visual_index + 1}")
+            # UserRole에는 '실제 페이지 번호' 저장
+            item.setData(Qt.ItemDataRole.UserRole, actual_page_num)
+            self.thumbnail_list_widget.addItem(item)
+
+        # 레이아웃이 끝난 뒤 보이는 행을 계산하도록 지연 호출
+        self._schedule_visible_update()
 
     def update_page_rotation(self, page_num: int, rotation: int):
-        """특정 페이지의 회전 상태를 업데이트한다."""
+        """특정 페이지의 회전 상태를 업데이트한다. (캐시된 썸네일을 돌려서 표시, 재렌더링 없음)"""
         if not self.renderer:
             return
         
         # 회전 정보 저장
         self._page_rotations[page_num] = rotation
-            
-        for i in range(self.thumbnail_list_widget.count()):
-            item = self.thumbnail_list_widget.item(i)
-            actual_page_num = item.data(Qt.ItemDataRole.UserRole)
-            
-            if actual_page_num == page_num:
-                try:
-                    icon = self.renderer.create_thumbnail(page_num, max_width=120, user_rotation=rotation)
-                    item.setIcon(icon)
-                except Exception as e:
-                    print(f"썸네일 회전 업데이트 오류 (페이지 {page_num}): {e}")
-                break
+        if page_num in self._base_thumbnails:
+            self._apply_thumbnail(page_num)
+        else:
+            self._schedule_visible_update()
 
     def update_page_thumbnail(self, page_num: int):
         """특정 페이지의 썸네일을 업데이트한다. (자르기 등으로 페이지가 변경된 경우)"""
         if not self.renderer:
             return
         
-        # 저장된 회전 정보 가져오기
-        user_rotation = self._page_rotations.get(page_num, 0)
-        
+        # PDF 데이터가 변경되었으므로 캐시를 버리고 다시 렌더링 (새 결과가 올 때까지 기존 아이콘 유지)
+        self._base_thumbnails.pop(page_num, None)
+        self._drop_thumbnail_job(page_num)
+        self._start_thumbnail_job(page_num)
+
+    # --- 비동기 썸네일 렌더링 ---
+    def _get_placeholder_icon(self) -> QIcon:
+        """썸네일이 도착하기 전까지 보여줄 A4 비율의 빈 아이콘"""
+        if self._placeholder_icon is None:
+            width = THUMBNAIL_MAX_WIDTH
+            height = int(width * A4_HEIGHT_PT / A4_WIDTH_PT)
+            pixmap = QPixmap(width, height)
+            pixmap.fill(QColor(245, 245, 245))
+            painter = QPainter(pixmap)
+            painter.setPen(QColor(200, 200, 200))
+            painter.drawRect(0, 0, width - 1, height - 1)
+            painter.end()
+            self._placeholder_icon = QIcon(pixmap)
+        return self._placeholder_icon
+
+    def _schedule_visible_update(self, *_):
+        if self.renderer is not None:
+            self._visible_timer.start()
+
+    def _visible_page_nums(self) -> list[int]:
+        """뷰포트(위아래 여유 포함)에 걸친 행의 실제 페이지 번호를 화면 순서대로 반환한다."""
+        list_widget = self.thumbnail_list_widget
+        viewport_rect = list_widget.viewport().rect()
+        margin = int(viewport_rect.height() * THUMBNAIL_PREFETCH_VIEWPORTS)
+        area = viewport_rect.adjusted(0, -margin, 0, margin)
+
+        pages = []
+        for row in range(list_widget.count()):
+            item = list_widget.item(row)
+            if list_widget.visualItemRect(item).intersects(area):
+                pages.append(item.data(Qt.ItemDataRole.UserRole))
+        return pages
+
+    def _request_visible_thumbnails(self):
+        """보이는 행 주변의 썸네일만 렌더링을 요청하고, 멀어진 대기 작업은 취소한다."""
+        if not self.renderer or self.renderer.get_page_count() == 0:
+            return
+        wanted = self._visible_page_nums()
+        wanted_set = set(wanted)
+
+        for cancelled_page in self.thumbnail_scheduler.cancel_where(lambda page: page not in wanted_set):
+            self._thumbnail_jobs.pop(cancelled_page, None)
+
+        for page_num in wanted:
+            if page_num in self._base_thumbnails:
+                continue
+            self._start_thumbnail_job(page_num)
+
+    def _start_thumbnail_job(self, page_num: int):
+        if page_num in self._thumbnail_jobs:
+            return
+        pdf_source = self.renderer.get_render_source()
+        if not pdf_source:
+            return
+        token = next(self._job_tokens)
+        worker = ThumbnailRenderWorker(pdf_source, page_num, THUMBNAIL_MAX_WIDTH,
+                                       doc_key=self.renderer.get_generation())
+        worker.signals.thumbnail_finished.connect(
+            lambda rendered_page, image, job_token=token: self._on_thumbnail_rendered(rendered_page, image, job_token)
+        )
+        worker.signals.error.connect(
+            lambda failed_page, error_msg, job_token=token: self._on_thumbnail_error(failed_page, error_msg, job_token)
+        )
+        if self.thumbnail_scheduler.submit(page_num, worker, PRIORITY_THUMBNAIL):
+            self._thumbnail_jobs[page_num] = token
+
+    def _drop_thumbnail_job(self, page_num: int):
+        """추적 중인 작업을 잊는다. 이미 실행 중이면 결과가 도착해도 토큰이 달라 버려진다."""
+        self._thumbnail_jobs.pop(page_num, None)
+        self.thumbnail_scheduler.cancel(page_num)
+        self.thumbnail_scheduler.finish(page_num)
+
+    def _reset_thumbnail_jobs(self):
+        self._visible_timer.stop()
+        self.thumbnail_scheduler.cancel_all()
+        self._thumbnail_jobs.clear()
+
+    def _on_thumbnail_rendered(self, page_num: int, image: QImage, token: int):
+        if self._thumbnail_jobs.get(page_num) != token:
+            return
+        del self._thumbnail_jobs[page_num]
+        self.thumbnail_scheduler.finish(page_num)
+        self._base_thumbnails[page_num] = image
+        self._apply_thumbnail(page_num)
+
+    def _on_thumbnail_error(self, page_num: int, error_msg: str, token: int):
+        if self._thumbnail_jobs.get(page_num) != token:
+            return
+        del self._thumbnail_jobs[page_num]
+        self.thumbnail_scheduler.finish(page_num)
+        print(f"썸네일 생성 오류 (실제 페이지 {page_num}): {error_msg}")
+
+    def _thumbnail_icon(self, page_num: int) -> QIcon:
+        """캐시된 기본 썸네일에 현재 회전을 적용한 아이콘. 아직 없으면 자리표시 아이콘."""
+        image = self._base_thumbnails.get(page_num)
+        if image is None:
+            return self._get_placeholder_icon()
+        rotation = self._page_rotations.get(page_num, 0)
+        if rotation:
+            image = image.transformed(QTransform().rotate(rotation), Qt.TransformationMode.SmoothTransformation)
+        return QIcon(QPixmap.fromImage(image))
+
+    def _apply_thumbnail(self, page_num: int):
+        """해당 페이지 행의 아이콘을 캐시된 썸네일(현재 회전 적용)로 교체한다."""
+        if page_num not in self._base_thumbnails:
+            return
         for i in range(self.thumbnail_list_widget.count()):
             item = self.thumbnail_list_widget.item(i)
-            actual_page_num = item.data(Qt.ItemDataRole.UserRole)
-            
-            if actual_page_num == page_num:
-                try:
-                    # PDF 데이터가 변경되었으므로 새로운 썸네일 생성
-                    icon = self.renderer.create_thumbnail(page_num, max_width=120, user_rotation=user_rotation)
-                    item.setIcon(icon)
-                except Exception as e:
-                    print(f"썸네일 업데이트 오류 (페이지 {page_num}): {e}")
+            if item.data(Qt.ItemDataRole.UserRole) == page_num:
+                item.setIcon(self._thumbnail_icon(page_num))
                 break
 
     def on_thumbnail_clicked(self, item):
@@ -302,5 +424,7 @@ class ThumbnailViewWidget(QWidget):
 
     def clear_thumbnails(self):
         """썸네일 목록 초기화"""
+        self._reset_thumbnail_jobs()
+        self._base_thumbnails.clear()
         if hasattr(self, 'thumbnail_list_widget'):
             self.thumbnail_list_widget.clear()
@@ -1,10 +1,12 @@
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QMouseEvent
 from PyQt6.QtWidgets import QGraphicsView
 
 
 class ZoomableGraphicsView(QGraphicsView):
     """Ctrl + 마우스 휠로 확대/축소, Shift + 휠로 수평 스크롤이 가능한 QGraphicsView"""
+    zoom_changed = pyqtSignal(float)  # 확대/축소 후 현재 뷰 배율
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
@@ -24,6 +26,7 @@ class ZoomableGraphicsView(QGraphicsView):
                 zoom_factor = zoom_out_factor
             
             self.scale(zoom_factor, zoom_factor)
+            self.zoom_changed.emit(self.transform().m11())
         elif event.modifiers() == Qt.KeyboardModifier.ShiftModifier:
             # Shift 키와 함께 휠을 돌리면 수평 스크롤
             h_bar = self.horizontalScrollBar()